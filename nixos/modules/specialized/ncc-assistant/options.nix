@@ -113,6 +113,108 @@
       '';
     };
 
+    http2 = lib.mkOption {
+      type = lib.types.bool;
+      default = false;
+      description = ''
+        Negotiate HTTP/2 with the LLM endpoint (falls back to HTTP/1.1 keep-alive
+        when the server or client lacks support). One pooled connection set is
+        reused for every tool round of a chat session.
+      '';
+    };
+
+    requestTimeout = lib.mkOption {
+      type = lib.types.nullOr lib.types.float;
+      default = null;
+      description = "Read/write timeout in seconds for LLM requests. null = 120.";
+    };
+
+    connectTimeout = lib.mkOption {
+      type = lib.types.nullOr lib.types.float;
+      default = null;
+      description = "Connect timeout in seconds for LLM requests. null = 30.";
+    };
+
+    maxConnections = lib.mkOption {
+      type = lib.types.nullOr lib.types.int;
+      default = null;
+      description = "Upper bound of pooled (keep-alive) connections per endpoint. null = 10.";
+    };
+
+    modelsCacheTtl = lib.mkOption {
+      type = lib.types.nullOr lib.types.float;
+      default = null;
+      description = ''
+        Seconds a `GET {endpoint}/models` listing stays fresh in
+        ~/.config/ncc-assistant/models.json. Stale listings are still used and
+        refreshed in the background. null = 600; 0 disables the cache.
+      '';
+    };
+
+    configDaemon = lib.mkOption {
+      type = lib.types.bool;
+      default = true;
+      description = ''
+        Keep `ncc-assistant-config serve` co-processes running and talk to them
+        over line-delimited JSON instead of spawning the helper for every
+        read/write/validate. Falls back to one subprocess per call when the
+        workers cannot be started.
+      '';
+    };
+
+    configTimeout = lib.mkOption {
+      type = lib.types.nullOr lib.types.float;
+      default = null;
+      description = "Seconds to wait for one config facade operation in co-process mode. null = 120.";
+    };
+
+    contextTokens = lib.mkOption {
+      type = lib.types.nullOr lib.types.int;
+      default = null;
+      description = "Model context window in tokens. Old tool results, then old turns, are trimmed from requests to fit. 0 disables trimming; null = 32768.";
+    };
+
+    streamUsage = lib.mkOption {
+      type = lib.types.bool;
+      default = true;
+      description = ''
+        Ask OpenAI-compatible servers for token usage at the end of a stream
+        (`stream_options.include_usage`). Disable for gateways that reject the
+        field; completion tokens are then estimated from the reply length.
+      '';
+    };
+
+    metricsLog = lib.mkOption {
+      type = lib.types.bool;
+      default = true;
+      description = ''
+        Append per-round chat metrics (time to first token, tokens/s, token
+        usage, tool time) to ~/.local/share/ncc-assistant/metrics.jsonl.
+      '';
+    };
+
+    prefetchTools = lib.mkOption {
+      type = lib.types.bool;
+      default = true;
+      description = ''
+        Start reading a module's systemConfig leaf as soon as a streamed tool
+        call (read_module_config, explain_path, ...) has a complete
+        `module_path`, so the read overlaps with the rest of generation.
+      '';
+    };
+
+    embeddingModel = lib.mkOption {
+      type = lib.types.nullOr lib.types.str;
+      default = null;
+      example = "nomic-embed-text";
+      description = ''
+        Embedding model on the OpenAI-compatible endpoint. When set,
+        search_knowledge blends keyword scores with cosine similarity over
+        embedded knowledge chunks (cached under ~/.local/share/ncc-assistant,
+        re-embedded only when a chunk changes). null = keyword search only.
+      '';
+    };
+
     allowWrite = lib.mkOption {
       type = lib.types.bool;
       default = true;
@@ -22,6 +22,9 @@ let
   pythonEnv = pkgs.python3.withPackages (ps: with ps; [
     mcp
     httpx
+    h2
+    orjson
+    numpy
     pyside6
   ]);
 
@@ -37,32 +40,88 @@ let
       echo "Usage: ncc-assistant-config read <module_path>" >&2
       echo "       ncc-assistant-config write <module_path>   # content on stdin" >&2
       echo "       ncc-assistant-config validate               # Nix fragment on stdin" >&2
+      echo "       ncc-assistant-config serve                  # JSON lines on stdin/stdout" >&2
       exit 2
     }
 
+    # One facade operation; content (write/validate) on stdin. Runs in a
+    # subshell under `serve`, so `exit` only ends that request.
+    run_op() {
+      local op="''${1:-}"
+      case "$op" in
+        read)
+          [[ $# -ge 2 ]] || usage
+          ncc_read_module_config "$2"
+          ;;
+        write)
+          [[ $# -ge 2 ]] || usage
+          content=$(cat)
+          ncc_write_module_config "$2" "$content"
+          ;;
+        validate)
+          content=$(cat)
+          if ${pkgs.nix}/bin/nix-instantiate --parse -E "$content" >/dev/null 2>&1; then
+            echo "valid"
+            exit 0
+          fi
+          if ${pkgs.nix}/bin/nix-instantiate --eval --strict -E "$content" >/dev/null 2>&1; then
+            echo "valid"
+            exit 0
+          fi
+          echo "Invalid Nix fragment" >&2
+          exit 1
+          ;;
+        ping)
+          echo "pong"
+          ;;
+        *)
+          usage
+          ;;
+      esac
+    }
+
+    # Co-process mode for ncc-assistant: the facade is sourced once and each
+    # request line {"id","op","path","input"} gets one reply line
+    # {"id","returncode","stdout","stderr"}. Two long-lived jq filters do the
+    # JSON <-> TSV/base64 translation, so a request costs no jq start-up.
+    # EOF on stdin ends the loop.
+    serve() {
+      local jq=${pkgs.jq}/bin/jq b64=${pkgs.coreutils}/bin/base64
+      local in_f out_f err_f
+      in_f=$(mktemp)
+      out_f=$(mktemp)
+      err_f=$(mktemp)
+      trap "rm -f -- '$in_f' '$out_f' '$err_f'" EXIT
+      # Unit separator, not tab: IFS whitespace would collapse empty fields.
+      "$jq" --unbuffered -r \
+        '[(.id | tojson), (.op // ""), (.path // ""), (.input // "" | @base64)] | join("\u001f")' \
+        | while IFS=$'\x1f' read -r id op path input_b64; do
+            if [[ -n "$input_b64" ]]; then
+              printf '%s' "$input_b64" | "$b64" -d >"$in_f"
+            else
+              : >"$in_f"
+            fi
+            set +e
+            ( set -euo pipefail; run_op "$op" ''${path:+"$path"} ) <"$in_f" >"$out_f" 2>"$err_f"
+            rc=$?
+            set -e
+            out_b64=""
+            err_b64=""
+            [[ -s "$out_f" ]] && out_b64=$("$b64" -w0 <"$out_f")
+            [[ -s "$err_f" ]] && err_b64=$("$b64" -w0 <"$err_f")
+            printf '%s\t%s\t%s\t%s\n' "$id" "$rc" "$out_b64" "$err_b64"
+          done \
+        | "$jq" --unbuffered -c -R \
+          'split("\t") | {id: (.[0] | fromjson), returncode: (.[1] | tonumber), stdout: (.[2] | @base64d), stderr: (.[3] | @base64d)}'
+    }
+
     cmd="''${1:-}"
     case "$cmd" in
-      read)
-        [[ $# -ge 2 ]] || usage
-        ncc_read_module_config "$2"
-        ;;
-      write)
-        [[ $# -ge 2 ]] || usage
-        content=$(cat)
-        ncc_write_module_config "$2" "$content"
+      serve)
+        serve
         ;;
-      validate)
-        content=$(cat)
-        if ${pkgs.nix}/bin/nix-instantiate --parse -E "$content" >/dev/null 2>&1; then
-          echo "valid"
-          exit 0
-        fi
-        if ${pkgs.nix}/bin/nix-instantiate --eval --strict -E "$content" >/dev/null 2>&1; then
-          echo "valid"
-          exit 0
-        fi
-        echo "Invalid Nix fragment" >&2
-        exit 1
+      read|write|validate)
+        run_op "$@"
         ;;
       *)
         usage
@@ -98,6 +157,32 @@ let
     ${lib.optionalString ((cfg.temperature or null) != null) ''
       export NCC_ASSISTANT_TEMPERATURE="${toString cfg.temperature}"
     ''}
+    export NCC_ASSISTANT_HTTP2="${if (cfg.http2 or false) then "1" else "0"}"
+    ${lib.optionalString ((cfg.requestTimeout or null) != null) ''
+      export NCC_ASSISTANT_REQUEST_TIMEOUT="${toString cfg.requestTimeout}"
+    ''}
+    ${lib.optionalString ((cfg.connectTimeout or null) != null) ''
+      export NCC_ASSISTANT_CONNECT_TIMEOUT="${toString cfg.connectTimeout}"
+    ''}
+    ${lib.optionalString ((cfg.maxConnections or null) != null) ''
+      export NCC_ASSISTANT_MAX_CONNECTIONS="${toString cfg.maxConnections}"
+    ''}
+    ${lib.optionalString ((cfg.modelsCacheTtl or null) != null) ''
+      export NCC_ASSISTANT_MODELS_CACHE_TTL="${toString cfg.modelsCacheTtl}"
+    ''}
+    export NCC_ASSISTANT_CONFIG_DAEMON="${if (cfg.configDaemon or true) then "1" else "0"}"
+    ${lib.optionalString ((cfg.configTimeout or null) != null) ''
+      export NCC_ASSISTANT_CONFIG_TIMEOUT="${toString cfg.configTimeout}"
+    ''}
+    ${lib.optionalString ((cfg.contextTokens or null) != null) ''
+      export NCC_ASSISTANT_CONTEXT_TOKENS="${toString cfg.contextTokens}"
+    ''}
+    export NCC_ASSISTANT_STREAM_USAGE="${if (cfg.streamUsage or true) then "1" else "0"}"
+    export NCC_ASSISTANT_METRICS_LOG="${if (cfg.metricsLog or true) then "1" else "0"}"
+    export NCC_ASSISTANT_PREFETCH_TOOLS="${if (cfg.prefetchTools or true) then "1" else "0"}"
+    ${lib.optionalString ((cfg.embeddingModel or null) != null) ''
+      export NCC_ASSISTANT_EMBEDDING_MODEL="${cfg.embeddingModel}"
+    ''}
     export NCC_ASSISTANT_ALLOW_WRITE="${if (cfg.allowWrite or true) then "1" else "0"}"
     export NCC_ASSISTANT_MCP_ALLOW_WRITE="${if (cfg.mcpAllowWrite or false) then "1" else "0"}"
     export NCC_ASSISTANT_ALLOW_REBUILD="${if (cfg.allowRebuild or false) then "1" else "0"}"
@@ -12,8 +12,6 @@ from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
-import httpx
-
 from .config import Settings
 
 
@@ -83,6 +81,8 @@ def probe_needs_auth(settings: Settings) -> bool | None:
         else:
             headers[name] = settings.api_key
 
+    import httpx  # only the probe needs it; keeps `ncc-assistant tool` light
+
     try:
         with httpx.Client(timeout=15.0) as client:
             resp = client.get(url, headers=headers)
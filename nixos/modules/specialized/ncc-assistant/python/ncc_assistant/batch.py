@@ -0,0 +1,106 @@
+"""`ncc-assistant tool --batch`: JSONL tool requests through one ToolRuntime."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable
+
+from .runtime import ToolRuntime
+from .tooldefs import READ_ONLY_TOOLS
+
+Timed = tuple[dict[str, Any], float]  # (tool result, wall ms)
+
+
+def parse_request(line: str) -> tuple[str, dict[str, Any], Any]:
+    """(name, args, id) from `{"name": ..., "args": {...}, "id": ...}`."""
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"invalid JSON: {exc}") from exc
+    if not isinstance(data, dict) or not isinstance(data.get("name"), str):
+        raise ValueError('expected {"name": "<tool>", "args": {...}}')
+    args = data.get("args") or {}
+    if not isinstance(args, dict):
+        raise ValueError("args must be a JSON object")
+    return data["name"], args, data.get("id")
+
+
+def _timed_call(runtime: ToolRuntime, name: str, args: dict[str, Any]) -> Timed:
+    start = time.perf_counter()
+    result = runtime.call(name, args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_batch(
+    runtime: ToolRuntime,
+    lines: Iterable[str],
+    write: Callable[[str], None],
+    parallel: int = 1,
+) -> int:
+    """
+    One result line per non-blank request line, in input order:
+    `{"index", "id"?, "name", "ms", "result"}`. With `parallel` > 1,
+    read-only tools run that many at a time; any other tool waits for the
+    requests before it and runs alone. Results are written as soon as every
+    earlier one is out. Returns the number of failed requests.
+    """
+    pending: deque[tuple[dict[str, Any], Future[Timed] | Timed]] = deque()
+    lock = threading.RLock()
+    failed = 0
+
+    def drain(block: bool) -> None:
+        nonlocal failed
+        while True:
+            with lock:
+                if not pending:
+                    return
+                head, job = pending[0]
+                if not isinstance(job, Future) or job.done():
+                    pending.popleft()
+                    result, ms = job.result() if isinstance(job, Future) else job
+                    if not result.get("ok", True):
+                        failed += 1
+                    record = {**head, "ms": round(ms, 1), "result": result}
+                    write(json.dumps(record, ensure_ascii=False))
+                    continue
+                if not block:
+                    return
+            # Wait outside the lock: done-callbacks on the workers take it too.
+            wait([job])
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, parallel), thread_name_prefix="ncc-batch"
+    ) as pool:
+        index = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            head: dict[str, Any] = {"index": index}
+            index += 1
+            try:
+                name, args, request_id = parse_request(line)
+            except ValueError as exc:
+                with lock:
+                    pending.append((head, ({"ok": False, "error": str(exc)}, 0.0)))
+                drain(False)
+                continue
+            if request_id is not None:
+                head["id"] = request_id
+            head["name"] = name
+            if parallel > 1 and name in READ_ONLY_TOOLS:
+                future = pool.submit(_timed_call, runtime, name, args)
+                with lock:
+                    pending.append((head, future))
+                future.add_done_callback(lambda _: drain(False))
+            else:
+                drain(True)
+                timed = _timed_call(runtime, name, args)
+                with lock:
+                    pending.append((head, timed))
+                drain(False)
+        drain(True)
+    return failed
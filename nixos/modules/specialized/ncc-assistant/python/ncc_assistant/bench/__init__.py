@@ -0,0 +1,198 @@
+"""Benchmarks for ncc-assistant (run with `python -m ncc_assistant.bench`)."""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from ..config import Settings, data_dir
+from .mockserver import MODEL_ID
+
+
+def timed(fn: Callable[[], Any], iterations: int, warmup: int = 1) -> list[float]:
+    """Wall-clock samples in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples: list[float] = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "min_ms": round(ordered[0], 3),
+    }
+
+
+def format_table(rows: dict[str, dict[str, float]]) -> str:
+    cols = ["n", "mean_ms", "p50_ms", "p95_ms", "min_ms"]
+    width = max([len(k) for k in rows] + [8])
+    lines = [f"{'case':<{width}}  " + "  ".join(f"{c:>9}" for c in cols)]
+    for name, stats in rows.items():
+        lines.append(
+            f"{name:<{width}}  " + "  ".join(f"{stats.get(c, ''):>9}" for c in cols)
+        )
+    return "\n".join(lines)
+
+
+@contextmanager
+def isolated_home() -> Iterator[Path]:
+    """Point XDG config/data at a scratch dir; sessions and blobs stay out of $HOME."""
+    saved = {k: os.environ.get(k) for k in ("XDG_CONFIG_HOME", "XDG_DATA_HOME")}
+    with tempfile.TemporaryDirectory(prefix="ncc-bench-") as tmp:
+        os.environ["XDG_CONFIG_HOME"] = str(Path(tmp) / "config")
+        os.environ["XDG_DATA_HOME"] = str(Path(tmp) / "data")
+        try:
+            yield Path(tmp)
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+def mock_settings(settings: Settings, endpoint: str) -> Settings:
+    """Settings aimed at the bundled mock server (no auth, no metrics log)."""
+    return replace(
+        settings,
+        api="openai-compatible",
+        endpoint=endpoint,
+        model=MODEL_ID,
+        api_key=None,
+        models_cache_ttl=0.0,
+        metrics_log=False,
+        http2=False,
+    )
+
+
+# -- stored results ------------------------------------------------------
+
+
+def results_dir() -> Path:
+    return data_dir() / "bench"
+
+
+def git_revision() -> tuple[str, bool]:
+    """(short sha, dirty) of the checkout this package runs from."""
+    here = Path(__file__).resolve().parent
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "--short=12", "HEAD"],
+            cwd=here,
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no", "."],
+            cwd=here,
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return "unknown", False
+    return sha or "unknown", bool(dirty)
+
+
+def save_result(suite: str, result: dict[str, Any], root: Path | None = None) -> Path:
+    """Write <root>/<sha>[-dirty]/<suite>.json and return the path."""
+    sha, dirty = git_revision()
+    label = f"{sha}-dirty" if dirty else sha
+    path = (root or results_dir()) / label / f"{suite}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {
+        "suite": suite,
+        "revision": sha,
+        "dirty": dirty,
+        "recorded": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        **result,
+    }
+    path.write_text(json.dumps(record, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def load_results(ref: str, root: Path | None = None) -> dict[str, dict[str, Any]]:
+    """Suite → stored result for a revision label or a results directory path."""
+    base = Path(ref)
+    if not base.is_dir():
+        base = (root or results_dir()) / ref
+    if not base.is_dir():
+        raise FileNotFoundError(f"no stored results for {ref} (looked in {base})")
+    return {
+        p.stem: json.loads(p.read_text(encoding="utf-8"))
+        for p in sorted(base.glob("*.json"))
+    }
+
+
+def compare(
+    base: dict[str, dict[str, Any]],
+    head: dict[str, dict[str, Any]],
+    metric: str = "p50_ms",
+) -> list[dict[str, Any]]:
+    """Per-case change of `metric` for suites and cases present in both runs."""
+    rows: list[dict[str, Any]] = []
+    for suite in sorted(set(base) & set(head)):
+        old_cases = base[suite].get("cases") or {}
+        new_cases = head[suite].get("cases") or {}
+        for case in old_cases:
+            old = (old_cases.get(case) or {}).get(metric)
+            new = (new_cases.get(case) or {}).get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100.0 if old else 0.0
+            rows.append(
+                {
+                    "suite": suite,
+                    "case": case,
+                    "base": old,
+                    "head": new,
+                    "change_pct": round(change, 1),
+                }
+            )
+    return rows
+
+
+def format_comparison(rows: list[dict[str, Any]], metric: str, threshold: float) -> str:
+    if not rows:
+        return "no common suites/cases"
+    width = max(len(f"{r['suite']}: {r['case']}") for r in rows)
+    lines = [
+        f"{'case':<{width}}  {'base':>10}  {'head':>10}  {'change':>8}  ({metric})"
+    ]
+    for r in rows:
+        flag = ""
+        if r["change_pct"] >= threshold:
+            flag = "  slower"
+        elif r["change_pct"] <= -threshold:
+            flag = "  faster"
+        lines.append(
+            f"{r['suite'] + ': ' + r['case']:<{width}}  {r['base']:>10}  "
+            f"{r['head']:>10}  {r['change_pct']:>+7.1f}%{flag}"
+        )
+    return "\n".join(lines)
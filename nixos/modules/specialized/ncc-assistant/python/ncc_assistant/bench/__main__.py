@@ -0,0 +1,213 @@
+"""python -m ncc_assistant.bench <suite> — print timings (or JSON with --json)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+from ..config import Settings
+from . import (
+    compare,
+    format_comparison,
+    format_table,
+    git_revision,
+    load_results,
+    results_dir,
+    save_result,
+)
+
+SUITES = ("turn", "stream", "sse", "tools", "persist", "startup")
+
+
+def _sizes(raw: str) -> list[int]:
+    return [int(x) for x in raw.split(",") if x.strip()]
+
+
+def _run_suite(
+    name: str, args: argparse.Namespace, settings: Settings
+) -> dict[str, Any]:
+    if name == "facade":
+        from .facade import run
+
+        return run(settings, args.iterations, args.module_path)
+    if name == "turn":
+        from .mockserver import Script
+        from .turn import run
+
+        script = Script(
+            text_tokens=args.tokens,
+            tool_rounds=args.tool_rounds,
+            latency_ms=args.latency_ms,
+            tokens_per_s=args.tokens_per_s,
+        )
+        return run(settings, args.iterations, script)
+    if name == "stream":
+        from .stream import run
+
+        return run(settings, args.iterations, args.deltas)
+    if name == "sse":
+        from .sse import run
+
+        return run(args.iterations, args.sse_deltas, _sizes(args.read_sizes))
+    if name == "tools":
+        from .tools import run
+
+        return run(settings, args.iterations, args.query)
+    if name == "persist":
+        from .persist import run
+
+        return run(args.iterations, _sizes(args.sizes))
+    if name == "startup":
+        from .startup import run
+
+        return run(args.startup_runs)
+    raise ValueError(f"unknown suite {name}")
+
+
+def _print_result(name: str, result: dict[str, Any]) -> None:
+    print(f"== {name}")
+    extra = {k: v for k, v in result.items() if k != "cases"}
+    for key, value in extra.items():
+        print(f"{key}: {value}")
+    print(format_table(result["cases"]))
+    print()
+
+
+def _add_suite_args(p: argparse.ArgumentParser, suites: tuple[str, ...]) -> None:
+    if "turn" in suites:
+        p.add_argument("--tokens", type=int, default=200, help="Text deltas per reply")
+        p.add_argument("--tool-rounds", type=int, default=1)
+        p.add_argument("--latency-ms", type=float, default=0.0)
+        p.add_argument(
+            "--tokens-per-s", type=float, default=0.0, help="0 = unpaced"
+        )
+    if "stream" in suites:
+        p.add_argument("--deltas", type=int, default=2000)
+    if "sse" in suites:
+        p.add_argument("--sse-deltas", type=int, default=5000)
+        p.add_argument(
+            "--read-sizes",
+            default="0,4096",
+            help="Network read sizes in bytes; 0 = one SSE event per read",
+        )
+    if "tools" in suites:
+        p.add_argument("--query", default="ssh")
+    if "persist" in suites:
+        p.add_argument("--sizes", default="10,100,1000", help="History sizes")
+    if "startup" in suites:
+        p.add_argument(
+            "--startup-runs",
+            type=int,
+            default=5,
+            help="Fresh interpreters per subcommand",
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m ncc_assistant.bench",
+        description="ncc-assistant performance benchmarks",
+    )
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Store results as <results-dir>/<git sha>/<suite>.json",
+    )
+    parser.add_argument(
+        "--results-dir",
+        type=Path,
+        default=None,
+        help=f"Where stored results live (default: {results_dir()})",
+    )
+    sub = parser.add_subparsers(dest="suite", required=True)
+
+    facade_p = sub.add_parser(
+        "facade", help="Config facade: subprocess per call vs serve co-process"
+    )
+    facade_p.add_argument("--iterations", type=int, default=20)
+    facade_p.add_argument("--module-path", default="core/base/packages")
+
+    turn_p = sub.add_parser("turn", help="ChatSession.send end to end (mock server)")
+    turn_p.add_argument("--iterations", type=int, default=20)
+    _add_suite_args(turn_p, ("turn",))
+
+    stream_p = sub.add_parser("stream", help="Per-delta overhead of _openai_stream")
+    stream_p.add_argument("--iterations", type=int, default=20)
+    _add_suite_args(stream_p, ("stream",))
+
+    sse_p = sub.add_parser("sse", help="SSE decode: line loop vs byte decoder")
+    sse_p.add_argument("--iterations", type=int, default=10)
+    _add_suite_args(sse_p, ("sse",))
+
+    tools_p = sub.add_parser("tools", help="ToolRuntime.call dispatch overhead")
+    tools_p.add_argument("--iterations", type=int, default=50)
+    _add_suite_args(tools_p, ("tools",))
+
+    persist_p = sub.add_parser("persist", help="Session journal save/append/load")
+    persist_p.add_argument("--iterations", type=int, default=20)
+    _add_suite_args(persist_p, ("persist",))
+
+    startup_p = sub.add_parser(
+        "startup", help="CLI cold start per subcommand (exit 1 over budget)"
+    )
+    _add_suite_args(startup_p, ("startup",))
+
+    all_p = sub.add_parser("all", help=f"Run {', '.join(SUITES)} (no facade)")
+    all_p.add_argument("--iterations", type=int, default=20)
+    _add_suite_args(all_p, SUITES)
+
+    cmp_p = sub.add_parser("compare", help="Diff stored results of two revisions")
+    cmp_p.add_argument("base", help="Revision label or results directory")
+    cmp_p.add_argument(
+        "head", nargs="?", help="Revision label or directory (default: current)"
+    )
+    cmp_p.add_argument("--metric", default="p50_ms")
+    cmp_p.add_argument(
+        "--threshold", type=float, default=10.0, help="Flag changes above this %%"
+    )
+
+    args = parser.parse_args(argv)
+    root = args.results_dir
+
+    if args.suite == "compare":
+        head = args.head
+        if head is None:
+            sha, dirty = git_revision()
+            head = f"{sha}-dirty" if dirty else sha
+        try:
+            rows = compare(
+                load_results(args.base, root),
+                load_results(head, root),
+                args.metric,
+            )
+        except (FileNotFoundError, ValueError) as exc:
+            print(f"compare: {exc}", file=sys.stderr)
+            return 1
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            print(format_comparison(rows, args.metric, args.threshold))
+        return 0
+
+    settings = Settings.from_env(client_mode="chat")
+    names = SUITES if args.suite == "all" else (args.suite,)
+    results = {name: _run_suite(name, args, settings) for name in names}
+
+    if args.json:
+        print(json.dumps(results if len(names) > 1 else results[names[0]], indent=2))
+    else:
+        for name, result in results.items():
+            _print_result(name, result)
+    if args.save:
+        for name, result in results.items():
+            path = save_result(name, result, root)
+            print(f"saved {path}", file=sys.stderr)
+    return 1 if any(r.get("failures") for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Per-call latency of the config facade: one subprocess per call vs `serve` co-process."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from ..config import Settings
+from ..facade import FacadePool
+from ..runtime import ToolRuntime
+from . import summarize, timed
+
+
+def run(settings: Settings, iterations: int, module_path: str) -> dict[str, Any]:
+    runtime = ToolRuntime(settings)
+    path = runtime._normalize_path(module_path)
+
+    subprocess_samples = timed(
+        lambda: runtime._config_subprocess("read", path), iterations
+    )
+
+    pool = FacadePool(
+        settings.config_bin, settings.nixos_dir, size=1, timeout=settings.config_timeout
+    )
+    try:
+        t0 = time.perf_counter()
+        pool.request("ping")
+        startup_ms = (time.perf_counter() - t0) * 1000.0
+        worker_samples = timed(lambda: pool.request("read", path), iterations)
+    finally:
+        pool.close()
+
+    return {
+        "module_path": path,
+        "config_bin": settings.config_bin,
+        "worker_startup_ms": round(startup_ms, 3),
+        "cases": {
+            "subprocess read": summarize(subprocess_samples),
+            "co-process read": summarize(worker_samples),
+        },
+    }
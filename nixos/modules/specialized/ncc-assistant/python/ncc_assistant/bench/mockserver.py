@@ -0,0 +1,212 @@
+"""
+Stand-in OpenAI-compatible server for benchmarks (stdlib only).
+
+Replies are scripted: while fewer than `tool_rounds` tool-call rounds
+follow the last user message, the reply is a streamed tool call; after
+that it streams `text_tokens` content deltas. `latency_ms` delays the
+first byte and `tokens_per_s` paces the deltas (0 = as fast as possible).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+MODEL_ID = "bench-model"
+
+
+@dataclass
+class Script:
+    text_tokens: int = 200
+    tool_rounds: int = 1
+    # (tool name, arguments) issued in each tool-call round.
+    tool_calls: list[tuple[str, dict[str, Any]]] = field(
+        default_factory=lambda: [
+            ("search_knowledge", {"query": "ssh", "limit": 4}),
+            ("list_modules", {"query": "ssh"}),
+        ]
+    )
+    token: str = "lorem "
+    latency_ms: float = 0.0
+    tokens_per_s: float = 0.0
+    # Split tool-call arguments into pieces of this many chars (0 = one piece).
+    arg_chunk: int = 8
+    usage: bool = True
+
+
+def _tool_rounds_since_user(messages: list[dict[str, Any]]) -> int:
+    n = 0
+    for msg in reversed(messages):
+        role = msg.get("role")
+        if role == "user":
+            break
+        if role == "assistant" and msg.get("tool_calls"):
+            n += 1
+    return n
+
+
+def _chunk(delta: dict[str, Any]) -> dict[str, Any]:
+    return {"model": MODEL_ID, "choices": [{"index": 0, "delta": delta}]}
+
+
+def _split(text: str, size: int) -> list[str]:
+    if size <= 0 or len(text) <= size:
+        return [text]
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def scripted_chunks(
+    script: Script, messages: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """SSE `data:` payloads for one reply (without the [DONE] marker)."""
+    chunks: list[dict[str, Any]] = []
+    if _tool_rounds_since_user(messages) < script.tool_rounds and script.tool_calls:
+        for idx, (name, args) in enumerate(script.tool_calls):
+            pieces = _split(json.dumps(args), script.arg_chunk)
+            first = {
+                "index": idx,
+                "id": f"call_{idx}",
+                "type": "function",
+                "function": {"name": name, "arguments": pieces[0]},
+            }
+            chunks.append(_chunk({"tool_calls": [first]}))
+            for piece in pieces[1:]:
+                chunks.append(
+                    _chunk(
+                        {
+                            "tool_calls": [
+                                {"index": idx, "function": {"arguments": piece}}
+                            ]
+                        }
+                    )
+                )
+        completion = len(chunks)
+    else:
+        chunks.append(_chunk({"role": "assistant", "content": ""}))
+        for _ in range(script.text_tokens):
+            chunks.append(_chunk({"content": script.token}))
+        completion = script.text_tokens
+    if script.usage:
+        chunks.append(
+            {
+                "model": MODEL_ID,
+                "choices": [],
+                "usage": {"prompt_tokens": 0, "completion_tokens": completion},
+            }
+        )
+    return chunks
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockServer"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _json(self, status: int, body: dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.rstrip("/").endswith("/models"):
+            self._json(200, {"data": [{"id": MODEL_ID, "owned_by": "bench"}]})
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        self.server.requests += 1
+        script = self.server.script
+        chunks = scripted_chunks(script, request.get("messages") or [])
+        if script.latency_ms:
+            time.sleep(script.latency_ms / 1000.0)
+
+        if not request.get("stream"):
+            self._reply_whole(chunks)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        events = [b"data: " + json.dumps(c).encode() + b"\n\n" for c in chunks]
+        events.append(b"data: [DONE]\n\n")
+        if script.tokens_per_s > 0:
+            pace = 1.0 / script.tokens_per_s
+            for event in events:
+                self._write_chunk(event)
+                time.sleep(pace)
+        else:
+            # Unpaced: one write, so the client side dominates the timing.
+            self._write_chunk(b"".join(events))
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _reply_whole(self, chunks: list[dict[str, Any]]) -> None:
+        content = []
+        calls: dict[int, dict[str, Any]] = {}
+        for chunk in chunks:
+            for choice in chunk.get("choices") or []:
+                delta = choice.get("delta") or {}
+                content.append(delta.get("content") or "")
+                for tc in delta.get("tool_calls") or []:
+                    slot = calls.setdefault(
+                        tc["index"],
+                        {
+                            "id": tc.get("id"),
+                            "type": "function",
+                            "function": {"name": "", "arguments": ""},
+                        },
+                    )
+                    fn = tc.get("function") or {}
+                    slot["function"]["name"] += fn.get("name") or ""
+                    slot["function"]["arguments"] += fn.get("arguments") or ""
+        message = {"role": "assistant", "content": "".join(content)}
+        if calls:
+            message["tool_calls"] = [calls[i] for i in sorted(calls)]
+        self._json(200, {"model": MODEL_ID, "choices": [{"message": message}]})
+
+
+class MockServer(ThreadingHTTPServer):
+    """Serve on 127.0.0.1:<random port> in a daemon thread; use as a context manager."""
+
+    daemon_threads = True
+
+    def __init__(self, script: Script | None = None) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.script = script or Script()
+        self.requests = 0
+        self._thread: threading.Thread | None = None
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Pooled clients closing idle keep-alive connections are not errors.
+        pass
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def __enter__(self) -> "MockServer":
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="ncc-bench-mock", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.shutdown()
+        self.server_close()
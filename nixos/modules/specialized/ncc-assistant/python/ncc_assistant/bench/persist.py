@@ -0,0 +1,79 @@
+"""Session persistence cost (journal write, append, load) at several history sizes."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from ..history import SessionJournal, load_session, new_session_id
+from . import isolated_home, summarize, timed
+
+TOOL_RESULT_CHARS = 2000
+
+
+def synthetic_history(messages: int) -> list[dict[str, Any]]:
+    """System prompt, then user / tool call / tool result / answer turns."""
+    out: list[dict[str, Any]] = [{"role": "system", "content": "You are a bench."}]
+    turn = 0
+    while len(out) < messages:
+        turn += 1
+        out.append({"role": "user", "content": f"question {turn}: which ssh options?"})
+        out.append(
+            {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {
+                        "id": f"call_{turn}",
+                        "type": "function",
+                        "function": {
+                            "name": "read_module_config",
+                            "arguments": json.dumps({"module_path": "core/base/ssh"}),
+                        },
+                    }
+                ],
+            }
+        )
+        out.append(
+            {
+                "role": "tool",
+                "tool_call_id": f"call_{turn}",
+                "name": "read_module_config",
+                "content": "x" * TOOL_RESULT_CHARS,
+            }
+        )
+        out.append({"role": "assistant", "content": "Answer. " * 60})
+    return out[:messages]
+
+
+def _data(messages: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"title": "bench", "model": "bench", "endpoint": "", "messages": messages}
+
+
+def run(iterations: int, sizes: list[int]) -> dict[str, Any]:
+    cases: dict[str, dict[str, float]] = {}
+    with isolated_home():
+        for size in sizes:
+            history = synthetic_history(size)
+
+            def first_save() -> None:
+                SessionJournal(new_session_id()).save(_data(list(history)))
+
+            cases[f"first save {size}"] = summarize(timed(first_save, iterations))
+
+            journal = SessionJournal(new_session_id())
+            grown = list(history)
+            journal.save(_data(grown))
+
+            def append_turn() -> None:
+                grown.append({"role": "user", "content": "and one more?"})
+                grown.append({"role": "assistant", "content": "Sure. " * 40})
+                journal.save(_data(grown))
+
+            cases[f"append 2 @{size}"] = summarize(timed(append_turn, iterations))
+
+            sid = journal.session_id
+            cases[f"load {size}"] = summarize(
+                timed(lambda: load_session(sid), iterations)
+            )
+    return {"sizes": sizes, "cases": cases}
@@ -0,0 +1,128 @@
+"""
+SSE decode microbenchmark, no network: the line-based loop `_openai_stream`
+used before (str lines, json.loads, one event per token) against the
+byte-level batching decoder with the json and orjson backends.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import time
+from typing import Any, Callable, Iterable, Iterator
+
+from .. import sse
+from . import summarize
+from .mockserver import Script, scripted_chunks
+
+Decoder = Callable[[Iterable[bytes]], Iterator[str]]
+
+
+def _body(deltas: int) -> list[bytes]:
+    script = Script(text_tokens=deltas, tool_rounds=0)
+    chunks = scripted_chunks(script, [])
+    events = [b"data: " + json.dumps(c).encode() + b"\n\n" for c in chunks]
+    events.append(b"data: [DONE]\n\n")
+    return events
+
+
+def _reads(events: list[bytes], read_size: int) -> list[bytes]:
+    """0 = one SSE event per network read (paced tokens), else fixed-size reads."""
+    if read_size <= 0:
+        return events
+    blob = b"".join(events)
+    return [blob[i : i + read_size] for i in range(0, len(blob), read_size)]
+
+
+def _lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """What Response.iter_lines does per read: text decode, then line split."""
+    try:
+        from httpx._decoders import LineDecoder, TextDecoder
+    except ImportError:  # private API; approximate it
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        buf = ""
+        for chunk in chunks:
+            buf += decoder.decode(chunk)
+            *lines, buf = buf.split("\n")
+            yield from lines
+        if buf:
+            yield buf
+        return
+    text, lines = TextDecoder(), LineDecoder()
+    for chunk in chunks:
+        decoded = text.decode(chunk)
+        if decoded:
+            yield from lines.decode(decoded)
+    yield from lines.decode(text.flush())
+    yield from lines.flush()
+
+
+def legacy(chunks: Iterable[bytes]) -> Iterator[str]:
+    for line in _lines(chunks):
+        if not line or line.startswith(":") or not line.startswith("data:"):
+            continue
+        data_s = line[5:].strip()
+        if data_s == "[DONE]":
+            break
+        try:
+            chunk = json.loads(data_s)
+        except json.JSONDecodeError:
+            continue
+        delta = ((chunk.get("choices") or [{}])[0]).get("delta") or {}
+        if delta.get("content"):
+            yield delta["content"]
+
+
+def batched(loads: Callable[[bytes], Any]) -> Decoder:
+    def decode(chunks: Iterable[bytes]) -> Iterator[str]:
+        for batch in sse.iter_batches(chunks):
+            pieces = []
+            values, _ = sse.decode_batch(batch, loads)
+            for chunk in values:
+                choices = chunk.get("choices") or [{}]
+                delta = choices[0].get("delta") or {}
+                if delta.get("content"):
+                    pieces.append(delta["content"])
+            if pieces:
+                yield "".join(pieces)
+
+    return decode
+
+
+def _decoders() -> dict[str, Decoder]:
+    out: dict[str, Decoder] = {
+        "before: lines + json": legacy,
+        "after: bytes + json": batched(sse._json_loads),
+    }
+    if sse.JSON_BACKEND == "orjson":
+        out["after: bytes + orjson"] = batched(sse.loads)
+    return out
+
+
+def run(iterations: int, deltas: int, read_sizes: list[int]) -> dict[str, Any]:
+    events = _body(deltas)
+    cases: dict[str, dict[str, float]] = {}
+    rates: dict[str, float] = {}
+    emitted: dict[str, int] = {}
+    for read_size in read_sizes:
+        reads = _reads(events, read_size)
+        label = "event" if read_size <= 0 else f"{read_size}B"
+        for name, decode in _decoders().items():
+            samples = []
+            for i in range(iterations + 1):
+                t0 = time.perf_counter()
+                out = sum(1 for _ in decode(reads))
+                if i:
+                    samples.append((time.perf_counter() - t0) * 1000.0)
+            stats = summarize(samples)
+            key = f"{name} ({label} reads)"
+            cases[key] = stats
+            rates[key] = round(deltas / (stats["p50_ms"] / 1000.0))
+            emitted[key] = out
+    return {
+        "deltas": deltas,
+        "json_backend": sse.JSON_BACKEND,
+        "deltas_per_s": rates,
+        "events_yielded": emitted,
+        "cases": cases,
+    }
@@ -0,0 +1,101 @@
+"""
+CLI cold start: each subcommand is run as `python -X importtime -m
+ncc_assistant ...` in a fresh interpreter. Reports wall time and the import
+time spent under ncc_assistant, and fails when a subcommand goes over its
+import budget or loads one of the heavy packages it never needs.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Any
+
+from . import isolated_home, summarize
+
+SUBCOMMANDS: dict[str, list[str]] = {
+    "tools": ["tools"],
+    "tools --json": ["tools", "--json"],
+    "tool list_modules": ["tool", "list_modules"],
+    "sessions": ["sessions", "--limit", "1"],
+}
+# Milliseconds of import time under ncc_assistant (p50), with headroom for
+# slow machines; mcp alone costs ~700 ms, httpx ~150 ms.
+BUDGETS_MS: dict[str, float] = {
+    "tools": 30.0,
+    "tools --json": 30.0,
+    "tool list_modules": 120.0,
+    "sessions": 80.0,
+}
+HEAVY = ("httpx", "mcp", "PySide6", "numpy", "orjson")
+
+# "import time:  self [us] | cumulative | <indent>name"
+_LINE_RE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> tuple[float, set[str]]:
+    """(ms imported under ncc_assistant, top-level packages imported at all)."""
+    total_us = 0
+    packages: set[str] = set()
+    for line in stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match is None:
+            continue
+        cumulative, indent, name = match.groups()
+        packages.add(name.split(".")[0])
+        # Unindented entries are the outermost imports; deps are nested.
+        if not indent[1:] and name.startswith("ncc_assistant"):
+            total_us += int(cumulative)
+    return total_us / 1000.0, packages
+
+
+def _run_once(argv: list[str]) -> tuple[float, float, set[str]]:
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "ncc_assistant", *argv],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+        check=False,
+    )
+    wall = (time.perf_counter() - t0) * 1000.0
+    import_ms, packages = parse_importtime(proc.stderr)
+    return wall, import_ms, packages
+
+
+def run(iterations: int) -> dict[str, Any]:
+    cases: dict[str, dict[str, float]] = {}
+    import_ms: dict[str, float] = {}
+    heavy: dict[str, list[str]] = {}
+    failures: list[str] = []
+    with isolated_home():
+        for name, argv in SUBCOMMANDS.items():
+            walls: list[float] = []
+            imports: list[float] = []
+            loaded: set[str] = set()
+            for i in range(iterations + 1):  # first run warms the .pyc cache
+                wall, spent, packages = _run_once(argv)
+                if i:
+                    walls.append(wall)
+                    imports.append(spent)
+                    loaded |= packages
+            cases[name] = summarize(walls)
+            import_ms[name] = summarize(imports).get("p50_ms", 0.0)
+            heavy[name] = sorted(p for p in HEAVY if p in loaded)
+            if import_ms[name] > BUDGETS_MS[name]:
+                failures.append(
+                    f"{name}: imports {import_ms[name]:.1f} ms "
+                    f"> budget {BUDGETS_MS[name]:.0f} ms"
+                )
+            if heavy[name]:
+                failures.append(f"{name}: imported {', '.join(heavy[name])}")
+    return {
+        "import_ms": import_ms,
+        "budget_ms": BUDGETS_MS,
+        "heavy_imports": heavy,
+        "failures": failures,
+        "cases": cases,
+    }
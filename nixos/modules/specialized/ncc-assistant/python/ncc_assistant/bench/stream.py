@@ -0,0 +1,49 @@
+"""
+Per-delta cost of `_openai_stream`: the same scripted SSE body read with
+bare `iter_bytes` (what `_openai_stream` reads from) versus decoded into
+delta events.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ..config import Settings
+from ..llm import ClientPool, _openai_stream
+from . import isolated_home, mock_settings, summarize, timed
+from .mockserver import MODEL_ID, MockServer, Script
+
+MESSAGES = [{"role": "user", "content": "stream"}]
+
+
+def run(settings: Settings, iterations: int, deltas: int) -> dict[str, Any]:
+    script = Script(text_tokens=deltas, tool_rounds=0)
+    with isolated_home(), MockServer(script) as server, ClientPool() as pool:
+        bench = mock_settings(settings, server.endpoint)
+        http = pool.client(bench)
+        url = f"{bench.endpoint}/chat/completions"
+        payload = {"model": MODEL_ID, "messages": MESSAGES, "stream": True}
+
+        def raw() -> None:
+            with http.stream("POST", url, json=payload) as resp:
+                for _ in resp.iter_bytes():
+                    pass
+
+        def decoded() -> None:
+            for _ in _openai_stream(bench, MESSAGES, None, None, http):
+                pass
+
+        raw_ms = timed(raw, iterations)
+        decoded_ms = timed(decoded, iterations)
+
+    raw_stats = summarize(raw_ms)
+    decoded_stats = summarize(decoded_ms)
+    per_delta_us = (decoded_stats["p50_ms"] - raw_stats["p50_ms"]) * 1000.0 / deltas
+    return {
+        "deltas": deltas,
+        "per_delta_overhead_us": round(per_delta_us, 2),
+        "cases": {
+            "iter_bytes": raw_stats,
+            "_openai_stream": decoded_stats,
+        },
+    }
@@ -0,0 +1,65 @@
+"""Dispatch overhead of `ToolRuntime.call` over calling the tool method directly."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ..config import Settings
+from ..runtime import ToolRuntime
+from ..session import ChatSession, _parse_tool_call
+from . import summarize, timed
+
+
+def _calls(names_args: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+    return [
+        _parse_tool_call(
+            {"id": f"b{i}", "function": {"name": name, "arguments": args}}
+        )
+        for i, (name, args) in enumerate(names_args)
+    ]
+
+
+def run(settings: Settings, iterations: int, query: str) -> dict[str, Any]:
+    runtime = ToolRuntime(settings)
+    session = ChatSession(settings=settings, runtime=runtime)
+    batch = _calls(
+        [
+            ("search_knowledge", {"query": query, "limit": 4}),
+            ("list_modules", {"query": query}),
+            ("search_knowledge", {"query": f"{query} service", "limit": 4}),
+            ("list_modules", {"query": None}),
+        ]
+    )
+    cases = {
+        "direct search_knowledge": timed(
+            lambda: runtime.search_knowledge(query, 4), iterations
+        ),
+        "call search_knowledge": timed(
+            lambda: runtime.call("search_knowledge", {"query": query, "limit": 4}),
+            iterations,
+        ),
+        "direct list_modules": timed(lambda: runtime.list_modules(query), iterations),
+        "call list_modules": timed(
+            lambda: runtime.call("list_modules", {"query": query}), iterations
+        ),
+        "batch of 4 (sequential)": timed(
+            lambda: [runtime.call(name, args) for _, name, args in batch], iterations
+        ),
+        "batch of 4 (_run_tools)": timed(lambda: session._run_tools(batch), iterations),
+    }
+    session.close()
+    stats = {name: summarize(samples) for name, samples in cases.items()}
+    overhead = {
+        tool: round(
+            (stats[f"call {tool}"]["p50_ms"] - stats[f"direct {tool}"]["p50_ms"])
+            * 1000.0,
+            1,
+        )
+        for tool in ("search_knowledge", "list_modules")
+    }
+    return {
+        "query": query,
+        "knowledge_root": str(settings.knowledge_root),
+        "call_overhead_us": overhead,
+        "cases": stats,
+    }
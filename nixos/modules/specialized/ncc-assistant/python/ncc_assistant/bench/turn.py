@@ -0,0 +1,64 @@
+"""End-to-end `ChatSession.send` turns against the bundled mock server."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from ..config import Settings
+from ..history import new_session_id
+from ..runtime import ToolRuntime
+from ..session import ChatSession
+from . import isolated_home, mock_settings, summarize
+from .mockserver import MockServer, Script
+
+
+def run(
+    settings: Settings,
+    iterations: int,
+    script: Script,
+) -> dict[str, Any]:
+    turn_ms: list[float] = []
+    first_delta_ms: list[float] = []
+    with isolated_home(), MockServer(script) as server:
+        bench = mock_settings(settings, server.endpoint)
+        session = ChatSession(settings=bench, runtime=ToolRuntime(bench))
+        session.refresh_model_label()
+        system = session.messages[:1]
+        try:
+            for i in range(iterations + 1):  # first turn warms up the pool
+                session.session_id = new_session_id()
+                session.messages = list(system)
+                t0 = time.perf_counter()
+                first = None
+                errors = []
+                for ev in session.send("Which modules configure ssh?"):
+                    kind = ev.get("kind")
+                    if kind == "assistant_delta" and first is None:
+                        first = time.perf_counter()
+                    elif kind == "error":
+                        errors.append(ev.get("text"))
+                elapsed = (time.perf_counter() - t0) * 1000.0
+                if errors:
+                    raise RuntimeError(f"turn failed: {errors[0]}")
+                if i == 0:
+                    continue
+                turn_ms.append(elapsed)
+                if first is not None:
+                    first_delta_ms.append((first - t0) * 1000.0)
+        finally:
+            session.close()
+        requests = server.requests
+
+    return {
+        "text_tokens": script.text_tokens,
+        "tool_rounds": script.tool_rounds,
+        "tool_calls_per_round": len(script.tool_calls),
+        "latency_ms": script.latency_ms,
+        "tokens_per_s": script.tokens_per_s,
+        "requests": requests,
+        "cases": {
+            "turn": summarize(turn_ms),
+            "first text delta": summarize(first_delta_ms),
+        },
+    }
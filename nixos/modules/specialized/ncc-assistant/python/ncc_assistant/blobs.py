@@ -0,0 +1,129 @@
+"""Content-addressed image store; chat messages reference images by sha256."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from .config import data_dir
+
+# Data URIs kept in memory so a request encodes each image once, not once per
+# message copy or tool round.
+ENCODED_CACHE_CHARS = 64 * 1024 * 1024
+
+_SHA_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def blobs_dir() -> Path:
+    return data_dir() / "blobs"
+
+
+def image_ref(sha256: str, mime: str, name: str = "") -> dict[str, Any]:
+    """Message content part standing in for an uploaded image."""
+    return {
+        "type": "image_ref",
+        "image_ref": {"sha256": sha256, "mime": mime, "name": name},
+    }
+
+
+def is_image_part(part: Any) -> bool:
+    return isinstance(part, dict) and part.get("type") in ("image_url", "image_ref")
+
+
+class BlobStore:
+    """Immutable blobs at <root>/<sha[:2]>/<sha>; identical content is stored once."""
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root or blobs_dir()
+        self._encoded: OrderedDict[str, str] = OrderedDict()
+        self._encoded_chars = 0
+        self._lock = threading.Lock()
+
+    def path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256
+
+    def put(self, data: bytes) -> str:
+        sha = hashlib.sha256(data).hexdigest()
+        path = self.path(sha)
+        if not path.is_file():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{sha}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        return sha
+
+    def get(self, sha256: str) -> bytes | None:
+        if not _SHA_RE.fullmatch(sha256):
+            return None  # refs come from session files; never build odd paths
+        try:
+            return self.path(sha256).read_bytes()
+        except OSError:
+            return None
+
+    def data_uri(self, sha256: str, mime: str) -> str | None:
+        key = f"{mime};{sha256}"
+        with self._lock:
+            uri = self._encoded.get(key)
+            if uri is not None:
+                self._encoded.move_to_end(key)
+                return uri
+        data = self.get(sha256)
+        if data is None:
+            return None
+        uri = f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+        with self._lock:
+            if key not in self._encoded:
+                self._encoded[key] = uri
+                self._encoded_chars += len(uri)
+            while (
+                self._encoded_chars > ENCODED_CACHE_CHARS and len(self._encoded) > 1
+            ):
+                _, old = self._encoded.popitem(last=False)
+                self._encoded_chars -= len(old)
+        return uri
+
+    def expand(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Copy of `messages` with image_ref parts turned into image_url data URIs."""
+        out: list[dict[str, Any]] = []
+        for msg in messages:
+            content = msg.get("content")
+            if not isinstance(content, list) or not any(
+                isinstance(p, dict) and p.get("type") == "image_ref" for p in content
+            ):
+                out.append(msg)
+                continue
+            parts: list[Any] = []
+            for p in content:
+                if not (isinstance(p, dict) and p.get("type") == "image_ref"):
+                    parts.append(p)
+                    continue
+                ref = p.get("image_ref") or {}
+                uri = self.data_uri(
+                    str(ref.get("sha256") or ""), str(ref.get("mime") or "image/png")
+                )
+                if uri is None:
+                    name = ref.get("name") or "image"
+                    parts.append({"type": "text", "text": f"[{name}: image missing]"})
+                else:
+                    parts.append({"type": "image_url", "image_url": {"url": uri}})
+            out.append({**msg, "content": parts})
+        return out
+
+
+_STORE: BlobStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> BlobStore:
+    """Process-wide store so the encoded-URI cache is shared by all sessions."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None or _STORE.root != blobs_dir():
+            _STORE = BlobStore()
+        return _STORE
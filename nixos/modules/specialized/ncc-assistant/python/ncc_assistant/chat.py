@@ -5,6 +5,7 @@ from __future__ import annotations
 import sys
 
 from .config import Settings
+from .metrics import format_metrics
 from .runtime import ToolRuntime
 from .session import ChatSession
 
@@ -27,6 +28,13 @@ def run_chat(settings: Settings, runtime: ToolRuntime | None = None) -> int:
     )
     print("Tip: run `ncc ai` for the graphical chat window.\n")
 
+    try:
+        return _repl(session)
+    finally:
+        session.close()
+
+
+def _repl(session: ChatSession) -> int:
     while True:
         try:
             user = input("you> ").strip()
@@ -49,6 +57,8 @@ def run_chat(settings: Settings, runtime: ToolRuntime | None = None) -> int:
                 print(f"result> {text[:500]}{'...' if len(text) > 500 else ''}")
             elif kind == "status":
                 print(f"… {event.get('text', '')}")
+            elif kind == "metrics":
+                print(f"metrics> {format_metrics(event)}")
             elif kind == "error":
                 print(f"llm-error> {event.get('text', '')}", file=sys.stderr)
 
@@ -39,6 +39,30 @@ def _env_optional_float(name: str) -> float | None:
     return float(raw)
 
 
+def _env_float(name: str, default: float) -> float:
+    raw = _env_optional_float(name)
+    return default if raw is None else raw
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = _env_optional_int(name)
+    return default if raw is None else raw
+
+
+def config_dir() -> Path:
+    """Per-user state root: $XDG_CONFIG_HOME/ncc-assistant (never systemConfig)."""
+    xdg = os.environ.get("XDG_CONFIG_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".config"
+    return base / "ncc-assistant"
+
+
+def data_dir() -> Path:
+    """Bulky per-user data (blobs, metrics, embeddings) under $XDG_DATA_HOME."""
+    xdg = os.environ.get("XDG_DATA_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".local" / "share"
+    return base / "ncc-assistant"
+
+
 def normalize_endpoint(url: str) -> str:
     """Ensure OpenAI-compatible base ends with /v1 when only a host was given."""
     u = url.strip().rstrip("/")
@@ -76,6 +100,18 @@ class Settings:
     allow_rebuild: bool
     client_mode: str  # "chat" | "mcp"
     nixos_dir: str
+    http2: bool = False
+    request_timeout: float = 120.0
+    connect_timeout: float = 30.0
+    max_connections: int = 10
+    models_cache_ttl: float = 600.0
+    config_daemon: bool = True
+    config_timeout: float = 120.0
+    context_tokens: int = 32768
+    stream_usage: bool = True
+    metrics_log: bool = True
+    prefetch_tools: bool = True
+    embedding_model: str | None = None  # None = keyword-only knowledge search
 
     @property
     def provider(self) -> str:
@@ -152,6 +188,21 @@ class Settings:
             allow_rebuild=_env_bool("NCC_ASSISTANT_ALLOW_REBUILD", False),
             client_mode=client_mode,
             nixos_dir=os.environ.get("NIXOS_DIR", "/etc/nixos"),
+            http2=_env_bool("NCC_ASSISTANT_HTTP2", False),
+            request_timeout=_env_optional_float("NCC_ASSISTANT_REQUEST_TIMEOUT")
+            or 120.0,
+            connect_timeout=_env_optional_float("NCC_ASSISTANT_CONNECT_TIMEOUT")
+            or 30.0,
+            max_connections=_env_optional_int("NCC_ASSISTANT_MAX_CONNECTIONS")
+            or 10,
+            models_cache_ttl=_env_float("NCC_ASSISTANT_MODELS_CACHE_TTL", 600.0),
+            config_daemon=_env_bool("NCC_ASSISTANT_CONFIG_DAEMON", True),
+            config_timeout=_env_float("NCC_ASSISTANT_CONFIG_TIMEOUT", 120.0),
+            context_tokens=_env_int("NCC_ASSISTANT_CONTEXT_TOKENS", 32768),
+            stream_usage=_env_bool("NCC_ASSISTANT_STREAM_USAGE", True),
+            metrics_log=_env_bool("NCC_ASSISTANT_METRICS_LOG", True),
+            prefetch_tools=_env_bool("NCC_ASSISTANT_PREFETCH_TOOLS", True),
+            embedding_model=_env_optional_str("NCC_ASSISTANT_EMBEDDING_MODEL"),
         )
 
     def load_system_prompt(self) -> str:
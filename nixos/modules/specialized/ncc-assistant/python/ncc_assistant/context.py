@@ -0,0 +1,164 @@
+"""Fit chat history into the model's context window before each request."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from .blobs import is_image_part
+
+Message = dict[str, Any]
+
+# Rough but provider-independent: ~4 chars per token for English/Nix text.
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = 1000
+MESSAGE_OVERHEAD = 4
+# Turns (a user message and everything after it) that are never shortened.
+KEEP_RECENT_TURNS = 2
+# Head of an elided tool result that is kept as a summary for the model.
+STUB_CHARS = 240
+
+
+def _text_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def message_tokens(msg: Message) -> int:
+    n = MESSAGE_OVERHEAD
+    content = msg.get("content")
+    if isinstance(content, str):
+        n += _text_tokens(content)
+    elif isinstance(content, list):
+        for part in content:
+            if not isinstance(part, dict):
+                continue
+            if is_image_part(part):
+                n += IMAGE_TOKENS
+            else:
+                n += _text_tokens(str(part.get("text") or ""))
+    for tc in msg.get("tool_calls") or []:
+        fn = tc.get("function") or {}
+        n += _text_tokens(f"{fn.get('name') or ''}{fn.get('arguments') or ''}")
+    return n
+
+
+def estimate_tokens(messages: list[Message]) -> int:
+    return sum(message_tokens(m) for m in messages)
+
+
+def tools_tokens(tools: list[dict[str, Any]]) -> int:
+    return _text_tokens(json.dumps(tools, ensure_ascii=False)) if tools else 0
+
+
+@dataclass
+class Budgeted:
+    messages: list[Message]
+    before: int
+    after: int
+    elided: int = 0  # tool results / images replaced by stubs
+    dropped: int = 0  # whole old turns removed
+
+    @property
+    def trimmed(self) -> bool:
+        return self.elided > 0 or self.dropped > 0
+
+    def describe(self) -> str:
+        bits = []
+        if self.elided:
+            bits.append(f"elided {self.elided} old tool result(s)/image(s)")
+        if self.dropped:
+            bits.append(f"dropped {self.dropped} old turn(s)")
+        return (
+            f"Context trimmed ~{self.before - self.after} tokens "
+            f"({', '.join(bits)}; ~{self.after} left)"
+        )
+
+
+def _elide_tool(msg: Message) -> Message:
+    content = str(msg.get("content") or "")
+    head = content[:STUB_CHARS].rstrip()
+    return {
+        **msg,
+        "content": (
+            f"{head}\n... (earlier {msg.get('name') or 'tool'} result elided: "
+            f"{len(content)} chars; call the tool again if needed)"
+        ),
+    }
+
+
+def _elide_images(msg: Message) -> Message:
+    parts = [
+        {"type": "text", "text": "[earlier image elided]"}
+        if is_image_part(p)
+        else p
+        for p in msg["content"]
+    ]
+    return {**msg, "content": parts}
+
+
+def request_budget(
+    context_tokens: int, max_tokens: int | None, tools: list[dict[str, Any]]
+) -> int:
+    """Tokens left for messages once tool schemas and the reply are reserved; 0 = off."""
+    if context_tokens <= 0:
+        return 0
+    reply = max_tokens or min(4096, context_tokens // 4)
+    return max(1, context_tokens - reply - tools_tokens(tools))
+
+
+def fit_messages(messages: list[Message], budget: int) -> Budgeted:
+    """
+    Return a copy of `messages` that fits `budget` tokens (best effort).
+    The leading system prompt and the last KEEP_RECENT_TURNS turns stay
+    verbatim. Older tool results and images are elided first, oldest
+    first; then the oldest whole turns are dropped so tool calls and their
+    results always leave together. The input list is not modified.
+    """
+    sizes = [message_tokens(m) for m in messages]
+    before = total = sum(sizes)
+    if budget <= 0 or total <= budget:
+        return Budgeted(messages, before, total)
+
+    head = 1 if messages and messages[0].get("role") == "system" else 0
+    user_idx = [
+        i for i in range(head, len(messages)) if messages[i].get("role") == "user"
+    ]
+    if not user_idx:
+        protected = len(messages)
+    else:
+        protected = user_idx[-min(KEEP_RECENT_TURNS, len(user_idx))]
+    out = list(messages)
+    result = Budgeted(out, before, total)
+
+    for i in range(head, protected):
+        if total <= budget:
+            break
+        msg = out[i]
+        content = msg.get("content")
+        if msg.get("role") == "tool" and len(str(content or "")) > STUB_CHARS:
+            out[i] = _elide_tool(msg)
+        elif isinstance(content, list) and any(is_image_part(p) for p in content):
+            out[i] = _elide_images(msg)
+        else:
+            continue
+        new = message_tokens(out[i])
+        total -= sizes[i] - new
+        sizes[i] = new
+        result.elided += 1
+
+    # Drop oldest turns: [first user message after head, next user message).
+    starts = [i for i in user_idx if i < protected] + [protected]
+    cut = head
+    for nxt in starts[1:]:
+        if total <= budget:
+            break
+        total -= sum(sizes[cut:nxt])
+        cut = nxt
+        result.dropped += 1
+    if cut > head:
+        # Anything before the first user message (e.g. a greeting) goes too.
+        result.messages = out[:head] + out[cut:]
+
+    result.after = total
+    return result
@@ -0,0 +1,217 @@
+"""Long-lived `ncc-assistant-config serve` co-processes (line-delimited JSON)."""
+
+from __future__ import annotations
+
+import atexit
+import itertools
+import json
+import os
+import queue
+import subprocess
+import threading
+from typing import Any
+
+Completed = subprocess.CompletedProcess[str]
+
+
+class FacadeError(RuntimeError):
+    pass
+
+
+class FacadeUnavailable(FacadeError):
+    """Worker could not be started or died before it took the request."""
+
+
+class FacadeTimeout(FacadeError):
+    pass
+
+
+class FacadeWorker:
+    """
+    One `config_bin serve` process. Requests are
+    {"id", "op", "path", "input"} lines on stdin; responses are
+    {"id", "returncode", "stdout", "stderr"} lines on stdout.
+    """
+
+    def __init__(self, config_bin: str, env: dict[str, str], timeout: float) -> None:
+        self.config_bin = config_bin
+        self.env = env
+        self.timeout = timeout
+        self._proc: subprocess.Popen[str] | None = None
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self._ids = itertools.count(1)
+        self.start_failed = False
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> None:
+        self.start_failed = True
+        try:
+            proc = subprocess.Popen(
+                [self.config_bin, "serve"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+                env=self.env,
+            )
+        except OSError as exc:
+            raise FacadeUnavailable(str(exc)) from exc
+        self._proc = proc
+        self._lines = queue.Queue()
+        threading.Thread(
+            target=self._read_loop,
+            args=(proc, self._lines),
+            name="ncc-facade-reader",
+            daemon=True,
+        ).start()
+        # Older helpers have no `serve` and exit with usage → no pong.
+        try:
+            pong = self._roundtrip({"op": "ping"}, timeout=min(self.timeout, 15.0))
+        except FacadeError as exc:
+            self.close()
+            raise FacadeUnavailable(f"{self.config_bin} serve: {exc}") from exc
+        if pong.returncode != 0:
+            self.close()
+            raise FacadeUnavailable(f"{self.config_bin} serve: ping failed")
+        self.start_failed = False
+
+    @staticmethod
+    def _read_loop(proc: subprocess.Popen[str], out: queue.Queue[str | None]) -> None:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            out.put(line)
+        out.put(None)  # EOF
+
+    def _roundtrip(self, request: dict[str, Any], timeout: float) -> Completed:
+        proc = self._proc
+        if proc is None or proc.stdin is None:
+            raise FacadeUnavailable("worker not running")
+        rid = next(self._ids)
+        try:
+            proc.stdin.write(json.dumps({"id": rid, **request}) + "\n")
+            proc.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as exc:
+            raise FacadeUnavailable(f"worker stdin closed: {exc}") from exc
+
+        while True:
+            try:
+                line = self._lines.get(timeout=timeout)
+            except queue.Empty:
+                raise FacadeTimeout(f"no reply within {timeout:.0f}s") from None
+            if line is None:
+                raise FacadeError("worker exited")
+            try:
+                reply = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if reply.get("id") != rid:
+                continue  # late reply to a request that already timed out
+            return subprocess.CompletedProcess(
+                args=[self.config_bin, str(request.get("op"))],
+                returncode=int(reply.get("returncode", 1)),
+                stdout=str(reply.get("stdout") or ""),
+                stderr=str(reply.get("stderr") or ""),
+            )
+
+    def request(
+        self, op: str, path: str | None = None, input_text: str | None = None
+    ) -> Completed:
+        if not self.alive:
+            self.start()
+        try:
+            return self._roundtrip(
+                {"op": op, "path": path or "", "input": input_text or ""},
+                self.timeout,
+            )
+        except FacadeError:
+            # Timed out or died mid-request: restart on next use.
+            self.close()
+            raise
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+
+
+class FacadePool:
+    """Up to `size` workers so parallel read-only tools don't queue on one process."""
+
+    def __init__(self, config_bin: str, nixos_dir: str, size: int, timeout: float) -> None:
+        self.config_bin = config_bin
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.env = os.environ.copy()
+        self.env["NIXOS_DIR"] = nixos_dir
+        self.disabled = False
+        self._idle: queue.LifoQueue[FacadeWorker] = queue.LifoQueue()
+        self._all: list[FacadeWorker] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> FacadeWorker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                worker = FacadeWorker(self.config_bin, self.env, self.timeout)
+                self._all.append(worker)
+                return worker
+        return self._idle.get()
+
+    def request(
+        self, op: str, path: str | None = None, input_text: str | None = None
+    ) -> Completed:
+        if self.disabled:
+            raise FacadeUnavailable("co-process mode disabled")
+        worker = self._acquire()
+        try:
+            return worker.request(op, path, input_text)
+        except FacadeUnavailable:
+            if worker.start_failed:
+                # Helper has no working `serve` → stop trying for this process.
+                self.disabled = True
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        with self._lock:
+            workers = list(self._all)
+        for worker in workers:
+            worker.close()
+
+
+_POOLS: dict[tuple[str, str], FacadePool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(config_bin: str, nixos_dir: str, size: int, timeout: float) -> FacadePool:
+    """Shared per (config_bin, NIXOS_DIR) so runtimes recreated on model/auth changes reuse workers."""
+    key = (config_bin, nixos_dir)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = FacadePool(config_bin, nixos_dir, size, timeout)
+            _POOLS[key] = pool
+        return pool
+
+
+@atexit.register
+def close_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,593 @@
+"""
+Virtualized chat feed for the Qt window: one QListView row per message.
+
+Rows are painted by a delegate; a message's QTextDocument (parsed markdown
+and layout) is only built when the row is painted and is dropped again once
+it falls out of a small LRU, so long sessions open in near-constant time.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from typing import Callable
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QEvent,
+    QModelIndex,
+    QPersistentModelIndex,
+    QPoint,
+    QRectF,
+    QSize,
+    Qt,
+    QTimer,
+    QUrl,
+    Slot,
+)
+from PySide6.QtGui import (
+    QAbstractTextDocumentLayout,
+    QColor,
+    QDesktopServices,
+    QFont,
+    QFontMetrics,
+    QGuiApplication,
+    QMouseEvent,
+    QPainter,
+    QPainterPath,
+    QPalette,
+    QPen,
+    QPixmap,
+    QTextCursor,
+    QTextDocument,
+)
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QFrame,
+    QListView,
+    QMenu,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+    QWidget,
+)
+
+ITEM_ROLE = Qt.ItemDataRole.UserRole + 1
+# Rendered documents kept alive: the visible rows plus some scroll margin.
+DOC_CACHE_SIZE = 96
+PAD_X = 14
+PAD_Y = 10
+GAP = 6  # between role label / image / body
+SPACING = 10  # between bubbles
+THUMB_W = 320
+THUMB_H = 240
+# While streaming, a row grows in steps of this many lines so the view
+# relayouts every few lines instead of on every frame.
+STREAM_STEP_LINES = 6
+
+PixmapSource = Callable[[], "QPixmap | None"]
+
+
+class FeedItem:
+    """
+    One bubble. Text is the source of truth; the document is a cache built
+    on first paint. While streaming, text[:_md_upto] is rendered as markdown
+    and the rest is a plain-text tail, re-rendered at block boundaries.
+    """
+
+    def __init__(
+        self,
+        role: str,
+        text: str = "",
+        *,
+        markdown: bool = False,
+        pixmap: QPixmap | None = None,
+        pixmap_source: PixmapSource | None = None,
+    ) -> None:
+        self.role = role
+        self.text = text
+        self.markdown = markdown
+        self._pixmap = pixmap
+        self._pixmap_source = pixmap_source
+        self._thumb: QPixmap | None = None
+        self.doc: QTextDocument | None = None
+        self.width = 0
+        self.height: int | None = None  # exact body height at self.width
+        self._estimate: tuple[int, int] | None = None  # (width, height)
+        self.row_height: int | None = None  # last size hint handed to the view
+        self.hint: tuple[int, int] | None = None  # (view width, row height) cache
+        self.streaming = False
+        self._pending: list[str] = []
+        self._md_upto = len(text)
+        self._tail_pos = 0
+
+    # -- content ---------------------------------------------------------
+
+    @property
+    def has_image(self) -> bool:
+        return self._pixmap is not None or self._pixmap_source is not None
+
+    def thumb(self) -> QPixmap | None:
+        if self._thumb is None and self.has_image:
+            pix = self._pixmap
+            if pix is None and self._pixmap_source is not None:
+                pix = self._pixmap_source()
+            if pix is None or pix.isNull():
+                self._pixmap = self._pixmap_source = None
+                return None
+            self._thumb = pix.scaled(
+                THUMB_W,
+                THUMB_H,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+            self._pixmap = None  # keep only the thumbnail
+            self.hint = None
+        return self._thumb
+
+    def set_text(self, text: str, *, markdown: bool | None = None) -> None:
+        """Replace the whole text (status updates, final streamed answer)."""
+        if markdown is not None:
+            self.markdown = markdown
+        self.text = text
+        self.streaming = False
+        self._pending.clear()
+        self._md_upto = len(text)
+        self._estimate = None
+        self.height = None
+        self.hint = None
+        if self.doc is not None:
+            self._render(self.doc)
+            self._measure()
+
+    def append(self, piece: str) -> None:
+        """Buffer a streamed delta; `flush` applies it on the next frame."""
+        self._pending.append(piece)
+
+    def flush(self) -> bool:
+        """Apply buffered deltas. Returns True when the item changed."""
+        if not self._pending:
+            return False
+        chunk = "".join(self._pending)
+        self._pending.clear()
+        self.streaming = True
+        self.text += chunk
+        self._estimate = None
+        self.height = None
+        self.hint = None
+        doc = self.doc
+        if doc is None:
+            return True  # rendered from text when the row is next painted
+        boundary = self._block_boundary() if self.markdown else self._md_upto
+        if not self.markdown:
+            cursor = QTextCursor(doc)
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText(chunk)
+        elif boundary > self._md_upto:
+            # A block finished: re-render the settled prefix as markdown and
+            # keep the unfinished remainder as plain text.
+            self._md_upto = boundary
+            self._render(doc)
+        else:
+            cursor = QTextCursor(doc)
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            if cursor.position() == self._tail_pos and self._md_upto:
+                cursor.insertBlock()
+            cursor.insertText(chunk)
+        self._measure()
+        return True
+
+    def finish(self) -> None:
+        """End of stream: size the row to its content again."""
+        self.flush()
+        self.streaming = False
+        self.hint = None
+
+    def _block_boundary(self) -> int:
+        """End of the last blank-line-terminated block outside a code fence."""
+        end = self.text.rfind("\n\n")
+        while end >= self._md_upto:
+            head = self.text[: end + 2]
+            fences = sum(
+                1 for line in head.splitlines() if line.lstrip().startswith("```")
+            )
+            if fences % 2 == 0:
+                return end + 2
+            end = self.text.rfind("\n\n", 0, end)
+        return self._md_upto
+
+    # -- layout ----------------------------------------------------------
+
+    def _render(self, doc: QTextDocument) -> None:
+        if not self.markdown:
+            doc.setPlainText(self.text)
+            return
+        doc.setMarkdown(self.text[: self._md_upto])
+        self._tail_pos = doc.characterCount() - 1
+        tail = self.text[self._md_upto :]
+        if tail:
+            cursor = QTextCursor(doc)
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            if self._md_upto:
+                cursor.insertBlock()
+            cursor.insertText(tail)
+
+    def document(self, width: int, font: QFont) -> QTextDocument:
+        if self.doc is None:
+            doc = QTextDocument()
+            doc.setDefaultFont(font)
+            doc.setDocumentMargin(0)
+            self._render(doc)
+            self.doc = doc
+            self.width = 0
+        if self.width != width:
+            # setTextWidth relayouts everything; only do it on resize.
+            self.doc.setTextWidth(width)
+            self.width = width
+            self._measure()
+        return self.doc
+
+    def _measure(self) -> None:
+        if self.doc is not None and self.width:
+            self.height = math.ceil(self.doc.size().height())
+            self.hint = None
+
+    def release(self) -> None:
+        """Drop the rendered document; the measured height stays as a hint."""
+        self.doc = None
+
+    def body_height(self, width: int, fm: QFontMetrics) -> int:
+        if self.height is not None and self.width == width:
+            return self.height
+        if self._estimate is not None and self._estimate[0] == width:
+            return self._estimate[1]
+        per_line = max(1, width // max(1, fm.averageCharWidth()))
+        lines = sum(
+            max(1, math.ceil(len(line) / per_line)) for line in self.text.split("\n")
+        )
+        est = lines * fm.lineSpacing()
+        self._estimate = (width, est)
+        return est
+
+
+class FeedModel(QAbstractListModel):
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._items: list[FeedItem] = []
+        self._live: OrderedDict[int, FeedItem] = OrderedDict()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._items):
+            return None
+        item = self._items[index.row()]
+        if role == ITEM_ROLE:
+            return item
+        if role == Qt.ItemDataRole.DisplayRole:
+            return item.text
+        return None
+
+    def items(self) -> list[FeedItem]:
+        return list(self._items)
+
+    def item(self, index: QModelIndex) -> FeedItem | None:
+        if not index.isValid() or index.row() >= len(self._items):
+            return None
+        return self._items[index.row()]
+
+    def extend(self, items: list[FeedItem]) -> None:
+        if not items:
+            return
+        start = len(self._items)
+        self.beginInsertRows(QModelIndex(), start, start + len(items) - 1)
+        self._items.extend(items)
+        self.endInsertRows()
+
+    def row_of(self, item: FeedItem) -> int:
+        # Updated items are almost always the newest ones.
+        for row in range(len(self._items) - 1, -1, -1):
+            if self._items[row] is item:
+                return row
+        return -1
+
+    def remove(self, item: FeedItem) -> None:
+        row = self.row_of(item)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._items[row]
+        self.endRemoveRows()
+        self._live.pop(id(item), None)
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._items = []
+        self._live.clear()
+        self.endResetModel()
+
+    def index_of(self, item: FeedItem) -> QModelIndex:
+        row = self.row_of(item)
+        return QModelIndex() if row < 0 else self.index(row)
+
+    def document(self, item: FeedItem, width: int, font: QFont) -> QTextDocument:
+        """Render on demand; least recently painted documents are recycled."""
+        doc = item.document(width, font)
+        key = id(item)
+        self._live[key] = item
+        self._live.move_to_end(key)
+        while len(self._live) > DOC_CACHE_SIZE:
+            _, old = self._live.popitem(last=False)
+            old.release()
+        return doc
+
+
+def _bubble_style(role: str, palette: QPalette) -> tuple[QColor | None, QPen, float]:
+    """(fill, border pen, radius) — mirrors the old per-bubble stylesheets."""
+    r = role.lower()
+    if r == "you":
+        return palette.color(QPalette.ColorRole.AlternateBase), QPen(Qt.PenStyle.NoPen), 12
+    if r in ("assistant", "status"):
+        color = palette.color(
+            QPalette.ColorRole.Highlight if r == "status" else QPalette.ColorRole.Mid
+        )
+        return palette.color(QPalette.ColorRole.Base), QPen(color, 1), 12
+    if r == "error":
+        return palette.color(QPalette.ColorRole.AlternateBase), QPen(QColor("#c44"), 1), 10
+    pen = QPen(palette.color(QPalette.ColorRole.Mid), 1, Qt.PenStyle.DashLine)
+    return None, pen, 10
+
+
+class BubbleDelegate(QStyledItemDelegate):
+    def __init__(self, view: "ChatFeed") -> None:
+        super().__init__(view)
+        self._view = view
+        self._resize_pending: set[QPersistentModelIndex] = set()
+        self._metrics: tuple[QFontMetrics, int] | None = None
+
+    def _model(self) -> FeedModel:
+        return self._view.feed_model
+
+    def _body_width(self) -> int:
+        return max(120, self._view.viewport().width() - 2 * PAD_X)
+
+    @staticmethod
+    def _label_font(font: QFont) -> QFont:
+        bold = QFont(font)
+        bold.setBold(True)
+        return bold
+
+    def _font_metrics(self, font: QFont) -> tuple[QFontMetrics, int]:
+        """(body metrics, role label height); reset by ChatFeed on font change."""
+        if self._metrics is None:
+            self._metrics = (
+                QFontMetrics(font),
+                QFontMetrics(self._label_font(font)).height(),
+            )
+        return self._metrics
+
+    def font_changed(self) -> None:
+        self._metrics = None
+
+    def _body_top(self, item: FeedItem, font: QFont) -> int:
+        """Offset of the text body from the top of the row."""
+        top = PAD_Y + self._font_metrics(font)[1] + GAP
+        if item.has_image:
+            thumb = item.thumb() if item.doc is not None else None
+            top += (thumb.height() if thumb is not None else THUMB_H) + GAP
+        return top
+
+    def _chrome_height(self, item: FeedItem, option: QStyleOptionViewItem) -> int:
+        return self._body_top(item, option.font) + PAD_Y + SPACING
+
+    def sizeHint(  # noqa: N802
+        self, option: QStyleOptionViewItem, index: QModelIndex
+    ) -> QSize:
+        item = self._model().item(index)
+        if item is None:
+            return QSize(0, 0)
+        width = self._body_width()
+        if item.hint is None or item.hint[0] != width:
+            fm = self._font_metrics(option.font)[0]
+            body = item.body_height(width, fm)
+            if item.streaming:
+                step = STREAM_STEP_LINES * fm.lineSpacing()
+                body = math.ceil(body / step) * step
+            item.hint = (width, self._chrome_height(item, option) + body)
+        item.row_height = item.hint[1]
+        return QSize(width + 2 * PAD_X, item.row_height)
+
+    def paint(
+        self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex
+    ) -> None:
+        item = self._model().item(index)
+        if item is None:
+            return
+        width = self._body_width()
+        hinted = option.rect.height()
+        doc = self._model().document(item, width, option.font)
+        thumb = item.thumb()
+
+        rect = QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -SPACING - 0.5)
+        fill, pen, radius = _bubble_style(item.role, option.palette)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        path = QPainterPath()
+        path.addRoundedRect(rect, radius, radius)
+        if fill is not None:
+            painter.fillPath(path, fill)
+        painter.setPen(pen)
+        painter.drawPath(path)
+
+        x = option.rect.x() + PAD_X
+        y = option.rect.y() + PAD_Y
+        label_font = self._label_font(option.font)
+        painter.setFont(label_font)
+        painter.setPen(option.palette.color(QPalette.ColorRole.Mid))
+        label_h = self._font_metrics(option.font)[1]
+        painter.drawText(
+            QRectF(x, y, width, label_h),
+            int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter),
+            item.role,
+        )
+        y += label_h + GAP
+        if thumb is not None:
+            painter.drawPixmap(int(x), int(y), thumb)
+            y += thumb.height() + GAP
+
+        painter.translate(x, y)
+        ctx = QAbstractTextDocumentLayout.PaintContext()
+        ctx.palette = QPalette(option.palette)
+        doc.documentLayout().draw(painter, ctx)
+        painter.restore()
+
+        if self.sizeHint(option, index).height() != hinted:
+            # The estimate was off; relayout once painting is done.
+            self._request_resize(index)
+
+    def _request_resize(self, index: QModelIndex) -> None:
+        pidx = QPersistentModelIndex(index)
+        if pidx in self._resize_pending:
+            return
+        self._resize_pending.add(pidx)
+
+        def emit() -> None:
+            self._resize_pending.discard(pidx)
+            if pidx.isValid():
+                self.sizeHintChanged.emit(QModelIndex(pidx))
+
+        QTimer.singleShot(0, emit)
+
+    def anchor_at(self, index: QModelIndex, pos: QPoint) -> str:
+        item = self._model().item(index)
+        if item is None or item.doc is None:
+            return ""
+        rect = self._view.visualRect(index)
+        top = rect.y() + self._body_top(item, self._view.font())
+        local = pos - QPoint(rect.x() + PAD_X, top)
+        return item.doc.documentLayout().anchorAt(local.toPointF())
+
+
+class ChatFeed(QListView):
+    """Message list that sticks to the bottom while the user has not scrolled up."""
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.feed_model = FeedModel(self)
+        self.setModel(self.feed_model)
+        self.setItemDelegate(BubbleDelegate(self))
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        # Single pass: size hints are cached estimates, so a full relayout is
+        # cheap, and batching would restart on every streamed height change.
+        self.setLayoutMode(QListView.LayoutMode.SinglePass)
+        self.setUniformItemSizes(False)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setMouseTracking(True)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self._context_menu)
+        self.setStyleSheet("QListView { background: transparent; }")
+
+        self._follow = True
+        vbar = self.verticalScrollBar()
+        vbar.rangeChanged.connect(self._on_range)
+        vbar.valueChanged.connect(self._on_value)
+
+    def add(
+        self,
+        role: str,
+        text: str,
+        *,
+        markdown: bool = False,
+        pixmap: QPixmap | None = None,
+    ) -> FeedItem:
+        item = FeedItem(role, text, markdown=markdown, pixmap=pixmap)
+        self.feed_model.extend([item])
+        return item
+
+    def add_many(self, items: list[FeedItem]) -> None:
+        self.feed_model.extend(items)
+
+    def update_item(self, item: FeedItem) -> None:
+        """Repaint a changed row; relayout only when its height changed."""
+        # Not dataChanged: QListView answers that with a full relayout,
+        # which costs a sizeHint call per row on every streamed frame.
+        before = item.row_height
+        idx = self.feed_model.index_of(item)
+        if not idx.isValid():
+            return
+        option = QStyleOptionViewItem()
+        option.font = self.font()
+        if self.itemDelegate().sizeHint(option, idx).height() != before:
+            self.itemDelegate().sizeHintChanged.emit(idx)
+        else:
+            self.viewport().update(self.visualRect(idx))
+
+    def remove(self, item: FeedItem) -> None:
+        self.feed_model.remove(item)
+
+    def clear(self) -> None:
+        self.feed_model.clear()
+
+    def scroll_to_bottom(self) -> None:
+        self._follow = True
+        self.scrollToBottom()
+
+    @Slot(int, int)
+    def _on_range(self, _low: int, high: int) -> None:
+        if self._follow:
+            self.verticalScrollBar().setValue(high)
+
+    @Slot(int)
+    def _on_value(self, value: int) -> None:
+        self._follow = value >= self.verticalScrollBar().maximum() - 4
+
+    def changeEvent(self, event: QEvent) -> None:  # noqa: N802
+        if event.type() == QEvent.Type.FontChange:
+            delegate = self.itemDelegate()
+            if isinstance(delegate, BubbleDelegate):
+                delegate.font_changed()
+            for item in self.feed_model.items():
+                item.release()
+                item.width = 0
+                item.height = item.hint = None
+        super().changeEvent(event)
+
+    def _anchor(self, pos: QPoint) -> str:
+        idx = self.indexAt(pos)
+        if not idx.isValid():
+            return ""
+        delegate = self.itemDelegate()
+        return delegate.anchor_at(idx, pos) if isinstance(delegate, BubbleDelegate) else ""
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:  # noqa: N802
+        anchor = self._anchor(event.position().toPoint())
+        self.viewport().setCursor(
+            Qt.CursorShape.PointingHandCursor if anchor else Qt.CursorShape.ArrowCursor
+        )
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event: QMouseEvent) -> None:  # noqa: N802
+        if event.button() == Qt.MouseButton.LeftButton:
+            anchor = self._anchor(event.position().toPoint())
+            if anchor:
+                QDesktopServices.openUrl(QUrl(anchor))
+                return
+        super().mouseReleaseEvent(event)
+
+    @Slot(QPoint)
+    def _context_menu(self, pos: QPoint) -> None:
+        item = self.feed_model.item(self.indexAt(pos))
+        if item is None:
+            return
+        menu = QMenu(self)
+        copy = menu.addAction("Copy message")
+        anchor = self._anchor(pos)
+        copy_link = menu.addAction("Copy link") if anchor else None
+        chosen = menu.exec(self.viewport().mapToGlobal(pos))
+        if chosen is copy:
+            QGuiApplication.clipboard().setText(item.text)
+        elif copy_link is not None and chosen is copy_link:
+            QGuiApplication.clipboard().setText(anchor)
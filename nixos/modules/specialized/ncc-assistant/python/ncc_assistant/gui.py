@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import base64
 import mimetypes
 import sys
 import threading
@@ -10,8 +9,18 @@ import traceback
 from pathlib import Path
 from urllib.parse import urlparse
 
-from PySide6.QtCore import QObject, Qt, QThread, QTimer, Signal, Slot
-from PySide6.QtGui import QFont, QKeyEvent, QPixmap
+from PySide6.QtCore import (
+    QBuffer,
+    QByteArray,
+    QIODevice,
+    QObject,
+    Qt,
+    QThread,
+    QTimer,
+    Signal,
+    Slot,
+)
+from PySide6.QtGui import QFont, QImage, QKeyEvent, QPixmap
 from PySide6.QtWidgets import (
     QApplication,
     QComboBox,
@@ -19,7 +28,6 @@ from PySide6.QtWidgets import (
     QDialogButtonBox,
     QFileDialog,
     QFormLayout,
-    QFrame,
     QHBoxLayout,
     QLabel,
     QLineEdit,
@@ -29,21 +37,66 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QProgressBar,
     QPushButton,
-    QScrollArea,
-    QSizePolicy,
-    QTextBrowser,
     QTextEdit,
     QVBoxLayout,
     QWidget,
 )
 
 from .auth import apply_api_key, probe_needs_auth, with_cached_credentials
+from .blobs import get_store
 from .config import Settings
-from .history import list_sessions, load_session
+from .feed import ChatFeed, FeedItem, PixmapSource
+from .history import count_sessions, list_sessions, load_session
+from .metrics import format_metrics
 from .runtime import ToolRuntime
 from .session import ChatSession
 
 MAX_IMAGE_BYTES = 8 * 1024 * 1024
+# Longest edge sent to vision models; larger images are scaled down before
+# upload (providers downscale anyway, so the extra pixels only cost bandwidth).
+MAX_IMAGE_EDGE = 1568
+JPEG_QUALITY = 85
+_PASSTHROUGH_MIMES = ("image/png", "image/jpeg", "image/webp", "image/gif")
+# Streamed deltas are buffered and painted at most this often (~30 Hz).
+STREAM_FRAME_MS = 33
+SESSION_PAGE = 50
+
+
+def _prepare_image(raw: bytes, mime: str) -> tuple[bytes, str]:
+    """Downscale to MAX_IMAGE_EDGE and re-encode; small common formats pass through."""
+    image = QImage()
+    if not image.loadFromData(raw):
+        return raw, mime
+    if max(image.width(), image.height()) <= MAX_IMAGE_EDGE:
+        if mime in _PASSTHROUGH_MIMES:
+            return raw, mime
+    else:
+        image = image.scaled(
+            MAX_IMAGE_EDGE,
+            MAX_IMAGE_EDGE,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+    fmt, out_mime = (
+        ("PNG", "image/png") if image.hasAlphaChannel() else ("JPEG", "image/jpeg")
+    )
+    buf = QByteArray()
+    dev = QBuffer(buf)
+    dev.open(QIODevice.OpenModeFlag.WriteOnly)
+    if not image.save(dev, fmt, JPEG_QUALITY if fmt == "JPEG" else -1):
+        return raw, mime
+    return bytes(buf.data()), out_mime
+
+
+def _blob_pixmap_source(sha: str) -> PixmapSource:
+    def load() -> QPixmap | None:
+        data = get_store().get(sha)
+        pix = QPixmap()
+        if data is None or not pix.loadFromData(data):
+            return None
+        return pix
+
+    return load
 
 
 class ConfirmBridge(QObject):
@@ -69,6 +122,45 @@ class ConfirmBridge(QObject):
         self._event.set()
 
 
+class ModelLoader(QObject):
+    """
+    Endpoint round trips for a newly opened session, off the GUI thread: an
+    auth probe when no key is known, then one GET /models. Results carry the
+    generation they were started for; the window drops superseded ones.
+    """
+
+    loaded = Signal(int, object, str)
+    auth_needed = Signal(int)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.generation = 0
+
+    def start(self, session: ChatSession) -> None:
+        self.generation += 1
+        threading.Thread(
+            target=self._run,
+            args=(session, self.generation),
+            name="ncc-model-discovery",
+            daemon=True,
+        ).start()
+
+    def _run(self, session: ChatSession, generation: int) -> None:
+        settings = session.settings
+        try:
+            if (
+                not settings.api_key
+                and settings.api != "anthropic"
+                and probe_needs_auth(settings) is True
+            ):
+                self.auth_needed.emit(generation)
+                return
+            models, label = session.discover_models()
+            self.loaded.emit(generation, models, label)
+        except RuntimeError:  # window closed meanwhile; nobody to tell
+            pass
+
+
 class AuthDialog(QDialog):
     def __init__(self, endpoint: str, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -129,15 +221,23 @@ class SessionPicker(QDialog):
         self.choice: str | None = None  # "new" | session_id
         layout = QVBoxLayout(self)
         layout.addWidget(QLabel("Continue a previous chat or start a new one."))
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Search titles…")
+        self.search.setClearButtonEnabled(True)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(200)
+        self._search_timer.timeout.connect(self._reload)
+        self.search.textChanged.connect(self._search_timer.start)
+        layout.addWidget(self.search)
         self.list = QListWidget()
-        for s in list_sessions():
-            item = QListWidgetItem(
-                f"{s['title']}\n{s['updated'][:19]}  ·  {s.get('model') or ''}  ·  {s['message_count']} msgs"
-            )
-            item.setData(Qt.ItemDataRole.UserRole, s["id"])
-            self.list.addItem(item)
         self.list.itemDoubleClicked.connect(self._continue_item)
         layout.addWidget(self.list)
+        self.more_btn = QPushButton("Load more")
+        self.more_btn.clicked.connect(self._load_more)
+        layout.addWidget(self.more_btn)
+        self._total = 0
+        self._reload()
         row = QHBoxLayout()
         new_btn = QPushButton("New chat")
         new_btn.clicked.connect(self._new)
@@ -150,6 +250,24 @@ class SessionPicker(QDialog):
         row.addWidget(cancel)
         layout.addLayout(row)
 
+    def _reload(self) -> None:
+        self.list.clear()
+        self._total = count_sessions(self.search.text())
+        self._load_more()
+
+    def _load_more(self) -> None:
+        for s in list_sessions(
+            SESSION_PAGE, self.list.count(), self.search.text()
+        ):
+            item = QListWidgetItem(
+                f"{s['title']}\n{s['updated'][:19]}  ·  {s.get('model') or ''}  ·  {s['message_count']} msgs"
+            )
+            item.setData(Qt.ItemDataRole.UserRole, s["id"])
+            self.list.addItem(item)
+        shown = self.list.count()
+        self.more_btn.setVisible(shown < self._total)
+        self.more_btn.setText(f"Load more ({shown} of {self._total})")
+
     def _new(self) -> None:
         self.choice = "new"
         self.accept()
@@ -157,7 +275,7 @@ class SessionPicker(QDialog):
     def _continue(self) -> None:
         item = self.list.currentItem()
         if not item:
-            if self.list.count() == 0:
+            if self.list.count() == 0 and not self.search.text().strip():
                 self._new()
                 return
             QMessageBox.information(self, "NCC AI", "Select a session first.")
@@ -196,99 +314,6 @@ class Worker(QThread):
             self.failed.emit(f"{exc}\n{traceback.format_exc()}")
 
 
-class Bubble(QFrame):
-    def __init__(
-        self,
-        role: str,
-        text: str = "",
-        *,
-        markdown: bool = False,
-        pixmap: QPixmap | None = None,
-        parent: QWidget | None = None,
-    ) -> None:
-        super().__init__(parent)
-        self.setObjectName("nccBubble")
-        self.setFrameShape(QFrame.Shape.NoFrame)
-        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
-        self._markdown = markdown
-        self._raw = text
-
-        role_l = role.lower()
-        if role_l == "you":
-            self.setStyleSheet(
-                "QFrame#nccBubble { background: palette(alternate-base); border-radius: 12px; }"
-            )
-        elif role_l in ("assistant", "status"):
-            border = (
-                "border: 1px solid palette(highlight);"
-                if role_l == "status"
-                else "border: 1px solid palette(mid);"
-            )
-            self.setStyleSheet(
-                f"QFrame#nccBubble {{ background: palette(base); {border} border-radius: 12px; }}"
-            )
-        elif role_l == "error":
-            self.setStyleSheet(
-                "QFrame#nccBubble { background: palette(alternate-base); "
-                "border: 1px solid #c44; border-radius: 10px; }"
-            )
-        else:
-            self.setStyleSheet(
-                "QFrame#nccBubble { background: transparent; "
-                "border: 1px dashed palette(mid); border-radius: 10px; }"
-            )
-
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(14, 10, 14, 10)
-        layout.setSpacing(6)
-
-        who = QLabel(role)
-        who.setStyleSheet("font-weight: 700; color: palette(mid);")
-        layout.addWidget(who)
-
-        if pixmap is not None and not pixmap.isNull():
-            img = QLabel()
-            img.setPixmap(
-                pixmap.scaled(
-                    320,
-                    240,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-            )
-            layout.addWidget(img)
-
-        if markdown:
-            self.body = QTextBrowser()
-            self.body.setOpenExternalLinks(True)
-            self.body.setFrameShape(QFrame.Shape.NoFrame)
-            self.body.setStyleSheet("background: transparent; padding: 0;")
-            self.body.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            self.set_markdown(text)
-            layout.addWidget(self.body)
-        else:
-            self.body = QLabel(text)
-            self.body.setWordWrap(True)
-            self.body.setTextInteractionFlags(
-                Qt.TextInteractionFlag.TextSelectableByMouse
-                | Qt.TextInteractionFlag.TextSelectableByKeyboard
-            )
-            layout.addWidget(self.body)
-
-    def set_markdown(self, text: str) -> None:
-        self._raw = text
-        if isinstance(self.body, QTextBrowser):
-            self.body.setMarkdown(text or "")
-            # shrink height to content
-            doc = self.body.document()
-            doc.setTextWidth(self.body.viewport().width() or 700)
-            h = int(doc.size().height()) + 8
-            self.body.setFixedHeight(max(h, 24))
-
-    def append_markdown(self, piece: str) -> None:
-        self.set_markdown((self._raw or "") + piece)
-
-
 class Composer(QTextEdit):
     submit = Signal()
 
@@ -318,17 +343,19 @@ class ChatWindow(QMainWindow):
         self._last_user = ""
         self._busy = False
         self._pending_images: list[dict[str, str]] = []
-        self._status_bubble: Bubble | None = None
-        self._stream_bubble: Bubble | None = None
+        self._status_bubble: FeedItem | None = None
+        self._stream_bubble: FeedItem | None = None
         self._pulse = 0
         self._model_guard = False
+        self._loader = ModelLoader(self)
+        self._loader.loaded.connect(self.on_models_loaded)
+        self._loader.auth_needed.connect(self.on_auth_needed)
 
         self.setWindowTitle(f"NCC AI — {session.title}")
         self.resize(920, 780)
         self.setStyleSheet(
             """
             QMainWindow, QWidget#nccRoot { background: palette(window); }
-            QScrollArea { border: none; background: transparent; }
             QTextEdit#nccComposer {
               border: 1px solid palette(mid); border-radius: 10px;
               padding: 8px; background: palette(base);
@@ -381,15 +408,8 @@ class ChatWindow(QMainWindow):
         bar.addWidget(self.meta)
         layout.addLayout(bar)
 
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.feed_host = QWidget()
-        self.feed = QVBoxLayout(self.feed_host)
-        self.feed.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.feed.setSpacing(10)
-        self.scroll.setWidget(self.feed_host)
-        layout.addWidget(self.scroll, stretch=1)
+        self.feed = ChatFeed()
+        layout.addWidget(self.feed, stretch=1)
 
         self.busy_bar = QProgressBar()
         self.busy_bar.setObjectName("nccBusy")
@@ -403,6 +423,11 @@ class ChatWindow(QMainWindow):
         self.status.hide()
         layout.addWidget(self.status)
 
+        self.metrics_label = QLabel("")
+        self.metrics_label.setStyleSheet("color: palette(mid);")
+        self.metrics_label.hide()
+        layout.addWidget(self.metrics_label)
+
         self.attach_label = QLabel("")
         self.attach_label.setStyleSheet("color: palette(mid);")
         self.attach_label.hide()
@@ -438,10 +463,15 @@ class ChatWindow(QMainWindow):
         self._pulse_timer.setInterval(450)
         self._pulse_timer.timeout.connect(self._pulse_status)
 
+        self._stream_timer = QTimer(self)
+        self._stream_timer.setInterval(STREAM_FRAME_MS)
+        self._stream_timer.timeout.connect(self._flush_stream)
+
         self._populate_models()
         self._update_meta()
         self._update_vision_ui()
         self._replay_history_bubbles()
+        self._discover_models()
 
         if len(self.session.messages) <= 1:
             writes = "on" if session.settings.writes_enabled else "off"
@@ -455,9 +485,10 @@ class ChatWindow(QMainWindow):
             )
 
     def _populate_models(self) -> None:
+        """Fill the picker from the session's last discovery (no network)."""
         self._model_guard = True
         self.model_combo.clear()
-        models = self.session.refresh_models()
+        models = self.session.available_models
         current = self.session.settings.model or self.session.model_label
         if not models and current:
             models = [{"id": current, "vision": self.session.current_model_vision()}]
@@ -479,27 +510,77 @@ class ChatWindow(QMainWindow):
             self.session.set_model(self.model_combo.currentData())
         self._model_guard = False
 
+    def _discover_models(self) -> None:
+        self.model_combo.setToolTip("Discovering models…")
+        self._loader.start(self.session)
+
+    @Slot(int, object, str)
+    def on_models_loaded(self, generation: int, models: object, label: str) -> None:
+        if generation != self._loader.generation:
+            return
+        self.session.apply_models(list(models), label)
+        self.model_combo.setToolTip("")
+        self._populate_models()
+        self._update_vision_ui()
+
+    @Slot(int)
+    def on_auth_needed(self, generation: int) -> None:
+        if generation != self._loader.generation:
+            return
+        if self._reauth():
+            self._discover_models()
+            return
+        # Cancelled: keep the window usable; a failed send offers the dialog again.
+        self.on_models_loaded(
+            generation, self.session.available_models, "auto (unavailable)"
+        )
+
+    def _reauth(self) -> bool:
+        try:
+            settings = prompt_auth_dialog(self.session.settings, self)
+        except RuntimeError:
+            return False
+        self.session.settings = settings
+        self.session.runtime = ToolRuntime(settings, confirm_hook=self.confirm.confirm)
+        self._update_meta()
+        return True
+
     def _replay_history_bubbles(self) -> None:
+        # One batched insert; rows render (and load images) when scrolled into view.
+        items: list[FeedItem] = []
         for msg in self.session.messages:
             role = msg.get("role")
             if role == "system":
                 continue
             content = msg.get("content")
             text = ""
+            sha = ""
             if isinstance(content, str):
                 text = content
             elif isinstance(content, list):
                 bits = []
                 for p in content:
-                    if isinstance(p, dict) and p.get("type") == "text":
+                    if not isinstance(p, dict):
+                        continue
+                    if p.get("type") == "text":
                         bits.append(p.get("text") or "")
+                    elif p.get("type") == "image_ref" and not sha:
+                        sha = str((p.get("image_ref") or {}).get("sha256") or "")
                 text = "\n".join(bits) or "[multimodal message]"
             if role == "user":
-                self._add_bubble("You", text, markdown=False)
+                items.append(
+                    FeedItem(
+                        "You",
+                        text,
+                        pixmap_source=_blob_pixmap_source(sha) if sha else None,
+                    )
+                )
             elif role == "assistant":
-                self._add_bubble("Assistant", text or "", markdown=True)
+                items.append(FeedItem("Assistant", text or "", markdown=True))
             elif role == "tool":
-                self._add_bubble("Result", text[:1400], markdown=False)
+                items.append(FeedItem("Result", text[:1400]))
+        self.feed.add_many(items)
+        self._scroll_bottom()
 
     def _update_meta(self) -> None:
         s = self.session.settings
@@ -515,10 +596,23 @@ class ChatWindow(QMainWindow):
             self._refresh_attach_label()
 
     def _scroll_bottom(self) -> None:
-        QApplication.processEvents()
-        self.scroll.verticalScrollBar().setValue(
-            self.scroll.verticalScrollBar().maximum()
-        )
+        # No processEvents(): the feed follows its scroll range after layout.
+        self.feed.scroll_to_bottom()
+
+    @Slot()
+    def _flush_stream(self) -> None:
+        if self._stream_bubble is None:
+            self._stream_timer.stop()
+            return
+        if self._stream_bubble.flush():
+            self.feed.update_item(self._stream_bubble)
+
+    def _end_stream(self) -> None:
+        self._stream_timer.stop()
+        if self._stream_bubble is not None:
+            self._stream_bubble.finish()
+            self.feed.update_item(self._stream_bubble)
+            self._stream_bubble = None
 
     def _add_bubble(
         self,
@@ -527,11 +621,10 @@ class ChatWindow(QMainWindow):
         *,
         markdown: bool = False,
         pixmap: QPixmap | None = None,
-    ) -> Bubble:
-        bubble = Bubble(role, text, markdown=markdown, pixmap=pixmap)
-        self.feed.addWidget(bubble)
+    ) -> FeedItem:
+        item = self.feed.add(role, text, markdown=markdown, pixmap=pixmap)
         self._scroll_bottom()
-        return bubble
+        return item
 
     def _set_activity(self, text: str | None) -> None:
         if not text:
@@ -540,8 +633,7 @@ class ChatWindow(QMainWindow):
             self.status.setText("")
             self._pulse_timer.stop()
             if self._status_bubble is not None:
-                self.feed.removeWidget(self._status_bubble)
-                self._status_bubble.deleteLater()
+                self.feed.remove(self._status_bubble)
                 self._status_bubble = None
             return
         self.busy_bar.show()
@@ -553,9 +645,8 @@ class ChatWindow(QMainWindow):
         if self._status_bubble is None:
             self._status_bubble = self._add_bubble("Status", text + "…")
         else:
-            labels = self._status_bubble.findChildren(QLabel)
-            if labels:
-                labels[-1].setText(text + "…")
+            self._status_bubble.set_text(text + "…")
+            self.feed.update_item(self._status_bubble)
             self._scroll_bottom()
 
     def _pulse_status(self) -> None:
@@ -566,9 +657,8 @@ class ChatWindow(QMainWindow):
         shown = base + ("." * self._pulse if self._pulse else "…")
         self.status.setText(shown)
         if self._status_bubble is not None:
-            labels = self._status_bubble.findChildren(QLabel)
-            if labels:
-                labels[-1].setText(shown)
+            self._status_bubble.set_text(shown)
+            self.feed.update_item(self._status_bubble)
 
     def _set_busy(self, busy: bool) -> None:
         self._busy = busy
@@ -579,7 +669,7 @@ class ChatWindow(QMainWindow):
         self.stop_btn.setEnabled(busy)
         if not busy:
             self._set_activity(None)
-            self._stream_bubble = None
+            self._end_stream()
 
     def _refresh_attach_label(self) -> None:
         n = len(self._pending_images)
@@ -605,11 +695,10 @@ class ChatWindow(QMainWindow):
         if self._busy:
             return
         self.session.reset_conversation()
-        while self.feed.count():
-            item = self.feed.takeAt(0)
-            w = item.widget()
-            if w:
-                w.deleteLater()
+        self.feed.clear()
+        self._status_bubble = None
+        self._stream_bubble = None
+        self.metrics_label.hide()
         self._add_bubble("NCC", "New session started.", markdown=True)
         self._update_meta()
 
@@ -633,6 +722,7 @@ class ChatWindow(QMainWindow):
             from dataclasses import replace
 
             settings = replace(settings, model=model)
+        previous = self.session
         self.session = ChatSession.create(
             settings,
             interactive_auth=False,
@@ -640,16 +730,21 @@ class ChatWindow(QMainWindow):
             messages=data.get("messages") or [],
             session_id=data.get("id"),
             title=data.get("title"),
+            http=previous.http,
+            discover_models=False,
         )
-        while self.feed.count():
-            item = self.feed.takeAt(0)
-            w = item.widget()
-            if w:
-                w.deleteLater()
+        if self.session.settings.endpoint == previous.settings.endpoint:
+            # Same catalog: show it now, discovery only refreshes it.
+            self.session.available_models = previous.available_models
+        self.feed.clear()
+        self._status_bubble = None
+        self._stream_bubble = None
+        self.metrics_label.hide()
         self._populate_models()
         self._update_meta()
         self._update_vision_ui()
         self._replay_history_bubbles()
+        self._discover_models()
 
     @Slot(dict)
     def on_confirm_request(self, payload: dict) -> None:
@@ -699,10 +794,16 @@ class ChatWindow(QMainWindow):
             mime, _ = mimetypes.guess_type(str(p))
             if not mime or not mime.startswith("image/"):
                 mime = "image/png"
+            data, mime = _prepare_image(raw, mime)
+            try:
+                sha = get_store().put(data)
+            except OSError as exc:
+                QMessageBox.warning(self, "NCC AI", f"Cannot store {p.name}: {exc}")
+                continue
             self._pending_images.append(
                 {
                     "mime": mime,
-                    "data_b64": base64.b64encode(raw).decode("ascii"),
+                    "sha256": sha,
                     "name": p.name,
                     "path": str(p),
                 }
@@ -764,17 +865,21 @@ class ChatWindow(QMainWindow):
             return
         if kind == "assistant_start":
             self._set_activity(f"Streaming from {self.session.model_label}")
+            self._end_stream()
             self._stream_bubble = self._add_bubble("Assistant", "", markdown=True)
         elif kind == "assistant_delta":
             if self._stream_bubble is None:
                 self._stream_bubble = self._add_bubble("Assistant", "", markdown=True)
-            self._stream_bubble.append_markdown(event.get("text") or "")
-            self._scroll_bottom()
+            self._stream_bubble.append(event.get("text") or "")
+            if not self._stream_timer.isActive():
+                self._stream_timer.start()
         elif kind == "assistant":
             self._set_activity(None)
+            self._stream_timer.stop()
             if event.get("streamed") and self._stream_bubble is not None:
-                # already rendered via deltas; ensure final markdown
-                self._stream_bubble.set_markdown(event.get("text") or "")
+                # Final full render replaces the incremental one.
+                self._stream_bubble.set_text(event.get("text") or "")
+                self.feed.update_item(self._stream_bubble)
                 self._stream_bubble = None
             else:
                 self._add_bubble(
@@ -790,9 +895,11 @@ class ChatWindow(QMainWindow):
             self._add_bubble("Result", f"```\n{body}\n```", markdown=True)
         elif kind == "status":
             self._set_activity(str(event.get("text") or "Working"))
+        elif kind == "metrics":
+            self._show_metrics(event)
         elif kind == "error":
             self._set_activity(None)
-            self._stream_bubble = None
+            self._end_stream()
             self._add_bubble("Error", event.get("text") or "")
             self._maybe_reauth(str(event.get("text") or ""))
         elif kind == "done":
@@ -800,22 +907,24 @@ class ChatWindow(QMainWindow):
             self._update_meta()
             self.session.persist()
 
+    def _show_metrics(self, event: dict) -> None:
+        line = format_metrics(event)
+        self.metrics_label.setText(f"Round {event.get('round')}: {line}")
+        self.metrics_label.setToolTip(
+            f"{event.get('model')} @ {event.get('endpoint')}\n"
+            f"reply {event.get('response_ms')} ms"
+        )
+        self.metrics_label.show()
+
     def _maybe_reauth(self, err: str) -> None:
         low = err.lower()
         if "401" not in low and "403" not in low and "unauthorized" not in low:
             return
-        try:
-            self.session.settings = prompt_auth_dialog(self.session.settings, self)
-            self.session.runtime = ToolRuntime(
-                self.session.settings, confirm_hook=self.confirm.confirm
-            )
-            self.session.refresh_models()
-            self._populate_models()
-            self._update_meta()
-            if self._last_user:
-                self.composer.setPlainText(self._last_user)
-        except RuntimeError:
-            pass
+        if not self._reauth():
+            return
+        self._discover_models()
+        if self._last_user:
+            self.composer.setPlainText(self._last_user)
 
     @Slot(str)
     def on_fail(self, message: str) -> None:
@@ -837,11 +946,11 @@ def run_gui(settings: Settings | None = None) -> int:
         settings or Settings.from_env(client_mode="chat")
     )
 
+    # Anthropic always needs a key, so ask now; OpenAI-compatible endpoints
+    # are probed by the window's model loader without blocking startup.
     try:
-        if not settings.api_key:
-            need = probe_needs_auth(settings)
-            if need is True or settings.api == "anthropic":
-                settings = prompt_auth_dialog(settings)
+        if not settings.api_key and settings.api == "anthropic":
+            settings = prompt_auth_dialog(settings)
     except RuntimeError as exc:
         QMessageBox.critical(None, "NCC AI", str(exc))
         return 1
@@ -870,7 +979,9 @@ def run_gui(settings: Settings | None = None) -> int:
             )
 
     try:
-        session = ChatSession.create(settings, **session_kwargs)
+        session = ChatSession.create(
+            settings, discover_models=False, **session_kwargs
+        )
     except RuntimeError as exc:
         QMessageBox.critical(None, "NCC AI", str(exc))
         return 1
@@ -878,4 +989,7 @@ def run_gui(settings: Settings | None = None) -> int:
     window = ChatWindow(session, confirm)
     window.show()
     window.composer.setFocus()
-    return int(app.exec())
+    try:
+        return int(app.exec())
+    finally:
+        window.session.close()
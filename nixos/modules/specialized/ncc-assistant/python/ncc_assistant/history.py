@@ -1,13 +1,28 @@
-"""Persist and resume NCC AI chat sessions under ~/.config/ncc-assistant/sessions/."""
+"""
+Persist and resume NCC AI chat sessions under ~/.config/ncc-assistant/sessions/.
+
+Sessions are append-only journals (`<id>.jsonl`): a header line, then one
+line per message and a small meta line per save. Legacy `<id>.json`
+snapshots are still read and are replaced by a journal on the next save.
+"""
 
 from __future__ import annotations
 
 import json
 import os
+import sqlite3
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+from .session_catalog import CATALOG_NAME, SessionCatalog
+
+JOURNAL_VERSION = 1
+# Superseded meta lines tolerated before the journal is rewritten.
+COMPACT_AFTER_META = 200
+
+_META_KEYS = ("title", "model", "endpoint", "updated")
 
 
 def sessions_dir() -> Path:
@@ -27,57 +42,288 @@ def new_session_id() -> str:
 
 
 def session_path(session_id: str) -> Path:
+    return sessions_dir() / f"{session_id}.jsonl"
+
+
+def legacy_session_path(session_id: str) -> Path:
     return sessions_dir() / f"{session_id}.json"
 
 
-def list_sessions(limit: int = 40) -> list[dict[str, Any]]:
+def _line(record: dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _message_line(message: dict[str, Any]) -> str:
+    return _line({"type": "message", "message": message})
+
+
+_MESSAGE_PREFIX = '{"type": "message"'
+
+
+def _replay(path: Path, *, with_messages: bool = True) -> dict[str, Any] | None:
+    """Fold a journal into the snapshot shape; a torn last line is ignored."""
+    data: dict[str, Any] = {"messages": []}
+    count = 0
+    try:
+        fh = path.open(encoding="utf-8")
+    except OSError:
+        return None
+    with fh:
+        for raw in fh:
+            if raw.startswith(_MESSAGE_PREFIX):
+                if not with_messages:
+                    count += 1
+                    continue
+            try:
+                rec = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(rec, dict):
+                continue
+            kind = rec.get("type")
+            if kind == "message" and isinstance(rec.get("message"), dict):
+                data["messages"].append(rec["message"])
+            elif kind in ("header", "meta"):
+                for key, value in rec.items():
+                    if key not in ("type", "version"):
+                        data[key] = value
+    if "id" not in data:
+        return None
+    if not with_messages:
+        data["message_count"] = count
+    return data
+
+
+def _read_legacy(path: Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def catalog() -> SessionCatalog:
+    return SessionCatalog(sessions_dir() / CATALOG_NAME)
+
+
+def scan_sessions() -> list[dict[str, Any]]:
+    """Summaries read from the session files themselves (slow; repairs the catalog)."""
     items: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for path in sessions_dir().glob("*.jsonl"):
+        data = _replay(path, with_messages=False)
+        if data is None:
+            continue
+        seen.add(path.stem)
+        items.append(_summary(data, path, data["message_count"]))
     for path in sessions_dir().glob("*.json"):
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
+        if path.stem in seen:
             continue
-        items.append(
-            {
-                "id": data.get("id") or path.stem,
-                "title": data.get("title") or "Untitled",
-                "updated": data.get("updated") or data.get("created") or "",
-                "model": data.get("model") or "",
-                "message_count": len(data.get("messages") or []),
-                "path": str(path),
-            }
-        )
+        data = _read_legacy(path)
+        if data is None:
+            continue
+        items.append(_summary(data, path, len(data.get("messages") or [])))
     items.sort(key=lambda x: x.get("updated") or "", reverse=True)
-    return items[:limit]
+    return items
+
+
+def rebuild_catalog() -> int:
+    """Re-index every session file; returns the number of sessions found."""
+    return catalog().replace_all(scan_sessions())
+
+
+def list_sessions(
+    limit: int = 40, offset: int = 0, query: str | None = None
+) -> list[dict[str, Any]]:
+    """Newest first from the catalog; optional case-insensitive title filter."""
+    cat = catalog()
+    try:
+        if not cat.exists:
+            rebuild_catalog()
+        return cat.list(limit, offset, query)
+    except sqlite3.Error:
+        q = (query or "").strip().lower()
+        items = [s for s in scan_sessions() if q in s["title"].lower()]
+        return items[offset : offset + limit]
+
+
+def count_sessions(query: str | None = None) -> int:
+    cat = catalog()
+    try:
+        if not cat.exists:
+            rebuild_catalog()
+        return cat.count(query)
+    except sqlite3.Error:
+        q = (query or "").strip().lower()
+        return sum(1 for s in scan_sessions() if q in s["title"].lower())
+
+
+def _catalog_update(update: Callable[[SessionCatalog], None]) -> None:
+    """Apply a row change; on failure drop the catalog so the next listing rebuilds it."""
+    cat = catalog()
+    try:
+        if cat.exists:
+            update(cat)
+    except sqlite3.Error:
+        try:
+            cat.path.unlink()
+        except OSError:
+            pass
+
+
+def _summary(data: dict[str, Any], path: Path, count: int) -> dict[str, Any]:
+    return {
+        "id": data.get("id") or path.stem,
+        "title": data.get("title") or "Untitled",
+        "created": data.get("created") or "",
+        "updated": data.get("updated") or data.get("created") or "",
+        "model": data.get("model") or "",
+        "message_count": count,
+        "path": str(path),
+    }
 
 
 def load_session(session_id: str) -> dict[str, Any] | None:
     path = session_path(session_id)
-    if not path.is_file():
-        return None
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
-        return None
+    if path.is_file():
+        return _replay(path)
+    legacy = legacy_session_path(session_id)
+    if legacy.is_file():
+        return _read_legacy(legacy)
+    return None
+
+
+class SessionJournal:
+    """
+    Append-only writer for one session. A save serialises only the messages
+    added since the previous save plus one meta line. The file is rewritten
+    atomically on the first save (unless `resume` adopted the file it was
+    loaded from), when earlier history was replaced or shrank, when the
+    file changed behind our back, or after COMPACT_AFTER_META superseded
+    meta lines.
+    """
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.path = session_path(session_id)
+        self.written = 0  # messages on disk
+        self._size: int | None = None  # expected file size; None → rewrite
+        self._meta_lines = 0
+        self._tail: dict[str, Any] | None = None  # last message written
+        self._created: str | None = None
+
+    def resume(self, messages: list[dict[str, Any]]) -> None:
+        """
+        Continue the journal `messages` was just loaded from, so the next
+        save appends. A missing or legacy file, or one whose last line is
+        torn, is left to the usual rewrite.
+        """
+        try:
+            raw = self.path.read_bytes()
+        except OSError:
+            return
+        # Header + one line per message + meta lines; no JSON parsing needed.
+        meta_lines = raw.count(b"\n") - 1 - len(messages)
+        if not raw.endswith(b"\n") or meta_lines < 0:
+            return
+        self._created = self._stored_created()
+        self._size = len(raw)
+        self._meta_lines = meta_lines
+        self._mark(messages)
+
+    def _stored_created(self) -> str | None:
+        """`created` from the journal header line, or from a legacy snapshot."""
+        try:
+            with self.path.open(encoding="utf-8") as fh:
+                header = json.loads(fh.readline())
+        except (OSError, json.JSONDecodeError):
+            header = None
+        if not isinstance(header, dict):
+            header = _read_legacy(legacy_session_path(self.session_id)) or {}
+        return header.get("created")
+
+    def save(self, data: dict[str, Any]) -> Path:
+        messages = data.get("messages") or []
+        data["id"] = self.session_id
+        data["updated"] = _now()
+        try:
+            size: int | None = self.path.stat().st_size
+        except OSError:
+            size = None
+        if (
+            size is None
+            or size != self._size
+            or len(messages) < self.written
+            or (self.written and messages[self.written - 1] is not self._tail)
+            or self._meta_lines >= COMPACT_AFTER_META
+        ):
+            self._rewrite(data, messages)
+        else:
+            self._append(data, messages)
+        summary = _summary(
+            {**data, "created": self._created}, self.path, self.written
+        )
+        _catalog_update(lambda cat: cat.upsert(summary))
+        return self.path
+
+    def _meta(self, data: dict[str, Any]) -> dict[str, Any]:
+        return {k: data.get(k) for k in _META_KEYS}
+
+    def _rewrite(self, data: dict[str, Any], messages: list[dict[str, Any]]) -> None:
+        if self._created is None:
+            self._created = (
+                self._stored_created() or data.get("created") or data["updated"]
+            )
+        header = {
+            "type": "header",
+            "version": JOURNAL_VERSION,
+            "id": self.session_id,
+            "created": self._created,
+            **self._meta(data),
+        }
+        text = _line(header) + "".join(
+            _message_line(m) for m in strip_heavy_content(messages)
+        )
+        tmp = self.path.with_suffix(".jsonl.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._size = len(text.encode("utf-8"))
+        self._mark(messages)
+        self._meta_lines = 0
+        legacy = legacy_session_path(self.session_id)
+        if legacy.is_file():
+            legacy.unlink()
+
+    def _append(self, data: dict[str, Any], messages: list[dict[str, Any]]) -> None:
+        new = strip_heavy_content(messages[self.written :])
+        text = "".join(_message_line(m) for m in new) + _line(
+            {"type": "meta", **self._meta(data)}
+        )
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(text)
+        self._size = (self._size or 0) + len(text.encode("utf-8"))
+        self._mark(messages)
+        self._meta_lines += 1
+
+    def _mark(self, messages: list[dict[str, Any]]) -> None:
+        self.written = len(messages)
+        self._tail = messages[-1] if messages else None
 
 
 def save_session(data: dict[str, Any]) -> Path:
+    """One-shot full write (no journal state kept)."""
     sid = data.get("id") or new_session_id()
-    data["id"] = sid
-    data["updated"] = _now()
-    if not data.get("created"):
-        data["created"] = data["updated"]
-    path = session_path(sid)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    return path
+    return SessionJournal(sid).save(data)
 
 
 def delete_session(session_id: str) -> bool:
-    path = session_path(session_id)
-    if path.is_file():
-        path.unlink()
-        return True
-    return False
+    removed = False
+    for path in (session_path(session_id), legacy_session_path(session_id)):
+        if path.is_file():
+            path.unlink()
+            removed = True
+    _catalog_update(lambda cat: cat.remove(session_id))
+    return removed
 
 
 def title_from_messages(messages: list[dict[str, Any]]) -> str:
@@ -99,7 +345,10 @@ def title_from_messages(messages: list[dict[str, Any]]) -> str:
 
 
 def strip_heavy_content(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Drop huge base64 image payloads from saved history (keep text stubs)."""
+    """Drop huge base64 image payloads from saved history (keep text stubs).
+
+    `image_ref` parts are kept: they only name a blob in the image store.
+    """
     out: list[dict[str, Any]] = []
     for msg in messages:
         m = dict(msg)
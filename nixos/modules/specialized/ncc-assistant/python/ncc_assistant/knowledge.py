@@ -0,0 +1,155 @@
+"""Inverted keyword index over the knowledge pack (BM25 scoring)."""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# BM25 parameters (Okapi defaults).
+K1 = 1.2
+B = 0.75
+# Query tokens also match longer terms they prefix ("module" → "modules"),
+# which keeps the recall of the old substring counting. Prefix hits weigh less.
+PREFIX_WEIGHT = 0.5
+MAX_PREFIX_TERMS = 64
+
+Signature = tuple[tuple[str, int, int], ...]
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def file_signature(files: list[tuple[str, Path]]) -> Signature | None:
+    """(path, mtime_ns, size) per file; None when a file vanished mid-scan."""
+    sig: list[tuple[str, int, int]] = []
+    for _, path in files:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        sig.append((str(path), st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+@dataclass
+class _Doc:
+    id: str
+    file: str
+    text: str
+    lower: str
+    length: int
+
+
+@dataclass
+class KnowledgeIndex:
+    """Token → posting list over one knowledge root, built once per file signature."""
+
+    signature: Signature | None
+    docs: list[_Doc] = field(default_factory=list)
+    postings: dict[str, list[tuple[int, int]]] = field(default_factory=dict)
+    idf: dict[str, float] = field(default_factory=dict)
+    vocab: list[str] = field(default_factory=list)
+    avg_len: float = 0.0
+
+    @classmethod
+    def build(cls, root: Path, files: list[tuple[str, Path]]) -> "KnowledgeIndex":
+        index = cls(signature=file_signature(files))
+        for kid, path in files:
+            try:
+                text = path.read_text(encoding="utf-8")
+            except OSError:
+                continue
+            lower = text.lower()
+            counts = Counter(_TOKEN_RE.findall(lower))
+            doc_id = len(index.docs)
+            index.docs.append(
+                _Doc(
+                    id=kid,
+                    file=str(path.relative_to(root)),
+                    text=text,
+                    lower=lower,
+                    length=sum(counts.values()),
+                )
+            )
+            for term, tf in counts.items():
+                index.postings.setdefault(term, []).append((doc_id, tf))
+
+        n = len(index.docs)
+        if n:
+            index.avg_len = sum(d.length for d in index.docs) / n
+        for term, plist in index.postings.items():
+            df = len(plist)
+            index.idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        index.vocab = sorted(index.postings)
+        return index
+
+    def _expand(self, token: str) -> list[tuple[str, float]]:
+        terms: list[tuple[str, float]] = []
+        if token in self.postings:
+            terms.append((token, 1.0))
+        i = bisect_left(self.vocab, token)
+        while i < len(self.vocab) and len(terms) < MAX_PREFIX_TERMS:
+            term = self.vocab[i]
+            if not term.startswith(token):
+                break
+            if term != token:
+                terms.append((term, PREFIX_WEIGHT))
+            i += 1
+        return terms
+
+    def search(self, query: str, limit: int) -> list[dict[str, Any]]:
+        tokens = tokenize(query)
+        if not tokens or not self.docs:
+            return []
+        scores: dict[int, float] = {}
+        avg = self.avg_len or 1.0
+        for token in dict.fromkeys(tokens):
+            for term, weight in self._expand(token):
+                idf = self.idf[term]
+                for doc_id, tf in self.postings[term]:
+                    norm = K1 * (1 - B + B * self.docs[doc_id].length / avg)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + (
+                        weight * idf * tf * (K1 + 1) / (tf + norm)
+                    )
+
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        hits: list[dict[str, Any]] = []
+        for doc_id, score in ranked[:limit]:
+            doc = self.docs[doc_id]
+            # Grab a small snippet around first token
+            idx = doc.lower.find(tokens[0])
+            start = max(0, idx - 80) if idx >= 0 else 0
+            hits.append(
+                {
+                    "id": doc.id,
+                    "file": doc.file,
+                    "score": round(score, 3),
+                    "snippet": doc.text[start : start + 240].replace("\n", " "),
+                }
+            )
+        return hits
+
+
+_INDEXES: dict[Path, KnowledgeIndex] = {}
+_LOCK = threading.Lock()
+
+
+def get_index(root: Path, files: list[tuple[str, Path]]) -> KnowledgeIndex:
+    """Shared index for a knowledge root; rebuilt when any file's mtime/size changes."""
+    sig = file_signature(files)
+    with _LOCK:
+        index = _INDEXES.get(root)
+        if index is not None and sig is not None and index.signature == sig:
+            return index
+        index = KnowledgeIndex.build(root, files)
+        _INDEXES[root] = index
+        return index
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import threading
+from contextlib import contextmanager
 from typing import Any, Iterator
 
 import httpx
 
 from .config import Settings
+from .metrics import normalize_usage
+from .model_cache import CATALOG
+from .sse import decode_batch, iter_batches
 
 
 class LLMError(RuntimeError):
@@ -28,15 +33,148 @@ def _auth_headers(settings: Settings) -> dict[str, str]:
     return {name: settings.api_key}
 
 
-def list_models(settings: Settings) -> list[dict[str, Any]]:
-    """Return model dicts from GET {endpoint}/models (id + raw metadata)."""
+ANTHROPIC_BASE = "https://api.anthropic.com"
+MODELS_TIMEOUT = 30.0
+EMBED_TIMEOUT = 60.0
+
+
+def _base_url(settings: Settings) -> str:
+    if settings.api == "anthropic":
+        return ANTHROPIC_BASE
+    return settings.endpoint.rstrip("/")
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def new_client(settings: Settings) -> httpx.Client:
+    """httpx client with the pool limits / timeouts from settings."""
+    return httpx.Client(
+        timeout=httpx.Timeout(
+            settings.request_timeout, connect=settings.connect_timeout
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_connections,
+        ),
+        # HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive.
+        http2=settings.http2 and _h2_available(),
+    )
+
+
+class ClientPool:
+    """Long-lived keep-alive clients, one per (endpoint, auth), owned by a session."""
+
+    def __init__(self) -> None:
+        self._clients: dict[tuple[Any, ...], httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(settings: Settings) -> tuple[Any, ...]:
+        return (
+            _base_url(settings),
+            settings.api_key,
+            settings.api_header_name,
+            settings.http2,
+            settings.request_timeout,
+            settings.connect_timeout,
+            settings.max_connections,
+        )
+
+    def client(self, settings: Settings) -> httpx.Client:
+        key = self._key(settings)
+        with self._lock:
+            http = self._clients.get(key)
+            if http is not None and not http.is_closed:
+                return http
+            # New auth / limits for the same endpoint → drop the stale client.
+            for old_key in [k for k in self._clients if k[0] == key[0]]:
+                self._clients.pop(old_key).close()
+            http = new_client(settings)
+            self._clients[key] = http
+            return http
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for http in clients:
+            http.close()
+
+    def __enter__(self) -> "ClientPool":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+@contextmanager
+def _borrow(
+    settings: Settings, client: httpx.Client | None
+) -> Iterator[httpx.Client]:
+    """Use the caller's pooled client, or a one-shot client closed on exit."""
+    if client is not None:
+        yield client
+        return
+    with new_client(settings) as own:
+        yield own
+
+
+def list_models(
+    settings: Settings,
+    client: httpx.Client | None = None,
+    *,
+    refresh: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Return model dicts from GET {endpoint}/models (id + raw metadata).
+
+    Served from the TTL'd catalog cache when possible (stale entries are
+    returned at once and refreshed in the background); ``refresh`` forces
+    a fetch.
+    """
     if settings.api == "anthropic":
         mid = settings.model or "claude-sonnet-4-20250514"
         return [{"id": mid, "owned_by": "anthropic", "vision": False}]
 
+    ttl = settings.models_cache_ttl
+    key = _catalog_key(settings)
+    if not refresh:
+        cached, fresh = CATALOG.get(key, ttl)
+        if cached is not None:
+            if not fresh:
+                CATALOG.refresh_async(key, lambda: _fetch_models(settings, None))
+            return cached
+
+    models = _fetch_models(settings, client)
+    if ttl > 0:
+        CATALOG.put(key, models)
+    return models
+
+
+def _catalog_key(settings: Settings) -> str:
+    """Catalog entry name: the endpoint, plus a credentials fingerprint."""
+    # A gateway can list different models per key; never store the key itself.
+    endpoint = settings.endpoint.rstrip("/")
+    if not settings.api_key:
+        return endpoint
+    secret = f"{settings.api_header_name or ''}\0{settings.api_key}"
+    return f"{endpoint}#{hashlib.sha256(secret.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _fetch_models(
+    settings: Settings, client: httpx.Client | None
+) -> list[dict[str, Any]]:
     url = f"{settings.endpoint}/models"
-    with httpx.Client(timeout=30.0) as client:
-        resp = client.get(url, headers=_auth_headers(settings))
+    with _borrow(settings, client) as http:
+        resp = http.get(
+            url, headers=_auth_headers(settings), timeout=MODELS_TIMEOUT
+        )
         if resp.status_code >= 400:
             raise LLMError(
                 f"GET {url} → HTTP {resp.status_code}: {resp.text[:400]}"
@@ -60,6 +198,36 @@ def list_models(settings: Settings) -> list[dict[str, Any]]:
     return out
 
 
+def embed(
+    settings: Settings,
+    texts: list[str],
+    client: httpx.Client | None = None,
+) -> list[list[float]]:
+    """Vectors for `texts` from POST {endpoint}/embeddings, in input order."""
+    if settings.api == "anthropic" or not settings.embedding_model:
+        raise LLMError("embeddings need an OpenAI-compatible endpoint and model")
+    url = f"{settings.endpoint}/embeddings"
+    headers = {"Content-Type": "application/json", **_auth_headers(settings)}
+    payload = {"model": settings.embedding_model, "input": texts}
+    with _borrow(settings, client) as http:
+        resp = http.post(
+            url, headers=headers, json=payload, timeout=EMBED_TIMEOUT
+        )
+        if resp.status_code >= 400:
+            raise LLMError(
+                f"POST {url} → HTTP {resp.status_code}: {resp.text[:400]}"
+            )
+        data = resp.json()
+    rows = [r for r in data.get("data") or [] if isinstance(r, dict)]
+    rows.sort(key=lambda r: r.get("index", 0))
+    vectors = [r.get("embedding") for r in rows]
+    if len(vectors) != len(texts) or not all(
+        isinstance(v, list) and v for v in vectors
+    ):
+        raise LLMError(f"POST {url}: expected {len(texts)} embeddings")
+    return vectors
+
+
 def model_id_looks_vision(model_id: str) -> bool:
     low = model_id.lower()
     keys = (
@@ -117,41 +285,30 @@ def resolve_model(settings: Settings, client: httpx.Client | None = None) -> str
         return settings.model
 
     url = f"{settings.endpoint}/models"
-    headers = _auth_headers(settings)
-    own = client is None
-    http = client or httpx.Client(timeout=30.0)
     try:
-        resp = http.get(url, headers=headers)
-        if resp.status_code >= 400:
-            raise LLMError(
-                f"model auto-detect failed (GET {url} → HTTP {resp.status_code}): "
-                f"{resp.text[:400]}. Set modules.specialized.ncc-assistant.model."
-            )
-        data = resp.json()
-        models = data.get("data") or data.get("models") or []
-        if not models:
-            raise LLMError(
-                f"GET {url} returned no models. "
-                "Set modules.specialized.ncc-assistant.model explicitly."
-            )
-        first = models[0]
-        mid = first.get("id") if isinstance(first, dict) else str(first)
-        if not mid:
-            raise LLMError(f"GET {url}: first model has no id")
-        return mid
-    finally:
-        if own:
-            http.close()
+        models = list_models(settings, client)
+    except LLMError as exc:
+        raise LLMError(
+            f"model auto-detect failed ({exc}). "
+            "Set modules.specialized.ncc-assistant.model."
+        ) from exc
+    if not models:
+        raise LLMError(
+            f"GET {url} returned no models. "
+            "Set modules.specialized.ncc-assistant.model explicitly."
+        )
+    return str(models[0]["id"])
 
 
 def chat_completion(
     settings: Settings,
     messages: list[dict[str, Any]],
     tools: list[dict[str, Any]] | None = None,
+    client: httpx.Client | None = None,
 ) -> dict[str, Any]:
     if settings.api == "anthropic":
-        return _anthropic(settings, messages, tools)
-    return _openai_compatible(settings, messages, tools)
+        return _anthropic(settings, messages, tools, client)
+    return _openai_compatible(settings, messages, tools, client)
 
 
 def iter_chat_completion(
@@ -159,22 +316,24 @@ def iter_chat_completion(
     messages: list[dict[str, Any]],
     tools: list[dict[str, Any]] | None = None,
     cancel_event: threading.Event | None = None,
+    client: httpx.Client | None = None,
 ) -> Iterator[dict[str, Any]]:
     """
     Yield stream events:
       {"type":"delta","text":"..."}
-      {"type":"done","message":{role,content,tool_calls,model}}
+      {"type":"tool_call_delta","index":0,"name":"...","arguments":"{\"module_pa"}
+      {"type":"done","message":{role,content,tool_calls,model,usage}}
+    ``tool_call_delta`` carries the arguments accumulated so far (streaming only).
+    ``usage`` is {prompt_tokens, completion_tokens} when the server reports it.
     Falls back to non-streaming if the server rejects stream=true.
+    Pass a pooled ``client`` to reuse keep-alive connections across rounds.
     """
     if settings.api == "anthropic":
-        reply = _anthropic(settings, messages, tools)
-        if reply.get("content"):
-            yield {"type": "delta", "text": reply["content"]}
-        yield {"type": "done", "message": reply}
+        yield from _anthropic_stream(settings, messages, tools, cancel_event, client)
         return
 
     try:
-        yield from _openai_stream(settings, messages, tools, cancel_event)
+        yield from _openai_stream(settings, messages, tools, cancel_event, client)
     except CancelledError:
         raise
     except LLMError as exc:
@@ -182,7 +341,7 @@ def iter_chat_completion(
         if "stream" in str(exc).lower() or "400" in str(exc):
             if cancel_event and cancel_event.is_set():
                 raise CancelledError("cancelled") from exc
-            reply = _openai_compatible(settings, messages, tools)
+            reply = _openai_compatible(settings, messages, tools, client)
             if reply.get("content"):
                 yield {"type": "delta", "text": reply["content"]}
             yield {"type": "done", "message": reply}
@@ -207,6 +366,8 @@ def _openai_payload(
         payload["temperature"] = settings.temperature
     if settings.max_tokens is not None:
         payload["max_tokens"] = settings.max_tokens
+    if stream and settings.stream_usage:
+        payload["stream_options"] = {"include_usage": True}
     if tools:
         payload["tools"] = tools
         payload["tool_choice"] = "auto"
@@ -217,14 +378,15 @@ def _openai_compatible(
     settings: Settings,
     messages: list[dict[str, Any]],
     tools: list[dict[str, Any]] | None,
+    client: httpx.Client | None = None,
 ) -> dict[str, Any]:
     url = f"{settings.endpoint}/chat/completions"
     headers = {"Content-Type": "application/json", **_auth_headers(settings)}
 
-    with httpx.Client(timeout=120.0) as client:
-        model = resolve_model(settings, client)
+    with _borrow(settings, client) as http:
+        model = resolve_model(settings, http)
         payload = _openai_payload(settings, model, messages, tools, stream=False)
-        resp = client.post(url, headers=headers, json=payload)
+        resp = http.post(url, headers=headers, json=payload)
         if resp.status_code >= 400:
             raise LLMError(f"LLM HTTP {resp.status_code}: {resp.text[:800]}")
         data = resp.json()
@@ -236,15 +398,19 @@ def _openai_compatible(
         "content": message.get("content") or "",
         "tool_calls": message.get("tool_calls") or [],
         "model": model,
+        "usage": normalize_usage(data.get("usage")),
         "raw": data,
     }
 
 
 def _merge_tool_call_delta(
     acc: dict[int, dict[str, Any]], delta_calls: list[dict[str, Any]]
-) -> None:
+) -> list[int]:
+    """Fold streamed tool-call fragments into `acc`; returns the indices touched."""
+    touched: list[int] = []
     for tc in delta_calls:
         idx = int(tc.get("index", 0))
+        touched.append(idx)
         slot = acc.setdefault(
             idx,
             {
@@ -262,6 +428,35 @@ def _merge_tool_call_delta(
             slot["function"]["name"] += fn["name"]
         if fn.get("arguments") is not None:
             slot["function"]["arguments"] += str(fn["arguments"])
+    return touched
+
+
+def _tool_call_event(idx: int, slot: dict[str, Any]) -> dict[str, Any]:
+    fn = slot.get("function") or {}
+    return {
+        "type": "tool_call_delta",
+        "index": idx,
+        "name": fn.get("name") or "",
+        "arguments": fn.get("arguments") or "",
+    }
+
+
+def _finalize_tool_calls(tool_acc: dict[int, dict[str, Any]]) -> list[dict[str, Any]]:
+    cleaned: list[dict[str, Any]] = []
+    for i in sorted(tool_acc):
+        tc = tool_acc[i]
+        fn = tc.get("function") or {}
+        cleaned.append(
+            {
+                "id": tc.get("id") or f"tool_{i}",
+                "type": tc.get("type") or "function",
+                "function": {
+                    "name": fn.get("name") or "",
+                    "arguments": fn.get("arguments") or "{}",
+                },
+            }
+        )
+    return cleaned
 
 
 def _openai_stream(
@@ -269,6 +464,7 @@ def _openai_stream(
     messages: list[dict[str, Any]],
     tools: list[dict[str, Any]] | None,
     cancel_event: threading.Event | None,
+    client: httpx.Client | None = None,
 ) -> Iterator[dict[str, Any]]:
     url = f"{settings.endpoint}/chat/completions"
     headers = {"Content-Type": "application/json", **_auth_headers(settings)}
@@ -276,72 +472,67 @@ def _openai_stream(
     content_parts: list[str] = []
     tool_acc: dict[int, dict[str, Any]] = {}
     model_name = settings.model or ""
+    usage: dict[str, int] | None = None
 
-    with httpx.Client(timeout=httpx.Timeout(120.0, connect=30.0)) as client:
-        model_name = resolve_model(settings, client)
+    with _borrow(settings, client) as http:
+        model_name = resolve_model(settings, http)
         payload = _openai_payload(settings, model_name, messages, tools, stream=True)
-        with client.stream("POST", url, headers=headers, json=payload) as resp:
+        with http.stream("POST", url, headers=headers, json=payload) as resp:
             if resp.status_code >= 400:
                 body = resp.read().decode("utf-8", errors="replace")
                 raise LLMError(f"LLM HTTP {resp.status_code}: {body[:800]}")
 
-            for line in resp.iter_lines():
+            # Deltas that arrive in the same network read become one event.
+            for batch in iter_batches(resp.iter_bytes()):
                 if cancel_event and cancel_event.is_set():
                     raise CancelledError("cancelled")
-                if not line:
-                    continue
-                if line.startswith(":"):
-                    continue
-                if not line.startswith("data:"):
-                    continue
-                data_s = line[5:].strip()
-                if data_s == "[DONE]":
+                chunks, done = decode_batch(batch)
+                pieces: list[str] = []
+                touched: set[int] = set()
+                for chunk in chunks:
+                    if not isinstance(chunk, dict):
+                        continue
+                    if chunk.get("model"):
+                        model_name = chunk["model"]
+                    if chunk.get("usage"):
+                        # include_usage: a last chunk with empty choices.
+                        usage = normalize_usage(chunk["usage"]) or usage
+                    choice = (chunk.get("choices") or [{}])[0]
+                    delta = choice.get("delta") or {}
+                    piece = delta.get("content")
+                    if piece:
+                        pieces.append(piece)
+                    if delta.get("tool_calls"):
+                        touched.update(
+                            _merge_tool_call_delta(tool_acc, delta["tool_calls"])
+                        )
+                if pieces:
+                    text = "".join(pieces)
+                    content_parts.append(text)
+                    yield {"type": "delta", "text": text}
+                for idx in sorted(touched):
+                    yield _tool_call_event(idx, tool_acc[idx])
+                if done:
                     break
-                try:
-                    chunk = json.loads(data_s)
-                except json.JSONDecodeError:
-                    continue
-                if chunk.get("model"):
-                    model_name = chunk["model"]
-                choice = (chunk.get("choices") or [{}])[0]
-                delta = choice.get("delta") or {}
-                piece = delta.get("content")
-                if piece:
-                    content_parts.append(piece)
-                    yield {"type": "delta", "text": piece}
-                if delta.get("tool_calls"):
-                    _merge_tool_call_delta(tool_acc, delta["tool_calls"])
-
-    cleaned: list[dict[str, Any]] = []
-    for i in sorted(tool_acc):
-        tc = tool_acc[i]
-        fn = tc.get("function") or {}
-        cleaned.append(
-            {
-                "id": tc.get("id") or f"tool_{i}",
-                "type": tc.get("type") or "function",
-                "function": {
-                    "name": fn.get("name") or "",
-                    "arguments": fn.get("arguments") or "{}",
-                },
-            }
-        )
 
     yield {
         "type": "done",
         "message": {
             "role": "assistant",
             "content": "".join(content_parts),
-            "tool_calls": cleaned,
+            "tool_calls": _finalize_tool_calls(tool_acc),
             "model": model_name,
+            "usage": usage,
         },
     }
 
 
-def _anthropic(
+def _anthropic_payload(
     settings: Settings,
     messages: list[dict[str, Any]],
     tools: list[dict[str, Any]] | None,
+    *,
+    stream: bool,
 ) -> dict[str, Any]:
     if not settings.api_key:
         raise LLMError("ANTHROPIC_API_KEY / NCC_ASSISTANT_API_KEY required")
@@ -422,21 +613,36 @@ def _anthropic(
         "messages": converted,
         "max_tokens": settings.max_tokens or 4096,
     }
+    if stream:
+        payload["stream"] = True
     if settings.temperature is not None:
         payload["temperature"] = settings.temperature
     if system:
         payload["system"] = system
     if anthropic_tools:
         payload["tools"] = anthropic_tools
+    return payload
 
-    with httpx.Client(timeout=120.0) as client:
-        resp = client.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "Content-Type": "application/json",
-                "x-api-key": settings.api_key,
-                "anthropic-version": "2023-06-01",
-            },
+
+def _anthropic_headers(settings: Settings) -> dict[str, str]:
+    return {
+        "Content-Type": "application/json",
+        "x-api-key": settings.api_key or "",
+        "anthropic-version": "2023-06-01",
+    }
+
+
+def _anthropic(
+    settings: Settings,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    client: httpx.Client | None = None,
+) -> dict[str, Any]:
+    payload = _anthropic_payload(settings, messages, tools, stream=False)
+    with _borrow(settings, client) as http:
+        resp = http.post(
+            f"{ANTHROPIC_BASE}/v1/messages",
+            headers=_anthropic_headers(settings),
             json=payload,
         )
         if resp.status_code >= 400:
@@ -464,5 +670,118 @@ def _anthropic(
         "content": "\n".join(text_parts),
         "tool_calls": tool_calls,
         "model": settings.model,
+        "usage": normalize_usage(data.get("usage")),
         "raw": data,
     }
+
+
+def _anthropic_stream(
+    settings: Settings,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    cancel_event: threading.Event | None,
+    client: httpx.Client | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Messages API with stream=true. Text deltas are yielded as they arrive;
+    tool_use input JSON is assembled from input_json_delta fragments through
+    _merge_tool_call_delta, keyed by content block index.
+    """
+    payload = _anthropic_payload(settings, messages, tools, stream=True)
+
+    content_parts: list[str] = []
+    tool_acc: dict[int, dict[str, Any]] = {}
+    model_name = settings.model or ""
+    text_blocks = 0
+    usage: dict[str, int] = {}
+
+    with _borrow(settings, client) as http:
+        with http.stream(
+            "POST",
+            f"{ANTHROPIC_BASE}/v1/messages",
+            headers=_anthropic_headers(settings),
+            json=payload,
+        ) as resp:
+            if resp.status_code >= 400:
+                body = resp.read().decode("utf-8", errors="replace")
+                raise LLMError(f"Anthropic HTTP {resp.status_code}: {body[:800]}")
+
+            for line in resp.iter_lines():
+                if cancel_event and cancel_event.is_set():
+                    raise CancelledError("cancelled")
+                if not line.startswith("data:"):
+                    continue  # "event:" lines repeat data["type"]
+                try:
+                    event = json.loads(line[5:].strip())
+                except json.JSONDecodeError:
+                    continue
+                etype = event.get("type")
+                if etype == "message_start":
+                    start = event.get("message") or {}
+                    model_name = start.get("model") or model_name
+                    usage.update(normalize_usage(start.get("usage")) or {})
+                elif etype == "content_block_start":
+                    idx = int(event.get("index", 0))
+                    block = event.get("content_block") or {}
+                    if block.get("type") == "text":
+                        # Non-streaming joins text blocks with newlines; match it.
+                        if text_blocks:
+                            content_parts.append("\n")
+                            yield {"type": "delta", "text": "\n"}
+                        text_blocks += 1
+                        if block.get("text"):
+                            content_parts.append(block["text"])
+                            yield {"type": "delta", "text": block["text"]}
+                    elif block.get("type") == "tool_use":
+                        _merge_tool_call_delta(
+                            tool_acc,
+                            [
+                                {
+                                    "index": idx,
+                                    "id": block.get("id"),
+                                    "type": "function",
+                                    "function": {"name": block.get("name") or ""},
+                                }
+                            ],
+                        )
+                elif etype == "content_block_delta":
+                    idx = int(event.get("index", 0))
+                    delta = event.get("delta") or {}
+                    if delta.get("type") == "text_delta" and delta.get("text"):
+                        content_parts.append(delta["text"])
+                        yield {"type": "delta", "text": delta["text"]}
+                    elif delta.get("type") == "input_json_delta":
+                        _merge_tool_call_delta(
+                            tool_acc,
+                            [
+                                {
+                                    "index": idx,
+                                    "function": {
+                                        "arguments": delta.get("partial_json") or ""
+                                    },
+                                }
+                            ],
+                        )
+                        yield _tool_call_event(idx, tool_acc[idx])
+                elif etype == "message_delta":
+                    # Cumulative output_tokens for the whole message.
+                    usage.update(normalize_usage(event.get("usage")) or {})
+                elif etype == "error":
+                    err = event.get("error") or {}
+                    raise LLMError(
+                        f"Anthropic stream error: {err.get('type', '')} "
+                        f"{err.get('message', '')}".strip()
+                    )
+                elif etype == "message_stop":
+                    break
+
+    yield {
+        "type": "done",
+        "message": {
+            "role": "assistant",
+            "content": "".join(content_parts),
+            "tool_calls": _finalize_tool_calls(tool_acc),
+            "model": model_name,
+            "usage": usage or None,
+        },
+    }
@@ -3,64 +3,109 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from functools import partial
+from typing import Any, Callable
 
+import anyio
+import anyio.to_thread
 from mcp.server.fastmcp import FastMCP
 
 from .config import Settings
 from .runtime import ToolRuntime
 
 
+# Worker threads for concurrent read-only tools (list/read/search/explain/
+# propose/validate). Writes and rebuilds run one at a time.
+READ_CONCURRENCY = 8
+
+
+class _Limits:
+    """anyio limiters bind to the running event loop, so create them on first use."""
+
+    def __init__(self, read_slots: int) -> None:
+        self.read_slots = read_slots
+        self._reads: anyio.CapacityLimiter | None = None
+        self._mutations: anyio.CapacityLimiter | None = None
+
+    def reads(self) -> anyio.CapacityLimiter:
+        if self._reads is None:
+            self._reads = anyio.CapacityLimiter(self.read_slots)
+        return self._reads
+
+    def mutations(self) -> anyio.CapacityLimiter:
+        if self._mutations is None:
+            self._mutations = anyio.CapacityLimiter(1)
+        return self._mutations
+
+
 def build_mcp(settings: Settings | None = None) -> FastMCP:
     settings = settings or Settings.from_env(client_mode="mcp")
     runtime = ToolRuntime(settings)
     mcp = FastMCP("ncc-assistant")
+    limits = _Limits(READ_CONCURRENCY)
+
+    async def read(fn: Callable[..., dict[str, Any]], *args: Any) -> str:
+        # Dropped requests stop waiting at once; the worker's result is discarded.
+        return _dump(
+            await anyio.to_thread.run_sync(
+                partial(fn, *args), limiter=limits.reads(), abandon_on_cancel=True
+            )
+        )
+
+    async def mutate(fn: Callable[..., dict[str, Any]], *args: Any) -> str:
+        # Writes and rebuilds share one slot and are never abandoned: a
+        # half-written leaf or an interrupted switch is worse than a late reply.
+        return _dump(
+            await anyio.to_thread.run_sync(
+                partial(fn, *args), limiter=limits.mutations()
+            )
+        )
 
     @mcp.tool()
-    def list_modules(query: str | None = None) -> str:
+    async def list_modules(query: str | None = None) -> str:
         """List known NCC modules from knowledge registries."""
-        return _dump(runtime.list_modules(query))
+        return await read(runtime.list_modules, query)
 
     @mcp.tool()
-    def read_module_config(module_path: str) -> str:
+    async def read_module_config(module_path: str) -> str:
         """Read active systemConfig leaf for a module path."""
-        return _dump(runtime.read_module_config(module_path))
+        return await read(runtime.read_module_config, module_path)
 
     @mcp.tool()
-    def search_knowledge(query: str, limit: int = 8) -> str:
+    async def search_knowledge(query: str, limit: int = 8) -> str:
         """Search NCC knowledge pack by keyword."""
-        return _dump(runtime.search_knowledge(query, limit))
+        return await read(runtime.search_knowledge, query, limit)
 
     @mcp.tool()
-    def explain_path(module_path: str) -> str:
+    async def explain_path(module_path: str) -> str:
         """Explain a module path using registries + current config."""
-        return _dump(runtime.explain_path(module_path))
+        return await read(runtime.explain_path, module_path)
 
     @mcp.tool()
-    def propose_config_patch(module_path: str, proposed_nix: str) -> str:
+    async def propose_config_patch(module_path: str, proposed_nix: str) -> str:
         """Show unified diff for a proposed config change (no write)."""
-        return _dump(runtime.propose_config_patch(module_path, proposed_nix))
+        return await read(runtime.propose_config_patch, module_path, proposed_nix)
 
     @mcp.tool()
-    def apply_module_config(
+    async def apply_module_config(
         module_path: str, content_nix: str, confirm: bool = False
     ) -> str:
         """Write module config via facade. Requires confirm=true and mcpAllowWrite."""
-        return _dump(
-            runtime.apply_module_config(module_path, content_nix, confirm)
+        return await mutate(
+            runtime.apply_module_config, module_path, content_nix, confirm
         )
 
     @mcp.tool()
-    def validate_config(
+    async def validate_config(
         module_path: str | None = None, content_nix: str | None = None
     ) -> str:
         """Validate a Nix attrset fragment or current module leaf."""
-        return _dump(runtime.validate_config(module_path, content_nix))
+        return await read(runtime.validate_config, module_path, content_nix)
 
     @mcp.tool()
-    def apply_system(confirm: str, hostname: str | None = None) -> str:
+    async def apply_system(confirm: str, hostname: str | None = None) -> str:
         """Run ncc system build switch. confirm must be CONFIRM; allowRebuild required."""
-        return _dump(runtime.apply_system(confirm, hostname))
+        return await mutate(runtime.apply_system, confirm, hostname)
 
     return mcp
 
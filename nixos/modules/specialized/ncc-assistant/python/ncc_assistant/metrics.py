@@ -0,0 +1,147 @@
+"""Per-round timings for chat turns (TTFT, throughput, usage, tool time)."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .config import data_dir
+from .context import CHARS_PER_TOKEN
+
+METRICS_NAME = "metrics.jsonl"
+
+
+def metrics_path() -> Path:
+    return data_dir() / METRICS_NAME
+
+
+def normalize_usage(raw: Any) -> dict[str, int] | None:
+    """OpenAI (prompt/completion_tokens) or Anthropic (input/output_tokens) usage."""
+    if not isinstance(raw, dict):
+        return None
+    prompt = raw.get("prompt_tokens", raw.get("input_tokens"))
+    completion = raw.get("completion_tokens", raw.get("output_tokens"))
+    out: dict[str, int] = {}
+    if isinstance(prompt, int):
+        out["prompt_tokens"] = prompt
+    if isinstance(completion, int):
+        out["completion_tokens"] = completion
+    return out or None
+
+
+@dataclass
+class RoundMetrics:
+    """
+    Timings for one request/response round. Call `first_token` on the first
+    streamed text or tool-call delta and `response_done` once the reply is
+    complete; tool runs are added with `tool`. Token counts come from the
+    server's usage fields when present, else from the ~4 chars/token estimate.
+    """
+
+    round: int
+    model: str
+    endpoint: str
+    started: float = field(default_factory=time.perf_counter)
+    first_token_at: float | None = None
+    done_at: float | None = None
+    chars: int = 0
+    usage: dict[str, int] | None = None
+    tools: list[dict[str, Any]] = field(default_factory=list)
+    prefetched: int = 0  # leaf reads started from streamed tool-call arguments
+
+    def first_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    def response_done(self, content: str, usage: dict[str, int] | None) -> None:
+        self.done_at = time.perf_counter()
+        self.chars = len(content)
+        self.usage = usage
+
+    def tool(self, name: str, ms: float, ok: bool) -> None:
+        self.tools.append({"name": name, "ms": round(ms, 1), "ok": ok})
+
+    def event(self) -> dict[str, Any]:
+        done = self.done_at or time.perf_counter()
+        usage = self.usage or {}
+        completion = usage.get("completion_tokens")
+        estimated = completion is None
+        if estimated:
+            completion = (self.chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+        ttft = None
+        rate = None
+        if self.first_token_at is not None:
+            ttft = (self.first_token_at - self.started) * 1000
+            gen = done - self.first_token_at
+            if gen > 0 and completion:
+                rate = completion / gen
+        return {
+            "kind": "metrics",
+            "round": self.round,
+            "model": self.model,
+            "endpoint": self.endpoint,
+            "ttft_ms": None if ttft is None else round(ttft, 1),
+            "response_ms": round((done - self.started) * 1000, 1),
+            "tokens_per_s": None if rate is None else round(rate, 1),
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": completion,
+            "completion_estimated": estimated,
+            "tools": list(self.tools),
+            "tool_ms": round(sum(t["ms"] for t in self.tools), 1),
+            "prefetched": self.prefetched,
+        }
+
+
+def format_metrics(ev: dict[str, Any]) -> str:
+    """One status-bar line: `ttft 420 ms · 38.5 tok/s · 1234→256 tok · tools 80 ms`."""
+    bits: list[str] = []
+    if ev.get("ttft_ms") is not None:
+        bits.append(f"ttft {ev['ttft_ms']:.0f} ms")
+    else:
+        bits.append(f"reply {ev.get('response_ms', 0):.0f} ms")
+    if ev.get("tokens_per_s") is not None:
+        bits.append(f"{ev['tokens_per_s']:.1f} tok/s")
+    completion = ev.get("completion_tokens")
+    if completion is not None:
+        mark = "~" if ev.get("completion_estimated") else ""
+        prompt = ev.get("prompt_tokens")
+        bits.append(
+            f"{prompt}→{mark}{completion} tok"
+            if prompt is not None
+            else f"{mark}{completion} tok out"
+        )
+    tools = ev.get("tools") or []
+    if tools:
+        detail = ", ".join(f"{t['name']} {t['ms']:.0f}" for t in tools)
+        bits.append(f"tools {ev.get('tool_ms', 0):.0f} ms ({detail})")
+    if ev.get("prefetched"):
+        bits.append(f"{ev['prefetched']} prefetched")
+    return " · ".join(bits)
+
+
+class MetricsLog:
+    """Append-only JSONL of metrics events; write errors never break a chat."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or metrics_path()
+        self._lock = threading.Lock()
+
+    def append(self, ev: dict[str, Any], **extra: Any) -> None:
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **extra,
+            **{k: v for k, v in ev.items() if k != "kind"},
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a", encoding="utf-8") as fh:
+                    fh.write(line)
+            except OSError:
+                pass
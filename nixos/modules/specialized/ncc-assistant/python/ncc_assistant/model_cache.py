@@ -0,0 +1,107 @@
+"""TTL'd model catalog (GET {endpoint}/models) cached in memory and on disk."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from .config import config_dir
+
+Models = list[dict[str, Any]]
+
+
+def models_cache_path() -> Path:
+    return config_dir() / "models.json"
+
+
+class ModelCatalog:
+    """
+    One entry per endpoint and API key fingerprint (see `llm._catalog_key`):
+    {"fetched_at": epoch, "models": [...]}.
+
+    Fresh entries are served as-is; stale entries are served immediately while
+    a background thread refreshes them; missing entries are fetched inline.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        path = models_cache_path()
+        if path.is_file():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                data = {}
+            if isinstance(data, dict):
+                self._entries = {
+                    k: v
+                    for k, v in data.items()
+                    if isinstance(v, dict) and isinstance(v.get("models"), list)
+                }
+        return self._entries
+
+    def _save(self) -> None:
+        path = models_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".json.tmp")
+            tmp.write_text(
+                json.dumps(self._entries or {}, ensure_ascii=False) + "\n",
+                encoding="utf-8",
+            )
+            os.replace(tmp, path)
+        except OSError:
+            pass  # cache is best-effort
+
+    def get(self, endpoint: str, ttl: float) -> tuple[Models | None, bool]:
+        """(models, fresh) — models is None when nothing is cached."""
+        if ttl <= 0:
+            return None, False
+        with self._lock:
+            entry = self._load().get(endpoint.rstrip("/"))
+        if entry is None:
+            return None, False
+        age = time.time() - float(entry.get("fetched_at") or 0)
+        return list(entry["models"]), age < ttl
+
+    def put(self, endpoint: str, models: Models) -> None:
+        with self._lock:
+            self._load()[endpoint.rstrip("/")] = {
+                "fetched_at": time.time(),
+                "models": models,
+            }
+            self._save()
+
+    def refresh_async(self, endpoint: str, fetch: Callable[[], Models]) -> None:
+        """Refetch in a daemon thread; concurrent requests for one endpoint coalesce."""
+        key = endpoint.rstrip("/")
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run() -> None:
+            try:
+                self.put(key, fetch())
+            except Exception:  # noqa: BLE001 — keep serving the stale entry
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(
+            target=run, name="ncc-models-refresh", daemon=True
+        ).start()
+
+
+CATALOG = ModelCatalog()
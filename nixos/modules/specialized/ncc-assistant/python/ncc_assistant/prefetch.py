@@ -0,0 +1,93 @@
+"""
+Speculative config reads while the model is still generating a tool call.
+
+As soon as a streamed tool call names a tool that reads a module leaf and
+its `module_path` string is complete, the read is started on the tool
+pool. It fills ToolRuntime's signature-checked config cache, so the real
+call (and explain_path / propose_config_patch, which read the same leaf)
+only waits for whatever is left of it.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any
+
+from .runtime import ToolRuntime
+
+# Tools whose work starts with read_module_config(module_path).
+PATH_TOOLS = frozenset(
+    {
+        "read_module_config",
+        "explain_path",
+        "propose_config_patch",
+        "apply_module_config",
+    }
+)
+# A closed JSON string value for "module_path" anywhere in partial arguments.
+_PATH_RE = re.compile(r'"module_path"\s*:\s*"((?:[^"\\]|\\.)*)"')
+# Upper bound on waiting for a speculative read before calling the tool anyway.
+SETTLE_TIMEOUT = 60.0
+
+
+def streamed_module_path(arguments: str) -> str | None:
+    match = _PATH_RE.search(arguments)
+    if match is None:
+        return None
+    try:
+        value = json.loads(f'"{match.group(1)}"')
+    except ValueError:
+        return None
+    return value if isinstance(value, str) and value.strip() else None
+
+
+class ConfigPrefetcher:
+    """One per turn: `observe` tool_call_delta events, `settle` before dispatch."""
+
+    def __init__(self, runtime: ToolRuntime, executor: Executor) -> None:
+        self.runtime = runtime
+        self.executor = executor
+        self._reads: dict[str, Future[dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> int:
+        return len(self._reads)
+
+    def observe(self, name: str, arguments: str) -> None:
+        if name not in PATH_TOOLS:
+            return
+        raw = streamed_module_path(arguments)
+        if raw is None:
+            return
+        path = self.runtime._normalize_path(raw)
+        with self._lock:
+            if path in self._reads:
+                return
+            self._reads[path] = self.executor.submit(
+                self.runtime.read_module_config, path
+            )
+
+    def settle(self, name: str, args: dict[str, Any]) -> None:
+        """Wait for a speculative read of this call's leaf, if one is running."""
+        if name not in PATH_TOOLS or not isinstance(args.get("module_path"), str):
+            return
+        path = self.runtime._normalize_path(args["module_path"])
+        with self._lock:
+            future = self._reads.get(path)
+        if future is None:
+            return
+        try:
+            future.result(timeout=SETTLE_TIMEOUT)
+        except Exception:  # noqa: BLE001 — the real call reports errors
+            pass
+
+    def discard(self) -> None:
+        """Drop reads that have not started yet (turn ended or was cancelled)."""
+        with self._lock:
+            reads, self._reads = list(self._reads.values()), {}
+        for future in reads:
+            future.cancel()
@@ -0,0 +1,154 @@
+"""Module registry (core + optional) parsed once per file signature, with lookup maps."""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .knowledge import Signature, file_signature
+
+REGISTRY_FILES = (
+    ("core-registry.json", "core"),
+    ("optional-registry.json", "optional"),
+)
+
+Module = dict[str, str]
+
+
+def _walk(node: Any, kind: str, out: list[Module], domain: str = "") -> None:
+    if not isinstance(node, dict):
+        return
+    for key, value in node.items():
+        if key.startswith("_"):  # meta keys
+            continue
+        if isinstance(value, dict) and "path" in value:
+            out.append(
+                {
+                    "name": key,
+                    "domain": domain or kind,
+                    "kind": kind,
+                    "path": value.get("path", ""),
+                    "description": value.get("description", key),
+                }
+            )
+        elif isinstance(value, dict):
+            _walk(value, kind, out, domain=domain or key)
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _subpaths(path: str) -> set[str]:
+    """Every run of whole segments: a/b/c → a, b, c, a/b, b/c, a/b/c."""
+    parts = [p for p in path.split("/") if p]
+    return {
+        "/".join(parts[i:j])
+        for i in range(len(parts))
+        for j in range(i + 1, len(parts) + 1)
+    }
+
+
+@dataclass
+class ModuleRegistry:
+    """
+    Modules sorted by (domain, name); the maps hold indexes into `modules`.
+    `by_path` has an entry for every run of whole segments of a module's
+    path, so a module path or a directory above it is one lookup. Substring
+    queries over name/path/domain intersect trigram postings and verify the
+    few candidates, instead of scanning every module.
+    """
+
+    signature: Signature | None
+    modules: list[Module] = field(default_factory=list)
+    by_name: dict[str, list[int]] = field(default_factory=dict)
+    by_path: dict[str, list[int]] = field(default_factory=dict)
+    trigrams: dict[str, list[int]] = field(default_factory=dict)
+    _fields: list[tuple[str, str, str]] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, files: list[tuple[str, Path]]) -> "ModuleRegistry":
+        registry = cls(signature=file_signature(files))
+        modules: list[Module] = []
+        for kind, path in files:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            _walk(data, kind, modules)
+        modules.sort(key=lambda m: (m.get("domain", ""), m["name"]))
+        registry.modules = modules
+        for i, m in enumerate(modules):
+            registry.by_name.setdefault(m["name"], []).append(i)
+            for sub in _subpaths(m.get("path", "")):
+                registry.by_path.setdefault(sub, []).append(i)
+            lowered = (
+                m["name"].lower(),
+                m.get("path", "").lower(),
+                m.get("domain", "").lower(),
+            )
+            registry._fields.append(lowered)
+            # \0 keeps trigrams from spanning two fields.
+            for gram in _trigrams("\0".join(lowered)):
+                registry.trigrams.setdefault(gram, []).append(i)
+        return registry
+
+    def _matches(self, i: int, q: str) -> bool:
+        name, path, domain = self._fields[i]
+        return q in name or q in path or q in domain
+
+    def search(self, query: str | None) -> list[Module]:
+        """Modules whose name, path or domain contains `query` (case-insensitive)."""
+        if not query:
+            return [dict(m) for m in self.modules]
+        q = query.lower()
+        if len(q) < 3:
+            ids: Any = range(len(self.modules))
+        else:
+            postings = []
+            for gram in _trigrams(q):
+                plist = self.trigrams.get(gram)
+                if plist is None:
+                    return []
+                postings.append(plist)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for plist in postings[1:]:
+                candidates.intersection_update(plist)
+                if not candidates:
+                    return []
+            ids = sorted(candidates)  # index order == (domain, name) order
+        return [dict(self.modules[i]) for i in ids if self._matches(i, q)]
+
+    def for_path(self, path: str) -> list[Module]:
+        """Modules at or under `path` (whole segments), or named like its leaf."""
+        leaf = path.rsplit("/", 1)[-1]
+        ids = {*self.by_path.get(path.strip("/"), ()), *self.by_name.get(leaf, ())}
+        return [dict(self.modules[i]) for i in sorted(ids)]
+
+
+def registry_files(knowledge_root: Path) -> list[tuple[str, Path]]:
+    """(kind, path) of the registry files that exist under the knowledge root."""
+    out = []
+    for name, kind in REGISTRY_FILES:
+        path = knowledge_root / "modules" / name
+        if path.is_file():
+            out.append((kind, path))
+    return out
+
+
+_REGISTRIES: dict[Path, ModuleRegistry] = {}
+_LOCK = threading.Lock()
+
+
+def get_registry(knowledge_root: Path) -> ModuleRegistry:
+    """Shared per knowledge root (all runtimes, chat and MCP); rebuilt on mtime/size change."""
+    files = registry_files(knowledge_root)
+    sig = file_signature(files)
+    with _LOCK:
+        registry = _REGISTRIES.get(knowledge_root)
+        if registry is not None and sig is not None and registry.signature == sig:
+            return registry
+        registry = ModuleRegistry.build(files)
+        _REGISTRIES[knowledge_root] = registry
+        return registry
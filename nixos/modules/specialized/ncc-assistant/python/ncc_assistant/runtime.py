@@ -3,151 +3,35 @@
 from __future__ import annotations
 
 import difflib
+import hashlib
 import json
 import os
 import re
 import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from typing import Any, Callable
 
 from .config import Settings
+from .facade import FacadeError, FacadeTimeout, FacadeUnavailable, get_pool
+from .knowledge import get_index
+from .registry import get_registry
+from .tooldefs import TOOL_DEFINITIONS
 
 
-TOOL_DEFINITIONS: list[dict[str, Any]] = [
-    {
-        "name": "list_modules",
-        "description": (
-            "List known NCC modules from the knowledge registries "
-            "(core + optional)."
-        ),
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "Optional substring filter on module name/path",
-                }
-            },
-        },
-    },
-    {
-        "name": "read_module_config",
-        "description": (
-            "Read the active systemConfig leaf for a module path "
-            "(e.g. core/base/packages or modules/specialized/chronicle)."
-        ),
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "module_path": {
-                    "type": "string",
-                    "description": "Module path relative to systemConfig root",
-                }
-            },
-            "required": ["module_path"],
-        },
-    },
-    {
-        "name": "search_knowledge",
-        "description": (
-            "Search the NCC knowledge pack (skills, domains, contexts, "
-            "module registries) by keyword."
-        ),
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "query": {"type": "string"},
-                "limit": {"type": "integer", "default": 8},
-            },
-            "required": ["query"],
-        },
-    },
-    {
-        "name": "explain_path",
-        "description": (
-            "Explain a module path using knowledge registries and optional "
-            "on-disk hints under the assistant knowledge root."
-        ),
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "module_path": {"type": "string"},
-            },
-            "required": ["module_path"],
-        },
-    },
-    {
-        "name": "propose_config_patch",
-        "description": (
-            "Show a unified diff between current module config and a proposed "
-            "Nix attrset. Does NOT write."
-        ),
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "module_path": {"type": "string"},
-                "proposed_nix": {
-                    "type": "string",
-                    "description": "Proposed Nix attrset fragment",
-                },
-            },
-            "required": ["module_path", "proposed_nix"],
-        },
-    },
-    {
-        "name": "apply_module_config",
-        "description": (
-            "Write a Nix attrset fragment to a module config via the NCC "
-            "config facade. Requires confirm=true and write permission."
-        ),
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "module_path": {"type": "string"},
-                "content_nix": {"type": "string"},
-                "confirm": {
-                    "type": "boolean",
-                    "description": "Must be true to actually write",
-                },
-            },
-            "required": ["module_path", "content_nix", "confirm"],
-        },
-    },
-    {
-        "name": "validate_config",
-        "description": (
-            "Validate a Nix attrset fragment parses, or validate the current "
-            "module leaf if content_nix is omitted."
-        ),
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "module_path": {"type": "string"},
-                "content_nix": {"type": "string"},
-            },
-        },
-    },
-    {
-        "name": "apply_system",
-        "description": (
-            "Run `ncc system build switch` after config changes. Requires "
-            "allowRebuild and confirm exactly equal to CONFIRM."
-        ),
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "confirm": {
-                    "type": "string",
-                    "description": 'Must be the string "CONFIRM"',
-                },
-                "hostname": {
-                    "type": "string",
-                    "description": "Optional flake hostname attribute",
-                },
-            },
-            "required": ["confirm"],
-        },
-    },
-]
+# Co-process workers per (config_bin, NIXOS_DIR); matches the chat tool pool.
+FACADE_WORKERS = 4
+# propose_config_patch diffs and validate_config verdicts kept per runtime.
+CHECK_CACHE_SIZE = 128
+
+# ("propose", module path, current hash, proposed hash) or
+# ("validate", module path, fragment hash)
+CheckKey = tuple[str, ...]
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
 class ToolRuntime:
@@ -159,10 +43,42 @@ class ToolRuntime:
         self.settings = settings
         self.confirm_hook = confirm_hook
         self._index: dict[str, Any] | None = None
+        # normalized module path → (backing file signature, read result)
+        self._config_cache: dict[str, tuple[tuple[Any, ...], dict[str, Any]]] = {}
+        # content-hash key → diff or verdict; a path's entries go when it changes
+        self._check_cache: OrderedDict[CheckKey, dict[str, Any]] = OrderedDict()
+        self._config_lock = threading.Lock()
 
     # --- facade helpers -------------------------------------------------
 
     def _config_cmd(self, *args: str, input_text: str | None = None) -> subprocess.CompletedProcess[str]:
+        if self.settings.config_daemon:
+            op = args[0]
+            pool = get_pool(
+                self.settings.config_bin,
+                self.settings.nixos_dir,
+                FACADE_WORKERS,
+                self.settings.config_timeout,
+            )
+            try:
+                return pool.request(op, args[1] if len(args) > 1 else None, input_text)
+            except FacadeUnavailable:
+                pass  # no usable `serve` worker → one subprocess per call
+            except FacadeTimeout as exc:
+                return subprocess.CompletedProcess(
+                    list(args), 124, "", f"config facade {op}: {exc}"
+                )
+            except FacadeError as exc:
+                if op == "write":
+                    # Worker died after taking the write: outcome unknown, don't replay.
+                    return subprocess.CompletedProcess(
+                        list(args), 1, "", f"config facade write: {exc}"
+                    )
+        return self._config_subprocess(*args, input_text=input_text)
+
+    def _config_subprocess(
+        self, *args: str, input_text: str | None = None
+    ) -> subprocess.CompletedProcess[str]:
         cmd = [self.settings.config_bin, *args]
         env = os.environ.copy()
         env["NIXOS_DIR"] = self.settings.nixos_dir
@@ -175,8 +91,32 @@ class ToolRuntime:
             check=False,
         )
 
+    def _config_signature(self, path: str) -> tuple[Any, ...]:
+        """mtime/size of the files a read can come from (split leaf + monolith)."""
+        root = Path(self.settings.nixos_dir)
+        sig: list[Any] = []
+        for f in (root / "systemConfig" / path / "config.nix", root / "systemConfig.nix"):
+            try:
+                st = f.stat()
+            except OSError:
+                sig.append(None)
+                continue
+            sig.append((st.st_mtime_ns, st.st_size))
+        return tuple(sig)
+
+    def invalidate_config_cache(self) -> None:
+        with self._config_lock:
+            self._config_cache.clear()
+            self._check_cache.clear()
+
     def read_module_config(self, module_path: str) -> dict[str, Any]:
         path = self._normalize_path(module_path)
+        sig = self._config_signature(path)
+        with self._config_lock:
+            cached = self._config_cache.get(path)
+        if cached is not None and cached[0] == sig:
+            return dict(cached[1])
+
         proc = self._config_cmd("read", path)
         if proc.returncode != 0:
             return {
@@ -184,7 +124,28 @@ class ToolRuntime:
                 "error": proc.stderr.strip() or proc.stdout.strip() or "read failed",
                 "module_path": path,
             }
-        return {"ok": True, "module_path": path, "content": proc.stdout}
+        result = {"ok": True, "module_path": path, "content": proc.stdout}
+        with self._config_lock:
+            if cached is not None:
+                # The leaf changed on disk: its diffs and verdicts are stale.
+                for key in [k for k in self._check_cache if k[1] == path]:
+                    del self._check_cache[key]
+            self._config_cache[path] = (sig, result)
+        return dict(result)
+
+    def _cached_check(self, key: CheckKey) -> dict[str, Any] | None:
+        with self._config_lock:
+            result = self._check_cache.get(key)
+            if result is None:
+                return None
+            self._check_cache.move_to_end(key)
+            return dict(result)
+
+    def _store_check(self, key: CheckKey, result: dict[str, Any]) -> None:
+        with self._config_lock:
+            self._check_cache[key] = result
+            while len(self._check_cache) > CHECK_CACHE_SIZE:
+                self._check_cache.popitem(last=False)
 
     def apply_module_config(
         self, module_path: str, content_nix: str, confirm: bool = False
@@ -209,6 +170,8 @@ class ToolRuntime:
 
         current = self.read_module_config(path)
         proc = self._config_cmd("write", path, input_text=content_nix)
+        # A monolith write rewrites every leaf; drop all cached reads.
+        self.invalidate_config_cache()
         if proc.returncode != 0:
             return {
                 "ok": False,
@@ -257,89 +220,42 @@ class ToolRuntime:
         return entries
 
     def list_modules(self, query: str | None = None) -> dict[str, Any]:
-        modules: list[dict[str, str]] = []
-        root = self.settings.knowledge_root
-        for name in ("core-registry.json", "optional-registry.json"):
-            path = root / "modules" / name
-            if not path.is_file():
-                continue
-            data = json.loads(path.read_text(encoding="utf-8"))
-            kind = "core" if "core" in name else "optional"
-            self._walk_registry(data, kind, modules)
-        if query:
-            q = query.lower()
-            modules = [
-                m
-                for m in modules
-                if q in m["name"].lower()
-                or q in m.get("path", "").lower()
-                or q in m.get("domain", "").lower()
-            ]
-        modules.sort(key=lambda m: (m.get("domain", ""), m["name"]))
+        registry = get_registry(self.settings.knowledge_root)
+        modules = registry.search(query)
         return {"ok": True, "count": len(modules), "modules": modules}
 
-    def _walk_registry(
-        self, node: Any, kind: str, out: list[dict[str, str]], domain: str = ""
-    ) -> None:
-        if not isinstance(node, dict):
-            return
-        # skip meta keys
-        for key, value in node.items():
-            if key.startswith("_"):
-                continue
-            if isinstance(value, dict) and "path" in value:
-                out.append(
-                    {
-                        "name": key,
-                        "domain": domain or kind,
-                        "kind": kind,
-                        "path": value.get("path", ""),
-                        "description": value.get("description", key),
-                    }
-                )
-            elif isinstance(value, dict):
-                self._walk_registry(value, kind, out, domain=key if not domain else domain)
-
     def search_knowledge(self, query: str, limit: int = 8) -> dict[str, Any]:
         q = query.lower().strip()
         if not q:
             return {"ok": False, "error": "query required"}
-        hits: list[dict[str, Any]] = []
-        tokens = [t for t in re.split(r"\W+", q) if t]
-        for kid, path in self._iter_knowledge_files():
-            try:
-                text = path.read_text(encoding="utf-8")
-            except OSError:
-                continue
-            lower = text.lower()
-            score = sum(lower.count(t) for t in tokens)
-            if score <= 0:
-                continue
-            # Grab a small snippet around first token
-            idx = lower.find(tokens[0]) if tokens else -1
-            start = max(0, idx - 80) if idx >= 0 else 0
-            snippet = text[start : start + 240].replace("\n", " ")
-            hits.append(
-                {
-                    "id": kid,
-                    "file": str(path.relative_to(self.settings.knowledge_root)),
-                    "score": score,
-                    "snippet": snippet,
-                }
-            )
-        hits.sort(key=lambda h: h["score"], reverse=True)
-        return {"ok": True, "hits": hits[: max(1, min(limit, 20))]}
+        files = self._iter_knowledge_files()
+        index = get_index(self.settings.knowledge_root, files)
+        limit = max(1, min(limit, 20))
+        if not self.settings.embedding_model or self.settings.api == "anthropic":
+            return {"ok": True, "hits": index.search(q, limit)}
+
+        # NumPy is only imported once semantic search is configured.
+        from . import semantic
+
+        keyword = index.search(q, len(index.docs))
+        try:
+            hits = semantic.search(self.settings, files, q, keyword, limit)
+        except semantic.SemanticError as exc:
+            return {"ok": True, "hits": keyword[:limit], "semantic_error": str(exc)}
+        return {"ok": True, "hits": hits}
 
     def explain_path(self, module_path: str) -> dict[str, Any]:
         path = self._normalize_path(module_path)
-        listed = self.list_modules(query=path.split("/")[-1])
-        matches = [
-            m
-            for m in listed.get("modules", [])
-            if path in m.get("path", "")
-            or m["name"] == path.split("/")[-1]
-            or path.endswith(m["name"])
-        ]
+        registry = get_registry(self.settings.knowledge_root)
+        matches = registry.for_path(path)
+        if not matches:
+            # Not a module path or a directory: partial names ("ssh").
+            leaf = path.split("/")[-1]
+            matches = [
+                m
+                for m in registry.search(leaf)
+                if path in m.get("path", "") or path.endswith(m["name"])
+            ]
         knowledge = self.search_knowledge(path.replace("/", " "), limit=5)
         current = self.read_module_config(path)
         return {
@@ -361,6 +277,10 @@ class ToolRuntime:
         current = self.read_module_config(path)
         before = current.get("content", "") if current.get("ok") else ""
         after = proposed_nix if proposed_nix.endswith("\n") else proposed_nix + "\n"
+        key = ("propose", path, _content_hash(before), _content_hash(after))
+        cached = self._cached_check(key)
+        if cached is not None:
+            return cached
         before_lines = (before or "").splitlines(keepends=True)
         after_lines = after.splitlines(keepends=True)
         diff = "".join(
@@ -371,13 +291,15 @@ class ToolRuntime:
                 tofile=f"{path}:proposed",
             )
         )
-        return {
+        result = {
             "ok": True,
             "module_path": path,
             "diff": diff or "(no changes)",
             "current": before,
             "proposed": after,
         }
+        self._store_check(key, result)
+        return dict(result)
 
     def validate_config(
         self, module_path: str | None = None, content_nix: str | None = None
@@ -390,17 +312,30 @@ class ToolRuntime:
         if content_nix is None:
             return {"ok": False, "error": "Provide module_path and/or content_nix"}
 
+        # The verdict depends only on the fragment (the facade parses stdin).
+        path = self._normalize_path(module_path) if module_path else ""
+        key = ("validate", path, _content_hash(content_nix))
+        cached = self._cached_check(key)
+        if cached is not None:
+            if cached.get("ok"):
+                cached["module_path"] = module_path
+            return cached
         proc = self._config_cmd("validate", input_text=content_nix)
         if proc.returncode != 0:
-            return {
+            result = {
                 "ok": False,
                 "error": proc.stderr.strip() or proc.stdout.strip() or "validation failed",
             }
-        return {
-            "ok": True,
-            "message": proc.stdout.strip() or "Nix fragment is valid",
-            "module_path": module_path,
-        }
+        else:
+            result = {
+                "ok": True,
+                "message": proc.stdout.strip() or "Nix fragment is valid",
+                "module_path": module_path,
+            }
+        # Only verdicts: a facade timeout (124) says nothing about the fragment.
+        if proc.returncode in (0, 1):
+            self._store_check(key, result)
+        return dict(result)
 
     def apply_system(
         self, confirm: str, hostname: str | None = None
@@ -526,9 +461,11 @@ class ToolRuntime:
         except Exception as exc:  # noqa: BLE001 — surface to LLM clients
             return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
 
-    def openai_tools(self) -> list[dict[str, Any]]:
+    def openai_tools(
+        self, extra: list[dict[str, Any]] | None = None
+    ) -> list[dict[str, Any]]:
         tools = []
-        for t in TOOL_DEFINITIONS:
+        for t in [*TOOL_DEFINITIONS, *(extra or [])]:
             tools.append(
                 {
                     "type": "function",
@@ -0,0 +1,356 @@
+"""
+Optional embedding retrieval over the knowledge pack, blended with BM25.
+
+Knowledge files are cut into overlapping chunks and embedded through the
+OpenAI-compatible /embeddings endpoint. The vectors are stored as a float32
+matrix on disk (memory-mapped on load) next to a manifest of chunk content
+hashes, so an edited file only re-embeds the chunks whose text changed.
+Needs NumPy; without it search_knowledge stays keyword-only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+
+from .config import Settings, data_dir
+from .knowledge import Signature, file_signature
+from .llm import ClientPool, LLMError, embed
+
+try:  # optional
+    import numpy as np
+except ImportError:
+    np = None
+
+AVAILABLE = np is not None
+STORE_VERSION = 1
+MANIFEST = "manifest.json"
+CHUNK_CHARS = 1200
+CHUNK_OVERLAP = 200
+EMBED_BATCH = 32
+# Share of the blended score from cosine similarity; the rest is BM25 / best BM25.
+SEMANTIC_WEIGHT = 0.6
+# After a failed sync or query, stay keyword-only this long before retrying.
+RETRY_AFTER = 300.0
+QUERY_CACHE = 128
+
+Embedder = Callable[[list[str]], list[list[float]]]
+
+
+class SemanticError(RuntimeError):
+    pass
+
+
+class IndexBuilding(SemanticError):
+    """Another thread is building this store's first index."""
+
+
+@dataclass
+class Chunk:
+    id: str
+    file: str
+    start: int
+    text: str
+    hash: str = ""
+
+    @property
+    def input(self) -> str:
+        # The file name gives short chunks their topic ("domains/desktop.md").
+        return f"{self.file}\n{self.text}"
+
+
+def chunk_text(
+    text: str, size: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP
+) -> list[tuple[int, str]]:
+    """(offset, text) windows of about `size` chars, cut at blank lines or newlines."""
+    out: list[tuple[int, str]] = []
+    start, n = 0, len(text)
+    while start < n:
+        end = min(n, start + size)
+        if end < n:
+            floor = start + size // 2
+            cut = text.rfind("\n\n", floor, end)
+            if cut < 0:
+                cut = text.rfind("\n", floor, end)
+            if cut > 0:
+                end = cut
+        piece = text[start:end].strip()
+        if piece:
+            out.append((start, piece))
+        if end >= n:
+            break
+        # Overlap from the start of a line, so no chunk begins mid-word.
+        line = text.find("\n", end - overlap, end)
+        start = line + 1 if line >= 0 else end - overlap
+    return out
+
+
+def chunk_files(root: Path, files: list[tuple[str, Path]]) -> list[Chunk]:
+    chunks: list[Chunk] = []
+    for kid, path in files:
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            continue
+        rel = str(path.relative_to(root))
+        for start, piece in chunk_text(text):
+            chunk = Chunk(id=kid, file=rel, start=start, text=piece)
+            chunk.hash = hashlib.sha256(chunk.input.encode("utf-8")).hexdigest()
+            chunks.append(chunk)
+    return chunks
+
+
+def store_dir(settings: Settings) -> Path:
+    """One vector store per (knowledge root, endpoint, embedding model)."""
+    key = "\0".join(
+        (
+            str(settings.knowledge_root),
+            settings.endpoint,
+            settings.embedding_model or "",
+        )
+    )
+    return data_dir() / "embeddings" / hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def _load(directory: Path) -> tuple[list[str], Any]:
+    """Chunk hashes and their read-only memory-mapped vectors from the last sync."""
+    try:
+        manifest = json.loads((directory / MANIFEST).read_text(encoding="utf-8"))
+        if manifest.get("version") != STORE_VERSION:
+            return [], None
+        hashes = list(manifest["hashes"])
+        if not hashes:
+            return [], None
+        matrix = np.memmap(
+            directory / manifest["vectors"],
+            dtype=np.float32,
+            mode="r",
+            shape=(len(hashes), int(manifest["dim"])),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return [], None
+    return hashes, matrix
+
+
+def _save(directory: Path, hashes: list[str], matrix: Any) -> Any:
+    # Vectors go to a fresh file and the manifest is swapped in atomically,
+    # so a reader never pairs a manifest with another sync's matrix.
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f"vectors-{uuid.uuid4().hex[:12]}.f32"
+    matrix.tofile(directory / name)
+    manifest = {
+        "version": STORE_VERSION,
+        "dim": int(matrix.shape[1]),
+        "vectors": name,
+        "hashes": hashes,
+    }
+    tmp = directory / f"{MANIFEST}.tmp"
+    tmp.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(tmp, directory / MANIFEST)
+    for old in directory.glob("vectors-*.f32"):
+        if old.name != name:
+            old.unlink(missing_ok=True)
+    return np.memmap(directory / name, dtype=np.float32, mode="r", shape=matrix.shape)
+
+
+def _embed_missing(
+    chunks: list[Chunk], known: dict[str, Any], embedder: Embedder
+) -> dict[str, list[float]]:
+    missing = [c for c in chunks if c.hash not in known]
+    fresh: dict[str, list[float]] = {}
+    for start in range(0, len(missing), EMBED_BATCH):
+        batch = missing[start : start + EMBED_BATCH]
+        for chunk, vector in zip(batch, embedder([c.input for c in batch])):
+            fresh[chunk.hash] = vector
+    return fresh
+
+
+@dataclass
+class SemanticIndex:
+    """Chunks of one knowledge root and their L2-normalised embeddings, one row each."""
+
+    signature: Signature | None
+    chunks: list[Chunk] = field(default_factory=list)
+    matrix: Any = None
+    embedded: int = 0  # chunks the sync that built this had to embed
+
+    @classmethod
+    def sync(
+        cls,
+        directory: Path,
+        root: Path,
+        files: list[tuple[str, Path]],
+        embedder: Embedder,
+    ) -> "SemanticIndex":
+        index = cls(signature=file_signature(files), chunks=chunk_files(root, files))
+        hashes = [c.hash for c in index.chunks]
+        if not index.chunks:
+            index.matrix = np.zeros((0, 0), dtype=np.float32)
+            return index
+        stored, stored_matrix = _load(directory)
+        if stored and stored == hashes:
+            index.matrix = stored_matrix
+            return index
+        known = {h: i for i, h in enumerate(stored)}
+        fresh = _embed_missing(index.chunks, known, embedder)
+        dim = len(next(iter(fresh.values()))) if fresh else stored_matrix.shape[1]
+        if stored_matrix is not None and stored_matrix.shape[1] != dim:
+            # The server now returns another vector size: nothing stored is usable.
+            known = {}
+            fresh.update(_embed_missing(index.chunks, fresh, embedder))
+        index.embedded = len(fresh)
+        matrix = np.empty((len(index.chunks), dim), dtype=np.float32)
+        for row, chunk in enumerate(index.chunks):
+            vector = fresh.get(chunk.hash)
+            matrix[row] = stored_matrix[known[chunk.hash]] if vector is None else vector
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        index.matrix = _save(directory, hashes, matrix)
+        return index
+
+    def best_by_doc(self, query_vector: list[float]) -> dict[str, tuple[float, Chunk]]:
+        """Highest cosine similarity per knowledge id, with the chunk that scored it."""
+        if not self.chunks:
+            return {}
+        q = np.asarray(query_vector, dtype=np.float32)
+        norm = float(np.linalg.norm(q))
+        if norm == 0 or q.shape[0] != self.matrix.shape[1]:
+            return {}
+        scores = self.matrix @ (q / norm)
+        docs = len({c.id for c in self.chunks})
+        best: dict[str, tuple[float, Chunk]] = {}
+        for row in np.argsort(-scores):
+            chunk = self.chunks[row]
+            if chunk.id not in best:
+                best[chunk.id] = (float(scores[row]), chunk)
+                if len(best) == docs:
+                    break
+        return best
+
+
+def blend(
+    keyword: list[dict[str, Any]],
+    semantic: dict[str, tuple[float, Chunk]],
+    limit: int,
+) -> list[dict[str, Any]]:
+    """
+    Rank the union of keyword hits and embedded documents by
+    SEMANTIC_WEIGHT * cosine + (1 - SEMANTIC_WEIGHT) * BM25 / best BM25.
+    """
+    top = max((h["score"] for h in keyword), default=0.0) or 1.0
+    by_id = {h["id"]: h for h in keyword}
+    scored: list[dict[str, Any]] = []
+    for doc_id in dict.fromkeys([*by_id, *semantic]):
+        hit = by_id.get(doc_id)
+        similarity, chunk = semantic.get(doc_id, (0.0, None))
+        relevance = hit["score"] / top if hit else 0.0
+        score = (
+            SEMANTIC_WEIGHT * max(similarity, 0.0) + (1 - SEMANTIC_WEIGHT) * relevance
+        )
+        if hit is not None:
+            entry = dict(hit)
+        else:
+            entry = {
+                "id": doc_id,
+                "file": chunk.file,
+                "snippet": chunk.text[:240].replace("\n", " "),
+            }
+        entry["score"] = round(score, 3)
+        entry["similarity"] = round(similarity, 3)
+        scored.append(entry)
+    scored.sort(key=lambda h: h["score"], reverse=True)
+    return scored[:limit]
+
+
+_INDEXES: dict[Path, SemanticIndex] = {}
+_SYNCING: set[Path] = set()  # stores with a sync running, outside _LOCK
+_FAILED: dict[Path, tuple[float, str]] = {}
+_QUERIES: OrderedDict[tuple[Path, str], list[float]] = OrderedDict()
+_LOCK = threading.Lock()
+_CLIENTS = ClientPool()
+
+
+def _embedder(settings: Settings) -> Embedder:
+    return lambda texts: embed(settings, texts, _CLIENTS.client(settings))
+
+
+def _query_vector(settings: Settings, directory: Path, query: str) -> list[float]:
+    key = (directory, query)
+    with _LOCK:
+        vector = _QUERIES.get(key)
+        if vector is not None:
+            _QUERIES.move_to_end(key)
+            return vector
+    vector = _embedder(settings)([query])[0]
+    with _LOCK:
+        _QUERIES[key] = vector
+        while len(_QUERIES) > QUERY_CACHE:
+            _QUERIES.popitem(last=False)
+    return vector
+
+
+def get_index(settings: Settings, files: list[tuple[str, Path]]) -> SemanticIndex:
+    """
+    Shared per store; re-synced when any knowledge file's mtime/size changes.
+    The sync (one /embeddings POST per batch) runs without _LOCK; meanwhile
+    other callers get the previous index, or IndexBuilding if there is none.
+    """
+    directory = store_dir(settings)
+    sig = file_signature(files)
+    with _LOCK:
+        index = _INDEXES.get(directory)
+        if index is not None and sig is not None and index.signature == sig:
+            return index
+        if directory in _SYNCING:
+            if index is not None:
+                return index
+            raise IndexBuilding("semantic index is still being built")
+        _SYNCING.add(directory)
+    try:
+        index = SemanticIndex.sync(
+            directory, settings.knowledge_root, files, _embedder(settings)
+        )
+        with _LOCK:
+            _INDEXES[directory] = index
+    finally:
+        with _LOCK:
+            _SYNCING.discard(directory)
+    return index
+
+
+def search(
+    settings: Settings,
+    files: list[tuple[str, Path]],
+    query: str,
+    keyword: list[dict[str, Any]],
+    limit: int,
+) -> list[dict[str, Any]]:
+    """Blended hits, or SemanticError when embeddings are unavailable."""
+    if not AVAILABLE:
+        raise SemanticError("numpy is not installed")
+    directory = store_dir(settings)
+    failed = _FAILED.get(directory)
+    if failed is not None and time.monotonic() - failed[0] < RETRY_AFTER:
+        raise SemanticError(failed[1])
+    try:
+        index = get_index(settings, files)
+        vector = _query_vector(settings, directory, query)
+    except IndexBuilding:
+        raise  # not a failure: keyword results until the first sync is done
+    except (LLMError, httpx.HTTPError, OSError, ValueError, SemanticError) as exc:
+        message = f"semantic search unavailable: {exc}"
+        _FAILED[directory] = (time.monotonic(), message)
+        raise SemanticError(message) from exc
+    _FAILED.pop(directory, None)
+    return blend(keyword, index.best_by_doc(vector), limit)
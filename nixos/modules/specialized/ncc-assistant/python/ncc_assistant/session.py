@@ -2,37 +2,93 @@
 
 from __future__ import annotations
 
+import base64
 import json
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, replace
 from typing import Any, Callable, Iterator
 
+import httpx
+
 from .auth import (
     ensure_auth,
     prompt_and_store_auth,
     refresh_auth_on_unauthorized,
     with_cached_credentials,
 )
+from .blobs import get_store, image_ref
 from .config import Settings
+from .context import fit_messages, request_budget
 from .history import (
+    SessionJournal,
     new_session_id,
-    save_session,
-    strip_heavy_content,
     title_from_messages,
 )
 from .llm import (
     CancelledError,
+    ClientPool,
     LLMError,
     iter_chat_completion,
     list_models,
     model_supports_vision,
     resolve_model,
 )
+from .metrics import MetricsLog, RoundMetrics
+from .prefetch import ConfigPrefetcher
 from .runtime import ToolRuntime
+from .shaper import ResultStore
+from .tooldefs import FETCH_RESULT_TOOL, READ_ONLY_TOOLS
 
 Event = dict[str, Any]
 PromptAuthFn = Callable[[Settings], Settings]
 ConfirmHook = Callable[[dict[str, Any]], bool]
+ToolCall = tuple[dict[str, Any], str, dict[str, Any]]  # (raw call, name, args)
+Timed = tuple[dict[str, Any], float]  # (tool result, wall ms)
+
+
+def _parse_tool_call(tc: dict[str, Any]) -> ToolCall:
+    fn = tc.get("function") or {}
+    name = fn.get("name") or ""
+    raw_args = fn.get("arguments") or "{}"
+    try:
+        args = json.loads(raw_args) if isinstance(raw_args, str) else raw_args
+    except json.JSONDecodeError:
+        args = {}
+    return tc, name, args if isinstance(args, dict) else {}
+
+
+def _timed_call(
+    runtime: ToolRuntime,
+    name: str,
+    args: dict[str, Any],
+    prefetch: ConfigPrefetcher | None = None,
+    results: ResultStore | None = None,
+) -> Timed:
+    start = time.perf_counter()
+    if prefetch is not None:
+        prefetch.settle(name, args)
+    if results is not None and name == FETCH_RESULT_TOOL["name"]:
+        result = results.fetch(args)
+    else:
+        result = runtime.call(name, args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _tool_batches(calls: list[ToolCall]) -> list[list[ToolCall]]:
+    """Group consecutive read-only calls; every other call runs on its own."""
+    batches: list[list[ToolCall]] = []
+    for call in calls:
+        if (
+            call[1] in READ_ONLY_TOOLS
+            and batches
+            and all(c[1] in READ_ONLY_TOOLS for c in batches[-1])
+        ):
+            batches[-1].append(call)
+        else:
+            batches.append([call])
+    return batches
 
 
 @dataclass
@@ -46,6 +102,12 @@ class ChatSession:
     title: str = "New chat"
     cancel_event: threading.Event = field(default_factory=threading.Event)
     available_models: list[dict[str, Any]] = field(default_factory=list)
+    http: ClientPool = field(default_factory=ClientPool)
+    max_parallel_tools: int = 4
+    _executor: ThreadPoolExecutor | None = field(default=None, init=False, repr=False)
+    _journal: SessionJournal | None = field(default=None, init=False, repr=False)
+    _metrics_log: MetricsLog | None = field(default=None, init=False, repr=False)
+    _results: ResultStore = field(default_factory=ResultStore, init=False, repr=False)
 
     def __post_init__(self) -> None:
         if not self.messages:
@@ -67,7 +129,13 @@ class ChatSession:
         messages: list[dict[str, Any]] | None = None,
         session_id: str | None = None,
         title: str | None = None,
+        http: ClientPool | None = None,
+        discover_models: bool = True,
     ) -> "ChatSession":
+        """
+        With ``discover_models=False`` no request is made to the endpoint;
+        the caller runs `discover_models` later (the GUI does it off-thread).
+        """
         settings = settings or Settings.from_env(client_mode="chat")
         settings = with_cached_credentials(settings)
 
@@ -83,37 +151,78 @@ class ChatSession:
 
         runtime = ToolRuntime(settings, confirm_hook=confirm_hook)
         session = cls(settings=settings, runtime=runtime)
+        if http is not None:
+            session.http = http
         if messages is not None:
             session.messages = messages
         if session_id:
             session.session_id = session_id
+            if messages is not None:
+                # Resumed: the first save appends to the loaded journal.
+                session._journal = SessionJournal(session_id)
+                session._journal.resume(messages)
         if title:
             session.title = title
-        session.refresh_models()
-        session.refresh_model_label()
+        if discover_models:
+            session.apply_models(*session.discover_models())
         return session
 
     def set_confirm_hook(self, hook: ConfirmHook | None) -> None:
         self.runtime.confirm_hook = hook
 
+    def close(self) -> None:
+        """Close pooled HTTP connections and the tool pool (call on exit)."""
+        self.http.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
     def request_cancel(self) -> None:
         self.cancel_event.set()
 
     def clear_cancel(self) -> None:
         self.cancel_event.clear()
 
-    def refresh_models(self) -> list[dict[str, Any]]:
+    def _list_models(
+        self, settings: Settings, refresh: bool = False
+    ) -> list[dict[str, Any]]:
         try:
-            self.available_models = list_models(self.settings)
-        except LLMError:
-            self.available_models = []
-            if self.settings.model:
-                self.available_models = [
-                    {
-                        "id": self.settings.model,
-                        "vision": model_supports_vision(self.settings.model),
-                    }
-                ]
+            return list_models(settings, self.http.client(settings), refresh=refresh)
+        except (LLMError, httpx.HTTPError):
+            if not settings.model:
+                return []
+            return [
+                {
+                    "id": settings.model,
+                    "vision": model_supports_vision(settings.model),
+                }
+            ]
+
+    def discover_models(self) -> tuple[list[dict[str, Any]], str]:
+        """
+        (models, label) from one GET /models, without touching session state,
+        so it can run on a background thread; hand the result to `apply_models`.
+        """
+        settings = self.settings
+        models = self._list_models(settings)
+        if settings.model:
+            label = settings.model
+        elif settings.api != "openai-compatible":
+            label = "unset"
+        elif models:
+            label = str(models[0]["id"])
+        else:
+            label = "auto (unavailable)"
+        return models, label
+
+    def apply_models(self, models: list[dict[str, Any]], label: str) -> None:
+        self.available_models = models
+        # A model picked while discovery ran wins over the auto label.
+        self.model_label = self.settings.model or label
+
+    def refresh_models(self) -> list[dict[str, Any]]:
+        """Refetch GET /models, bypassing the catalog cache."""
+        self.available_models = self._list_models(self.settings, refresh=True)
         return self.available_models
 
     def refresh_model_label(self) -> str:
@@ -124,8 +233,10 @@ class ChatSession:
             self.model_label = self.settings.model or "unset"
             return self.model_label
         try:
-            self.model_label = resolve_model(self.settings)
-        except LLMError:
+            self.model_label = resolve_model(
+                self.settings, self.http.client(self.settings)
+            )
+        except (LLMError, httpx.HTTPError):
             self.model_label = "auto (unavailable)"
         return self.model_label
 
@@ -145,13 +256,14 @@ class ChatSession:
 
     def persist(self) -> None:
         self.title = title_from_messages(self.messages) or self.title
-        save_session(
+        if self._journal is None or self._journal.session_id != self.session_id:
+            self._journal = SessionJournal(self.session_id)
+        self._journal.save(
             {
-                "id": self.session_id,
                 "title": self.title,
                 "model": self.settings.model or self.model_label,
                 "endpoint": self.settings.endpoint,
-                "messages": strip_heavy_content(self.messages),
+                "messages": self.messages,
             }
         )
 
@@ -164,6 +276,7 @@ class ChatSession:
                 "content": self.settings.load_system_prompt(),
             }
         ]
+        self._results = ResultStore()
         self.persist()
 
     def send(
@@ -185,17 +298,31 @@ class ChatSession:
             parts: list[dict[str, Any]] = []
             if text:
                 parts.append({"type": "text", "text": text})
+            store = get_store()
             for img in images:
                 mime = img.get("mime") or "image/png"
+                sha = img.get("sha256") or ""
                 b64 = img.get("data_b64") or ""
-                if not b64:
+                if not sha and b64:
+                    try:
+                        sha = store.put(base64.b64decode(b64))
+                    except OSError as exc:
+                        # Blob store unwritable (disk full, permissions): send
+                        # the image inline; saved history drops it as before.
+                        yield {
+                            "kind": "status",
+                            "text": f"Could not store image, sending inline: {exc}",
+                        }
+                        parts.append(
+                            {
+                                "type": "image_url",
+                                "image_url": {"url": f"data:{mime};base64,{b64}"},
+                            }
+                        )
+                        continue
+                if not sha:
                     continue
-                parts.append(
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:{mime};base64,{b64}"},
-                    }
-                )
+                parts.append(image_ref(sha, mime, img.get("name") or ""))
             content = parts
             preview = text or "(image)"
             if images and text:
@@ -208,7 +335,7 @@ class ChatSession:
             yield {"kind": "user", "text": text}
 
         self.messages.append({"role": "user", "content": content})
-        tools = self.runtime.openai_tools()
+        tools = self.runtime.openai_tools([FETCH_RESULT_TOOL])
 
         try:
             yield from self._run_turn(tools)
@@ -256,10 +383,34 @@ class ChatSession:
         yield {"kind": "done"}
 
     def _run_turn(self, tools: list[dict[str, Any]]) -> Iterator[Event]:
-        for _ in range(self.max_rounds):
+        prefetch = None
+        if self.settings.prefetch_tools:
+            prefetch = ConfigPrefetcher(self.runtime, self._pool())
+        try:
+            yield from self._run_rounds(tools, prefetch)
+        finally:
+            if prefetch is not None:
+                prefetch.discard()
+
+    def _run_rounds(
+        self, tools: list[dict[str, Any]], prefetch: ConfigPrefetcher | None
+    ) -> Iterator[Event]:
+        budget = request_budget(
+            self.settings.context_tokens, self.settings.max_tokens, tools
+        )
+        for round_no in range(1, self.max_rounds + 1):
             if self.cancel_event.is_set():
                 raise CancelledError("cancelled")
 
+            # The stored history stays complete; only the request is trimmed.
+            fitted = fit_messages(self.messages, budget)
+            if fitted.trimmed:
+                yield {
+                    "kind": "status",
+                    "text": fitted.describe(),
+                    "phase": "context",
+                    "trimmed_tokens": fitted.before - fitted.after,
+                }
             yield {
                 "kind": "status",
                 "text": f"Waiting for {self.model_label}",
@@ -267,24 +418,43 @@ class ChatSession:
             }
             yield {"kind": "assistant_start"}
 
+            metrics = RoundMetrics(
+                round_no, self.model_label, self.settings.endpoint
+            )
+            prefetched = prefetch.started if prefetch is not None else 0
             content = ""
             tool_calls: list[dict[str, Any]] = []
+            usage = None
             for ev in iter_chat_completion(
                 self.settings,
-                self.messages,
+                get_store().expand(fitted.messages),
                 tools,
                 cancel_event=self.cancel_event,
+                client=self.http.client(self.settings),
             ):
                 if ev.get("type") == "delta":
+                    metrics.first_token()
                     piece = ev.get("text") or ""
                     content += piece
                     yield {"kind": "assistant_delta", "text": piece}
+                elif ev.get("type") == "tool_call_delta":
+                    metrics.first_token()
+                    if prefetch is not None:
+                        # Start leaf reads while the model finishes the call.
+                        prefetch.observe(
+                            ev.get("name") or "", ev.get("arguments") or ""
+                        )
                 elif ev.get("type") == "done":
                     msg = ev.get("message") or {}
                     content = msg.get("content") or content
                     tool_calls = msg.get("tool_calls") or []
+                    usage = msg.get("usage")
                     if msg.get("model"):
                         self.model_label = str(msg["model"])
+                        metrics.model = self.model_label
+            metrics.response_done(content, usage)
+            if prefetch is not None:
+                metrics.prefetched = prefetch.started - prefetched
 
             assistant_msg: dict[str, Any] = {
                 "role": "assistant",
@@ -300,6 +470,7 @@ class ChatSession:
                     "text": content or "(empty response)",
                     "streamed": True,
                 }
+                yield self._metrics_event(metrics)
                 return
 
             if content:
@@ -309,49 +480,90 @@ class ChatSession:
                     "streamed": True,
                 }
 
-            for tc in tool_calls:
+            calls = [_parse_tool_call(tc) for tc in tool_calls]
+            for batch in _tool_batches(calls):
                 if self.cancel_event.is_set():
                     raise CancelledError("cancelled")
-                fn = tc.get("function") or {}
-                name = fn.get("name") or ""
-                raw_args = fn.get("arguments") or "{}"
-                try:
-                    args = (
-                        json.loads(raw_args)
-                        if isinstance(raw_args, str)
-                        else raw_args
-                    )
-                except json.JSONDecodeError:
-                    args = {}
-                yield {"kind": "tool", "name": name, "args": args}
+                for _, name, args in batch:
+                    yield {"kind": "tool", "name": name, "args": args}
+                names = ", ".join(name for _, name, _ in batch)
                 yield {
                     "kind": "status",
-                    "text": f"Running tool: {name}",
+                    "text": (
+                        f"Running tools: {names}"
+                        if len(batch) > 1
+                        else f"Running tool: {names}"
+                    ),
                     "phase": "tool",
                 }
-                result = self.runtime.call(name, args)
-                payload = json.dumps(result, ensure_ascii=False, indent=2)
-                if len(payload) > 6000:
-                    payload = payload[:6000] + "\n... (truncated)"
-                yield {
-                    "kind": "tool_result",
-                    "name": name,
-                    "text": payload,
-                }
-                self.messages.append(
-                    {
-                        "role": "tool",
-                        "tool_call_id": tc.get("id") or name,
+                # Results go back in the original call order.
+                for (tc, name, _), (result, ms) in zip(
+                    batch, self._run_tools(batch, prefetch)
+                ):
+                    metrics.tool(name, ms, result.get("ok") is not False)
+                    # Compact JSON within budget; cut fields stay fetchable.
+                    payload = self._results.shape(result)
+                    # The GUI and terminal show a readable copy instead.
+                    shown = json.dumps(result, ensure_ascii=False, indent=2)
+                    if len(shown) > 6000:
+                        shown = shown[:6000] + "\n... (truncated)"
+                    yield {
+                        "kind": "tool_result",
                         "name": name,
-                        "content": payload,
+                        "text": shown,
+                        "ms": round(ms, 1),
                     }
-                )
+                    self.messages.append(
+                        {
+                            "role": "tool",
+                            "tool_call_id": tc.get("id") or name,
+                            "name": name,
+                            "content": payload,
+                        }
+                    )
+            yield self._metrics_event(metrics)
 
         yield {
             "kind": "assistant",
             "text": "(stopped after max tool rounds)",
         }
 
+    def _metrics_event(self, metrics: RoundMetrics) -> Event:
+        event = metrics.event()
+        if self.settings.metrics_log:
+            if self._metrics_log is None:
+                self._metrics_log = MetricsLog()
+            self._metrics_log.append(
+                event, session_id=self.session_id, api=self.settings.api
+            )
+        return event
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, self.max_parallel_tools),
+                thread_name_prefix="ncc-tool",
+            )
+        return self._executor
+
+    def _run_tools(
+        self, batch: list[ToolCall], prefetch: ConfigPrefetcher | None = None
+    ) -> list[Timed]:
+        """Run one batch: read-only batches fan out on a bounded thread pool."""
+        runtime = self.runtime
+        if len(batch) == 1 or self.max_parallel_tools <= 1:
+            return [
+                _timed_call(runtime, name, args, prefetch, self._results)
+                for _, name, args in batch
+            ]
+        futures = [
+            self._pool().submit(
+                _timed_call, runtime, name, args, prefetch, self._results
+            )
+            for _, name, args in batch
+        ]
+        return [f.result() for f in futures]
+
 
 def terminal_prompt_auth(settings: Settings) -> Settings:
     return prompt_and_store_auth(settings)
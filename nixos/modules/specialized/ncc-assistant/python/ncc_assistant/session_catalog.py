@@ -0,0 +1,102 @@
+"""SQLite index of saved sessions (id, title, updated, model, message count)."""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Iterable
+
+CATALOG_NAME = "catalog.sqlite3"
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    created TEXT NOT NULL DEFAULT '',
+    updated TEXT NOT NULL DEFAULT '',
+    model TEXT NOT NULL DEFAULT '',
+    message_count INTEGER NOT NULL DEFAULT 0,
+    path TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS sessions_updated ON sessions(updated DESC);
+"""
+
+_COLUMNS = ("id", "title", "created", "updated", "model", "message_count", "path")
+_INSERT = (
+    f"INSERT OR REPLACE INTO sessions ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)})"
+)
+
+
+def _row(entry: dict[str, Any]) -> tuple[Any, ...]:
+    return tuple("" if entry.get(c) is None else entry[c] for c in _COLUMNS)
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SessionCatalog:
+    """
+    One row per session file. Rows are written in a transaction after the
+    session file itself, so a crash in between leaves a stale row that
+    `rebuild` repairs; listing never touches the session files.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            with conn:
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return conn
+
+    @property
+    def exists(self) -> bool:
+        return self.path.is_file()
+
+    def upsert(self, entry: dict[str, Any]) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(_INSERT, _row(entry))
+
+    def remove(self, session_id: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def list(
+        self, limit: int = 40, offset: int = 0, query: str | None = None
+    ) -> list[dict[str, Any]]:
+        where, params = self._filter(query)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM sessions{where} "
+                "ORDER BY updated DESC LIMIT ? OFFSET ?",
+                (*params, max(0, limit), max(0, offset)),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def count(self, query: str | None = None) -> int:
+        where, params = self._filter(query)
+        with closing(self._connect()) as conn:
+            row = conn.execute(f"SELECT COUNT(*) FROM sessions{where}", params)
+            return int(row.fetchone()[0])
+
+    @staticmethod
+    def _filter(query: str | None) -> tuple[str, tuple[str, ...]]:
+        q = (query or "").strip()
+        if not q:
+            return "", ()
+        return " WHERE title LIKE ? ESCAPE '\\'", (f"%{_escape_like(q)}%",)
+
+    def replace_all(self, entries: Iterable[dict[str, Any]]) -> int:
+        rows = [_row(e) for e in entries]
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM sessions")
+            conn.executemany(_INSERT, rows)
+        return len(rows)
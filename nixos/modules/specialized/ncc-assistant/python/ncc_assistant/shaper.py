@@ -0,0 +1,192 @@
+"""
+Fit tool results into the chat's per-result budget without breaking JSON.
+
+Results are sent as compact JSON. One that is too large is shrunk field by
+field: every key stays, long strings keep their head (and, for config text,
+their tail), long lists keep their first items. A `_truncated` entry names
+what was cut and a handle; the chat-only `fetch_result` tool pages through
+the full value stored under that handle.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any
+
+MAX_RESULT_CHARS = 6000
+# (chars per string, items per list), tried in order until the result fits.
+LEVELS = ((4000, 50), (2000, 20), (1000, 10), (500, 5), (200, 3), (80, 1))
+# Per-key share of the string limit. A diff is what the model acts on; the
+# full current/proposed texts repeat it.
+FIELD_WEIGHT = {
+    "diff": 2.0,
+    "current": 0.5,
+    "proposed": 0.5,
+    "before": 0.5,
+    "after": 0.5,
+}
+# Config text keeps head and tail (imports at the top, closing braces and
+# late options at the bottom); everything else keeps its head.
+HEAD_TAIL_KEYS = frozenset(
+    {"content", "current", "proposed", "before", "after", "current_config"}
+)
+STORED_RESULTS = 32
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _cut(text: str, limit: int, head_tail: bool) -> str:
+    omitted = len(text) - limit
+    if not head_tail:
+        return f"{text[:limit]}… [{omitted} more chars]"
+    head = limit * 2 // 3
+    tail = limit - head
+    return f"{text[:head]}\n… [{omitted} chars omitted] …\n{text[-tail:]}"
+
+
+def _shrink(
+    value: Any,
+    chars: int,
+    items: int,
+    path: str,
+    key: str,
+    cut: dict[str, str],
+) -> Any:
+    if isinstance(value, str):
+        limit = max(40, int(chars * FIELD_WEIGHT.get(key, 1.0)))
+        if len(value) <= limit:
+            return value
+        cut[path] = f"{limit} of {len(value)} chars"
+        return _cut(value, limit, key in HEAD_TAIL_KEYS)
+    if isinstance(value, list):
+        if len(value) > items:
+            cut[path] = f"{items} of {len(value)} items"
+        return [
+            _shrink(v, chars, items, f"{path}.{i}", key, cut)
+            for i, v in enumerate(value[:items])
+        ]
+    if isinstance(value, dict):
+        return {
+            k: _shrink(v, chars, items, f"{path}.{k}" if path else k, k, cut)
+            for k, v in value.items()
+        }
+    return value
+
+
+def shape_result(
+    result: dict[str, Any], handle: str, budget: int = MAX_RESULT_CHARS
+) -> tuple[str, bool]:
+    """(compact JSON within `budget`, whether anything was cut)."""
+    text = dumps(result)
+    full = len(text)
+    if full <= budget:
+        return text, False
+    for chars, items in LEVELS:
+        cut: dict[str, str] = {}
+        shaped = _shrink(result, chars, items, "", "", cut)
+        shaped["_truncated"] = {"handle": handle, "fields": cut}
+        text = dumps(shaped)
+        if len(text) <= budget:
+            return text, True
+    # Too many keys for any level: list them instead of cutting mid-JSON.
+    summary = {
+        "ok": result.get("ok", True),
+        "keys": list(result)[:200],
+        "_truncated": {"handle": handle, "fields": {"": f"{full} chars"}},
+    }
+    return dumps(summary), True
+
+
+def _resolve(value: Any, path: str) -> Any:
+    for part in [p for p in path.split(".") if p]:
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            raise KeyError(path)
+    return value
+
+
+class ResultStore:
+    """Full results of the latest shaped tool calls, one session's worth."""
+
+    def __init__(self, size: int = STORED_RESULTS) -> None:
+        self.size = size
+        self._results: OrderedDict[str, Any] = OrderedDict()
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def new_handle(self) -> str:
+        with self._lock:
+            self._next += 1
+            return f"r{self._next}"
+
+    def put(self, handle: str, result: Any) -> None:
+        with self._lock:
+            self._results[handle] = result
+            while len(self._results) > self.size:
+                self._results.popitem(last=False)
+
+    def shape(self, result: dict[str, Any], budget: int = MAX_RESULT_CHARS) -> str:
+        """Compact JSON for the model; keeps the full result if it was cut."""
+        handle = self.new_handle()
+        text, truncated = shape_result(result, handle, budget)
+        if truncated:
+            self.put(handle, result)
+        return text
+
+    def fetch(
+        self, args: dict[str, Any], budget: int = MAX_RESULT_CHARS
+    ) -> dict[str, Any]:
+        """One page of a stored value: chars of a string, items of a list."""
+        handle = str(args.get("handle") or "")
+        path = str(args.get("path") or "")
+        with self._lock:
+            if handle not in self._results:
+                return {
+                    "ok": False,
+                    "error": f"unknown or expired handle {handle!r}; run the tool again",
+                }
+            full = self._results[handle]
+        try:
+            value = _resolve(full, path)
+        except KeyError:
+            return {"ok": False, "error": f"no field {path!r} in {handle}"}
+        try:
+            offset = max(0, int(args.get("offset") or 0))
+        except (TypeError, ValueError):
+            return {"ok": False, "error": "offset must be an integer"}
+        page = budget - 300  # room for the envelope
+        if isinstance(value, list):
+            out: list[Any] = []
+            used = 0
+            for item in value[offset:]:
+                size = len(dumps(item)) + 1
+                if out and used + size > page:
+                    break
+                out.append(item)
+                used += size
+            end = offset + len(out)
+            chunk: Any = out
+        else:
+            text = value if isinstance(value, str) else dumps(value)
+            end = min(len(text), offset + page)
+            # Escaping (newlines, quotes) grows the JSON; shrink to fit.
+            while end > offset + 1 and len(dumps(text[offset:end])) > page:
+                end = offset + (end - offset) * page // len(dumps(text[offset:end]))
+            chunk = text[offset:end]
+            value = text
+        return {
+            "ok": True,
+            "handle": handle,
+            "path": path,
+            "offset": offset,
+            "total": len(value),
+            "next_offset": end if end < len(value) else None,
+            "value": chunk,
+        }
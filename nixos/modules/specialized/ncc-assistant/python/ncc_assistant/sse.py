@@ -0,0 +1,92 @@
+"""Byte-level server-sent-events decoding for streamed completions."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Iterable, Iterator
+
+
+def _json_loads(data: bytes) -> Any:
+    # json.loads(bytes) sniffs the encoding in Python; decoding first is faster.
+    return json.loads(data.decode("utf-8"))
+
+
+try:  # optional fast path
+    import orjson
+
+    loads: Callable[[bytes], Any] = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:
+    loads = _json_loads
+    JSON_BACKEND = "json"
+
+DONE = b"[DONE]"
+
+
+class SSEDecoder:
+    """
+    Incremental decoder: `feed` each network read and get back the `data:`
+    payloads of every line it completed, as bytes (no str decode). One
+    payload per `data:` line, as OpenAI-compatible servers send one JSON
+    object per line; `event:`/`id:`/comment lines are skipped and blank
+    event separators are not needed.
+    """
+
+    def __init__(self) -> None:
+        self._tail = b""
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        if self._tail:
+            chunk = self._tail + chunk
+        lines = chunk.split(b"\n")
+        self._tail = lines.pop()  # incomplete last line (b"" after a newline)
+        return [p for p in map(_payload, lines) if p is not None]
+
+    def close(self) -> list[bytes]:
+        """Payload of a final line that had no trailing newline."""
+        tail, self._tail = self._tail, b""
+        payload = _payload(tail) if tail else None
+        return [] if payload is None else [payload]
+
+
+def _payload(line: bytes) -> bytes | None:
+    if not line.startswith(b"data:"):
+        return None
+    return line[5:].strip()
+
+
+def iter_batches(chunks: Iterable[bytes]) -> Iterator[list[bytes]]:
+    """Payloads grouped by the network read that completed them."""
+    decoder = SSEDecoder()
+    for chunk in chunks:
+        yield decoder.feed(chunk)
+    tail = decoder.close()
+    if tail:
+        yield tail
+
+
+def decode_batch(
+    payloads: list[bytes], json_loads: Callable[[bytes], Any] | None = None
+) -> tuple[list[Any], bool]:
+    """
+    JSON values of the payloads before [DONE], and whether [DONE] was seen.
+    Several payloads are parsed as one JSON array (one parser call instead
+    of one per token); a malformed payload falls back to per-item parsing
+    that skips it.
+    """
+    parse = json_loads or loads
+    done = DONE in payloads
+    if done:
+        payloads = payloads[: payloads.index(DONE)]
+    if len(payloads) > 1:
+        try:
+            return parse(b"[" + b",".join(payloads) + b"]"), done
+        except ValueError:
+            pass
+    values: list[Any] = []
+    for data in payloads:
+        try:
+            values.append(parse(data))
+        except ValueError:
+            continue
+    return values, done
@@ -0,0 +1,195 @@
+"""
+Tool names, descriptions and input schemas for the chat runtime and the CLI.
+
+Kept free of imports beyond typing, so `ncc-assistant tools` can list them
+without loading the runtime, httpx or the MCP SDK.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+TOOL_DEFINITIONS: list[dict[str, Any]] = [
+    {
+        "name": "list_modules",
+        "description": (
+            "List known NCC modules from the knowledge registries "
+            "(core + optional)."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Optional substring filter on module name/path",
+                }
+            },
+        },
+    },
+    {
+        "name": "read_module_config",
+        "description": (
+            "Read the active systemConfig leaf for a module path "
+            "(e.g. core/base/packages or modules/specialized/chronicle)."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "module_path": {
+                    "type": "string",
+                    "description": "Module path relative to systemConfig root",
+                }
+            },
+            "required": ["module_path"],
+        },
+    },
+    {
+        "name": "search_knowledge",
+        "description": (
+            "Search the NCC knowledge pack (skills, domains, contexts, "
+            "module registries) by keyword, plus meaning when embeddings "
+            "are configured."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string"},
+                "limit": {"type": "integer", "default": 8},
+            },
+            "required": ["query"],
+        },
+    },
+    {
+        "name": "explain_path",
+        "description": (
+            "Explain a module path using knowledge registries and optional "
+            "on-disk hints under the assistant knowledge root."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "module_path": {"type": "string"},
+            },
+            "required": ["module_path"],
+        },
+    },
+    {
+        "name": "propose_config_patch",
+        "description": (
+            "Show a unified diff between current module config and a proposed "
+            "Nix attrset. Does NOT write."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "module_path": {"type": "string"},
+                "proposed_nix": {
+                    "type": "string",
+                    "description": "Proposed Nix attrset fragment",
+                },
+            },
+            "required": ["module_path", "proposed_nix"],
+        },
+    },
+    {
+        "name": "apply_module_config",
+        "description": (
+            "Write a Nix attrset fragment to a module config via the NCC "
+            "config facade. Requires confirm=true and write permission."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "module_path": {"type": "string"},
+                "content_nix": {"type": "string"},
+                "confirm": {
+                    "type": "boolean",
+                    "description": "Must be true to actually write",
+                },
+            },
+            "required": ["module_path", "content_nix", "confirm"],
+        },
+    },
+    {
+        "name": "validate_config",
+        "description": (
+            "Validate a Nix attrset fragment parses, or validate the current "
+            "module leaf if content_nix is omitted."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "module_path": {"type": "string"},
+                "content_nix": {"type": "string"},
+            },
+        },
+    },
+    {
+        "name": "apply_system",
+        "description": (
+            "Run `ncc system build switch` after config changes. Requires "
+            "allowRebuild and confirm exactly equal to CONFIRM."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "confirm": {
+                    "type": "string",
+                    "description": 'Must be the string "CONFIRM"',
+                },
+                "hostname": {
+                    "type": "string",
+                    "description": "Optional flake hostname attribute",
+                },
+            },
+            "required": ["confirm"],
+        },
+    },
+]
+
+# Chat sessions only: pages through a tool result that was cut to fit the
+# per-result budget (see shaper.py). MCP clients get results whole.
+FETCH_RESULT_TOOL: dict[str, Any] = {
+    "name": "fetch_result",
+    "description": (
+        "Read more of a tool result that was truncated. Use the handle and a "
+        "field path from its `_truncated` entry; call again with next_offset "
+        "to continue."
+    ),
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "handle": {
+                "type": "string",
+                "description": "Handle from `_truncated`, e.g. r3",
+            },
+            "path": {
+                "type": "string",
+                "description": (
+                    "Dotted field path, e.g. current or modules.12; "
+                    "empty for the whole result"
+                ),
+            },
+            "offset": {
+                "type": "integer",
+                "description": "Character (string) or item (list) offset",
+            },
+        },
+        "required": ["handle"],
+    },
+}
+
+
+# Tools without side effects: safe to run concurrently within one round.
+# apply_module_config / apply_system stay serialized behind the confirm hook.
+READ_ONLY_TOOLS = frozenset(
+    {
+        "list_modules",
+        "read_module_config",
+        "search_knowledge",
+        "explain_path",
+        "propose_config_patch",
+        "validate_config",
+        "fetch_result",
+    }
+)